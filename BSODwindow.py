@@ -18,9 +18,13 @@ from PyQt5.QtWidgets import (
     QMenu, QToolBar, QStatusBar, QAction, QSystemTrayIcon, QMenuBar,
     QLayout, QTextBrowser, QDialogButtonBox
 )
-# 定义 Windows API 相关常量和函数
-user32 = ctypes.windll.user32
-kernel32 = ctypes.windll.kernel32
+# 定义 Windows API 相关常量和函数（非Windows平台上没有windll）
+if sys.platform == "win32":
+    user32 = ctypes.windll.user32
+    kernel32 = ctypes.windll.kernel32
+else:
+    user32 = None
+    kernel32 = None
 
 WH_KEYBOARD_LL = 13
 WM_KEYDOWN = 0x0100
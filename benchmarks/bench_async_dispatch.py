@@ -0,0 +1,81 @@
+"""
+事件分发延迟基准：async def 槽函数（asyncio 由Qt事件循环驱动） vs 每个任务一个线程
+
+测量从发起任务到结果回到GUI线程的时间，输出JSON。
+用法: python benchmarks/bench_async_dispatch.py [次数]
+"""
+import os
+import sys
+import json
+import time
+import statistics
+import threading
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtCore import QObject, pyqtSignal
+from pyQtAPI import WindowMaker
+
+
+class _Relay(QObject):
+	done = pyqtSignal(float)
+
+
+def _summary(samples):
+	samples = sorted(samples)
+	return {
+		"count": len(samples),
+		"mean_ms": statistics.mean(samples) * 1000,
+		"p50_ms": samples[len(samples) // 2] * 1000,
+		"p95_ms": samples[int(len(samples) * 0.95) - 1] * 1000,
+		"max_ms": samples[-1] * 1000,
+	}
+
+
+def _wait(app, condition, timeout=30):
+	deadline = time.perf_counter() + timeout
+	while not condition() and time.perf_counter() < deadline:
+		app.processEvents()
+
+
+def bench_asyncio(wm, count):
+	samples = []
+
+	async def handler(started):
+		samples.append(time.perf_counter() - started)
+
+	slot = wm._wrap_slot(handler)
+	for _ in range(count):
+		expected = len(samples) + 1
+		slot(time.perf_counter())
+		_wait(wm.app, lambda: len(samples) >= expected)
+	return _summary(samples)
+
+
+def bench_thread_per_task(wm, count):
+	samples = []
+	relay = _Relay()
+	relay.done.connect(lambda started: samples.append(time.perf_counter() - started))
+
+	for _ in range(count):
+		expected = len(samples) + 1
+		started = time.perf_counter()
+		threading.Thread(target=relay.done.emit, args=(started,)).start()
+		_wait(wm.app, lambda: len(samples) >= expected)
+	return _summary(samples)
+
+
+def main():
+	count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+	wm = WindowMaker(feedback_type=WindowMaker.FEEDBACK_LOG, log_file_path=os.devnull)
+	wm.logger.setLevel("WARNING")
+	results = {
+		"asyncio": bench_asyncio(wm, count),
+		"thread_per_task": bench_thread_per_task(wm, count),
+	}
+	print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,100 @@
+"""
+批量填充基准：下拉框逐个 add_box_item vs add_box_items，单选按钮逐个添加 vs add_radio_buttons
+
+每个规模都包含填充和首次显示的耗时（显示时下拉框会计算尺寸）。
+单选按钮每个都是真实控件，只测到1万个。
+用法: python benchmarks/bench_bulk_items.py [规模1 规模2 ...]
+"""
+import os
+import sys
+import json
+import time
+import random
+import logging
+import statistics
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pyQtAPI import WindowMaker
+
+RADIO_LIMIT = 10000
+
+
+def _new_window():
+	wm = WindowMaker(feedback_type=WindowMaker.FEEDBACK_LOG, log_file_path=os.devnull)
+	wm.logger.setLevel(logging.WARNING)
+	return wm
+
+
+def _timed(fill):
+	"""返回 (填充毫秒, 首次显示毫秒, fill的返回值)"""
+	wm = _new_window()
+	start = time.perf_counter()
+	result = fill(wm)
+	filled = time.perf_counter()
+	wm.main_window.show()
+	wm.app.processEvents()
+	shown = time.perf_counter()
+	wm.main_window.deleteLater()
+	return round((filled - start) * 1000, 3), round((shown - filled) * 1000, 3), result
+
+
+def bench_combo(texts):
+	def per_item(wm):
+		box = wm.add_box()
+		for text in texts:
+			wm.add_box_item(box, text=text)
+
+	def bulk(wm):
+		wm.add_box_items(wm.add_box(), texts)
+
+	def bulk_editable(wm):
+		return wm.add_box_items(wm.add_box(editable=True), texts).completer()
+
+	results = {}
+	for name, fill in (("per_item", per_item), ("bulk", bulk), ("bulk_editable", bulk_editable)):
+		fill_ms, show_ms, completer = _timed(fill)
+		results[name] = {"fill_ms": fill_ms, "first_show_ms": show_ms}
+
+	samples = []
+	for _ in range(200):
+		prefix = random.choice(texts)[:random.randint(1, 8)]
+		start = time.perf_counter()
+		completer.index.search(prefix, completer.max_results)
+		samples.append((time.perf_counter() - start) * 1e6)
+	results["completer_search_us"] = round(statistics.median(samples), 3)
+	return results
+
+
+def bench_radio(texts):
+	def per_item(wm):
+		group = wm.create_button_group()
+		for text in texts:
+			wm.add_radio_button(text=text, group=group, command=lambda checked: None)
+
+	def bulk(wm):
+		wm.add_radio_buttons(texts, command=lambda index: None)
+
+	results = {}
+	for name, fill in (("per_item", per_item), ("bulk", bulk)):
+		fill_ms, show_ms, _ = _timed(fill)
+		results[name] = {"fill_ms": fill_ms, "first_show_ms": show_ms}
+	return results
+
+
+def main():
+	sizes = [int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000]
+	random.seed(0)
+	report = {}
+	for size in sizes:
+		texts = [f"选项-{random.randrange(10 ** 8):08d}" for _ in range(size)]
+		entry = {"combo": bench_combo(texts)}
+		if size <= RADIO_LIMIT:
+			entry["radio"] = bench_radio(texts)
+		report[str(size)] = entry
+	print(json.dumps(report, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,118 @@
+"""
+折叠动画帧时间基准：截图动画 vs 逐帧重新布局真实子控件
+
+在含有大量子控件的折叠容器上展开、折叠各一次，统计每帧间隔，判断能否维持60fps。
+用法: python benchmarks/bench_collapse_animation.py [子控件数] [动画时长毫秒]
+"""
+import os
+import sys
+import json
+import time
+import logging
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtCore import QVariantAnimation, QEasingCurve
+from PyQt5.QtWidgets import QLabel, QLineEdit, QHBoxLayout, QWidget, QScrollArea
+from pyQtAPI import WindowMaker, CollapsibleVBox
+
+BUDGET_MS = 1000 / 60
+
+
+def _summary(samples):
+	samples = sorted(samples)
+	return {
+		"frames": len(samples),
+		"mean_ms": round(sum(samples) / len(samples), 3) if samples else 0.0,
+		"p95_ms": round(samples[max(0, int(len(samples) * 0.95) - 1)], 3) if samples else 0.0,
+		"max_ms": round(samples[-1], 3) if samples else 0.0,
+		"dropped": sum(1 for t in samples if t > BUDGET_MS * 1.5),
+	}
+
+
+def _fill(layout, children):
+	for index in range(children):
+		row = QWidget()
+		row_layout = QHBoxLayout(row)
+		row_layout.addWidget(QLabel(f"字段 {index}"))
+		row_layout.addWidget(QLineEdit(str(index)))
+		layout.addWidget(row)
+
+
+def _wait(app, condition, timeout=10):
+	deadline = time.perf_counter() + timeout
+	while not condition() and time.perf_counter() < deadline:
+		app.processEvents()
+
+
+def _new_box(children, duration):
+	wm = WindowMaker(feedback_type=WindowMaker.FEEDBACK_LOG, log_file_path=os.devnull)
+	wm.logger.setLevel(logging.WARNING)
+	# 放在滚动区域里，绘制范围受视口限制，和实际使用一致
+	scroll = QScrollArea()
+	scroll.setWidgetResizable(True)
+	box = CollapsibleVBox("分组", animation_duration=duration)
+	scroll.setWidget(box)
+	wm.layout_stack[-1].addWidget(scroll)
+	_fill(box.get_content_layout(), children)
+	wm.main_window.resize(600, 800)
+	wm.main_window.show()
+	wm.app.processEvents()
+	return wm, box
+
+
+def bench_snapshot(children, duration):
+	wm, box = _new_box(children, duration)
+	samples = []
+	for _ in range(2):
+		box.toggle()
+		_wait(wm.app, lambda: not box.animator.is_running())
+		samples.extend(box.animator.frame_times)
+	wm.main_window.deleteLater()
+	return _summary(samples)
+
+
+def bench_live(children, duration):
+	"""对照组：内容保持可见，逐帧修改其最大高度，每帧都重新布局全部子控件"""
+	wm, box = _new_box(children, 0)
+	area = box.content_area
+	area.show()
+	wm.app.processEvents()
+	full = area.sizeHint().height()
+	samples = []
+	last = [0.0]
+
+	def on_value(value):
+		now = time.perf_counter()
+		samples.append((now - last[0]) * 1000)
+		last[0] = now
+		area.setMaximumHeight(int(value))
+
+	for start, end in ((0, full), (full, 0)):
+		animation = QVariantAnimation()
+		animation.setEasingCurve(QEasingCurve.OutCubic)
+		animation.setDuration(duration)
+		animation.setStartValue(start)
+		animation.setEndValue(end)
+		animation.valueChanged.connect(on_value)
+		last[0] = time.perf_counter()
+		animation.start()
+		_wait(wm.app, lambda: animation.state() != QVariantAnimation.Running)
+	wm.main_window.deleteLater()
+	return _summary(samples)
+
+
+def main():
+	children = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+	duration = int(sys.argv[2]) if len(sys.argv) > 2 else 250
+	results = {
+		"snapshot": bench_snapshot(children, duration),
+		"live_relayout": bench_live(children, duration),
+	}
+	print(json.dumps({"children": children, "duration_ms": duration, "budget_ms": round(BUDGET_MS, 3),
+					  "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,75 @@
+"""
+折叠容器延迟构建基准：比较一次性构建（eager）与展开时才构建（lazy）的启动耗时和内存
+
+用法: python benchmarks/bench_collapsible.py [容器数] [每个容器的子控件数]
+"""
+import os
+import sys
+import json
+import time
+import logging
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtWidgets import QWidget, QLabel, QLineEdit
+from pyQtAPI import WindowMaker
+
+
+def _rss_kb():
+	"""当前进程的常驻内存（KB），仅Linux"""
+	try:
+		with open("/proc/self/statm") as file:
+			return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+	except (OSError, ValueError):
+		return None
+
+
+def _content_factory(children):
+	def build(layout):
+		for index in range(children):
+			layout.addWidget(QLabel(f"字段 {index}"))
+			layout.addWidget(QLineEdit())
+	return build
+
+
+def run(mode, sections, children):
+	wm = WindowMaker(feedback_type=WindowMaker.FEEDBACK_LOG, log_file_path=os.devnull)
+	wm.logger.setLevel(logging.WARNING)
+	rss_before = _rss_kb()
+	start = time.perf_counter()
+
+	factory = _content_factory(children)
+	with wm.batch():
+		for index in range(sections):
+			if mode == "lazy":
+				wm.add_collapsible_box(f"分组 {index}", factory=factory)
+			else:
+				box = wm.add_collapsible_box(f"分组 {index}")
+				factory(box.get_content_layout())
+	wm.main_window.show()
+	wm.app.processEvents()
+
+	elapsed = (time.perf_counter() - start) * 1000
+	rss_after = _rss_kb()
+	result = {
+		"startup_ms": round(elapsed, 2),
+		"widgets": len(wm.main_window.findChildren(QWidget)),
+		"rss_delta_kb": rss_after - rss_before if rss_before is not None else None,
+	}
+	wm.main_window.close()
+	wm.main_window.deleteLater()
+	wm.app.processEvents()
+	return result
+
+
+def main():
+	sections = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+	children = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+	# 先跑lazy，避免eager分配的内存被复用而低估lazy的增量
+	results = {"lazy": run("lazy", sections, children), "eager": run("eager", sections, children)}
+	print(json.dumps({"sections": sections, "children": children * 2, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+	main()
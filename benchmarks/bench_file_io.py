@@ -0,0 +1,128 @@
+"""
+大文件读写基准
+
+- 第一屏：add_file_view（内存映射 + 后台索引）与先整体读入再交给 add_virtual_list 的对比，含内存增量
+  （对照组只在文件不超过 READ_ALL_LIMIT_MB 时测量）
+- 后台索引整个文件的耗时、随机读取一行的耗时
+- 逐行迭代文件对象与 iter_line_chunks 分块读取的吞吐
+- atomic_write 的吞吐
+
+测试文件刚生成，位于系统页缓存中，结果不含磁盘读取时间。
+用法: python benchmarks/bench_file_io.py [文件大小MB]
+"""
+import os
+import sys
+import json
+import time
+import random
+import logging
+import tempfile
+import statistics
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pyQtAPI import WindowMaker, iter_line_chunks, atomic_write, _rss_bytes
+
+# 整体读入的对照组内存约为文件大小的3倍，超过该大小时不测
+READ_ALL_LIMIT_MB = 1024
+
+
+def _generate(path, size_mb):
+	random.seed(0)
+	block = "".join(f"{index},2024-01-{index % 28 + 1:02d},sensor-{index % 97},{random.random():.6f},OK\n"
+					for index in range(20000)).encode()
+	with open(path, "wb") as file:
+		for _ in range(max(1, size_mb * 1024 * 1024 // len(block))):
+			file.write(block)
+	return os.path.getsize(path)
+
+
+def _new_window():
+	wm = WindowMaker(feedback_type=WindowMaker.FEEDBACK_LOG, log_file_path=os.devnull)
+	wm.logger.setLevel(logging.WARNING)
+	return wm
+
+
+def _first_screen(build):
+	wm = _new_window()
+	rss = _rss_bytes()
+	start = time.perf_counter()
+	view = build(wm)
+	wm.main_window.show()
+	wm.app.processEvents()
+	elapsed = (time.perf_counter() - start) * 1000
+	result = {"first_screen_ms": round(elapsed, 2), "rows": view.model().rowCount(),
+			  "rss_delta_mb": round((_rss_bytes() - rss) / 2 ** 20, 1) if rss else None}
+	return wm, view, result
+
+
+def bench_view(path, size_mb):
+	def read_all(wm):
+		with open(path, encoding="utf-8") as file:
+			return wm.add_virtual_list(file.read().splitlines())
+
+	baseline = None
+	if size_mb <= READ_ALL_LIMIT_MB:
+		wm, view, baseline = _first_screen(read_all)
+		wm.main_window.deleteLater()
+		del view
+
+	wm, view, mapped = _first_screen(lambda wm: wm.add_file_view(path))
+	start = time.perf_counter()
+	while not view.file.indexed:
+		wm.app.processEvents()
+		time.sleep(0.001)
+	mapped["full_index_ms"] = round((time.perf_counter() - start) * 1000 + mapped["first_screen_ms"], 1)
+	mapped["lines"] = len(view.file)
+
+	samples = []
+	for _ in range(1000):
+		index = random.randrange(len(view.file))
+		begin = time.perf_counter()
+		view.file[index]
+		samples.append((time.perf_counter() - begin) * 1e6)
+	mapped["random_line_us"] = round(statistics.median(samples), 2)
+	wm.main_window.deleteLater()
+	return {"read_all_then_virtual_list": baseline, "add_file_view": mapped}
+
+
+def bench_read(path, size):
+	def throughput(fn):
+		start = time.perf_counter()
+		lines = fn()
+		return {"mb_per_s": round(size / 2 ** 20 / (time.perf_counter() - start), 1), "lines": lines}
+
+	def line_iteration():
+		with open(path, encoding="utf-8", errors="replace") as file:
+			return sum(1 for _ in file)
+
+	def chunked():
+		return sum(len(batch) for batch in iter_line_chunks(path))
+
+	return {"file_line_iteration": throughput(line_iteration), "iter_line_chunks": throughput(chunked)}
+
+
+def bench_write(directory, size_mb=64):
+	data = os.urandom(size_mb * 2 ** 20)
+	start = time.perf_counter()
+	atomic_write(os.path.join(directory, "out.bin"), data)
+	return {"mb": size_mb, "mb_per_s": round(size_mb / (time.perf_counter() - start), 1)}
+
+
+def main():
+	size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 512
+	with tempfile.TemporaryDirectory() as directory:
+		path = os.path.join(directory, "data.csv")
+		size = _generate(path, size_mb)
+		report = {
+			"file_mb": round(size / 2 ** 20, 1),
+			"view": bench_view(path, size_mb),
+			"read": bench_read(path, size),
+			"atomic_write": bench_write(directory),
+		}
+	print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+	main()
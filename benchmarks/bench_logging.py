@@ -0,0 +1,65 @@
+"""
+日志每条记录的开销基准
+
+比较：DEBUG关闭时的 _debug()/f-string、经队列写文件（后台线程）、同步写文件。
+用法: python benchmarks/bench_logging.py [条数]
+"""
+import os
+import sys
+import json
+import time
+import logging
+import tempfile
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pyQtAPI import WindowMaker, _setup_shared_logging
+
+
+def _per_record_us(fn, count):
+	start = time.perf_counter()
+	for index in range(count):
+		fn(index)
+	return (time.perf_counter() - start) / count * 1e6
+
+
+def main():
+	count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+	log_dir = tempfile.mkdtemp()
+	payload = {"widget": "QPushButton", "size": (120, 32)}
+
+	wm = WindowMaker.__new__(WindowMaker)
+	wm._init_logging(os.path.join(log_dir, "async.log"), log_level=logging.INFO)
+	logger = wm.logger
+	# 控制台输出会掩盖写文件的开销，基准中只保留文件
+	logger.propagate = False
+
+	results = {}
+	results["debug_disabled_hot_path"] = _per_record_us(lambda i: wm._debug("点击 %s %s", i, payload), count)
+	results["debug_disabled_fstring"] = _per_record_us(lambda i: logger.debug(f"点击 {i} {payload}"), count)
+
+	logger.setLevel(logging.DEBUG)
+	results["debug_enabled_queued"] = _per_record_us(lambda i: wm._debug("点击 %s %s", i, payload), count)
+
+	sync_logger = logging.getLogger("WindowMaker.bench_sync")
+	sync_logger.propagate = False
+	sync_handler = logging.FileHandler(os.path.join(log_dir, "sync.log"), encoding="utf-8")
+	sync_handler.setFormatter(logging.Formatter(
+		'%(asctime)s - %(name)s - %(levelname)s - %(message)s', datefmt='%Y-%m-%d %H:%M:%S'
+	))
+	sync_logger.addHandler(sync_handler)
+	sync_logger.setLevel(logging.DEBUG)
+	results["debug_enabled_sync_file"] = _per_record_us(lambda i: sync_logger.debug("点击 %s %s", i, payload), count)
+
+	# 重复初始化不应增加处理器
+	handlers_before = len(logger.handlers)
+	for _ in range(10):
+		_setup_shared_logging(logger, os.path.join(log_dir, "async.log"))
+	added_handlers = len(logger.handlers) - handlers_before
+
+	print(json.dumps({"count": count, "per_record_us": results, "handlers_added_by_reinit": added_handlers}, indent=2))
+
+
+if __name__ == "__main__":
+	main()
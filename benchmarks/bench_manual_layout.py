@@ -0,0 +1,114 @@
+"""
+手动定位基准：逐个 move()/resize() vs place_widgets() 批量定位
+
+在手动定位模式下放置大量标签，统计首次定位的耗时；再让所有控件按窗口比例定位，
+统计窗口缩放时的重新定位耗时。对照组用事件过滤器在缩放时逐个 move()/resize()。
+用法: python benchmarks/bench_manual_layout.py [控件数1 控件数2 ...]
+"""
+import os
+import sys
+import json
+import time
+import logging
+import statistics
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtCore import QObject, QEvent
+from pyQtAPI import WindowMaker
+
+COLUMNS = 40
+RESIZES = 30
+
+
+class _PerWidgetResizer(QObject):
+	"""对照组：父部件缩放时逐个控件按比例 move() 和 resize()"""
+
+	def __init__(self, parent, widgets, ratios):
+		super().__init__(parent)
+		self.widgets = widgets
+		self.ratios = ratios
+		parent.installEventFilter(self)
+
+	def eventFilter(self, obj, event):
+		if event.type() == QEvent.Resize:
+			width, height = obj.width(), obj.height()
+			for widget, (relx, rely, relwidth, relheight) in zip(self.widgets, self.ratios):
+				widget.move(round(relx * width), round(rely * height))
+				widget.resize(round(relwidth * width), round(relheight * height))
+		return False
+
+
+def _window(count):
+	wm = WindowMaker(feedback_type=WindowMaker.FEEDBACK_LOG, log_file_path=os.devnull)
+	wm.logger.setLevel(logging.WARNING)
+	wm.use_manual_positioning()
+	widgets = [wm.add_label(f"标签 {index}") for index in range(count)]
+	wm.main_window.resize(1200, 800)
+	wm.main_window.show()
+	wm.app.processEvents()
+	return wm, widgets
+
+
+def _grid(count):
+	"""每个控件的 (x, y, w, h) 像素区域和 (relx, rely, relwidth, relheight) 比例"""
+	rows = (count + COLUMNS - 1) // COLUMNS
+	cell_width, cell_height = 1 / COLUMNS, 1 / rows
+	ratios = [((index % COLUMNS) * cell_width, (index // COLUMNS) * cell_height, cell_width, cell_height)
+			  for index in range(count)]
+	pixels = [(round(x * 1200), round(y * 800), round(w * 1200), round(h * 800)) for x, y, w, h in ratios]
+	return pixels, ratios
+
+
+def _timed(wm, action):
+	start = time.perf_counter()
+	action()
+	wm.app.processEvents()
+	return (time.perf_counter() - start) * 1000
+
+
+def _resize_median(wm):
+	window = wm.main_window
+	samples = [_timed(wm, lambda size=size: window.resize(*size))
+			   for size in ((1300 + index * 7, 850 + index * 3) for index in range(RESIZES))]
+	return round(statistics.median(samples), 3)
+
+
+def bench_per_widget(count):
+	wm, widgets = _window(count)
+	pixels, ratios = _grid(count)
+
+	def place():
+		for widget, (x, y, width, height) in zip(widgets, pixels):
+			widget.move(x, y)
+			widget.resize(width, height)
+
+	result = {"place_ms": round(_timed(wm, place), 3)}
+	_PerWidgetResizer(wm.central_widget, widgets, ratios)
+	result["resize_ms"] = _resize_median(wm)
+	wm.main_window.deleteLater()
+	return result
+
+
+def bench_batched(count):
+	wm, widgets = _window(count)
+	pixels, ratios = _grid(count)
+	result = {"place_ms": round(_timed(wm, lambda: wm.place_widgets(widgets, pixels)), 3)}
+	wm.place_widgets(widgets, [(0, 0, 0, 0)] * count, ratios)
+	wm.app.processEvents()
+	result["resize_ms"] = _resize_median(wm)
+	result["stats"] = wm.get_placement().stats()
+	wm.main_window.deleteLater()
+	return result
+
+
+def main():
+	counts = [int(arg) for arg in sys.argv[1:]] or [500, 2000, 5000]
+	report = {str(count): {"per_widget": bench_per_widget(count), "batched": bench_batched(count)}
+			  for count in counts}
+	print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+	main()
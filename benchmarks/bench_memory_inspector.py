@@ -0,0 +1,101 @@
+"""
+内存检查器基准：不同规模控件树上一次快照的耗时，以及模拟泄漏时的检测
+
+泄漏模拟：每个周期创建一个没有被销毁的隐藏对话框，检查器应在连续增长 window 次后报告。
+用法: python benchmarks/bench_memory_inspector.py [行数1 行数2 ...]
+"""
+import os
+import sys
+import json
+import time
+import logging
+import statistics
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtCore import QEvent
+from PyQt5.QtWidgets import QDialog, QLabel, QVBoxLayout, QScrollArea, QWidget
+from PyQt5.QtGui import QPixmap
+from pyQtAPI import WindowMaker
+
+
+def _new_window():
+	wm = WindowMaker(feedback_type=WindowMaker.FEEDBACK_LOG, log_file_path=os.devnull)
+	wm.logger.setLevel(logging.WARNING)
+	return wm
+
+
+def bench_snapshot(rows):
+	wm = _new_window()
+	# 放在滚动区域里，窗口高度不随行数增长
+	scroll = QScrollArea()
+	scroll.setWidgetResizable(True)
+	content = QWidget()
+	wm.layout_stack.append(QVBoxLayout(content))
+	for row in range(rows):
+		wm.row()
+		wm.add_label(f"第 {row} 行", css={"color": "#DDD"})
+		wm.add_line_edit(text=str(row))
+		wm.add_checkbox(None, "启用")
+		wm.add_button("删除", css={"color": "#F66"})
+		wm.end()
+	wm.layout_stack.pop()
+	scroll.setWidget(content)
+	wm.layout_stack[-1].addWidget(scroll)
+	wm.main_window.resize(800, 600)
+	wm.main_window.show()
+	wm.app.processEvents()
+
+	inspector = wm.get_memory_inspector()
+	samples = []
+	for _ in range(5):
+		start = time.perf_counter()
+		snapshot = inspector.snapshot(record=False)
+		samples.append((time.perf_counter() - start) * 1000)
+	wm.main_window.deleteLater()
+	# 不在事件循环中时 processEvents 不处理 deleteLater，这里显式销毁，避免计入之后的测量
+	wm.app.sendPostedEvents(None, QEvent.DeferredDelete)
+	return {
+		"objects": sum(snapshot.counts.values()),
+		"estimated_bytes": sum(snapshot.bytes.values()),
+		"stylesheets": snapshot.stylesheets,
+		"median_snapshot_ms": round(statistics.median(samples), 3),
+	}
+
+
+def bench_leak(cycles=6, window=3):
+	wm = _new_window()
+	wm.add_label("稳定内容")
+	inspector = wm.get_memory_inspector()
+	reports = []
+	inspector.growth_detected.connect(lambda suspects: reports.append((len(inspector.history), suspects)))
+	leaked = []
+	inspector._window = window
+	for cycle in range(cycles):
+		# 忘记销毁的对话框：隐藏的顶层窗口，带一张图片
+		dialog = QDialog()
+		label = QLabel(dialog)
+		label.setPixmap(QPixmap(200, 100))
+		QVBoxLayout(dialog).addWidget(label)
+		leaked.append(dialog)
+		inspector._tick()
+	first = reports[0] if reports else None
+	last_diff = inspector.diff()
+	return {
+		"cycles": cycles,
+		"window": window,
+		"first_report_at_snapshot": first[0] if first else None,
+		"reported": first[1] if first else {},
+		"last_diff": {name: list(change) for name, change in last_diff.items()},
+	}
+
+
+def main():
+	sizes = [int(arg) for arg in sys.argv[1:]] or [250, 2500, 10000]
+	report = {"snapshot": {str(rows * 4): bench_snapshot(rows) for rows in sizes}, "leak": bench_leak()}
+	print(json.dumps(report, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+	main()
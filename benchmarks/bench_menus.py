@@ -0,0 +1,132 @@
+"""
+菜单构建基准：逐项 add_menu_item() vs build_menus() 声明式延迟构建
+
+菜单规模与大型工具相当：若干顶级菜单，每个含多组子菜单，菜单项带图标（少量图标文件
+被反复引用）、部分带快捷键，每组子菜单里还有几个相同的公共菜单项，另有一个最近文件菜单。
+统计从开始构建到菜单栏可用（窗口显示并处理完事件）的耗时，以及延迟构建时第一次
+打开一个顶级菜单、打开全部菜单的耗时。
+用法: python benchmarks/bench_menus.py [顶级菜单数 子菜单数 每个子菜单的菜单项数]
+"""
+import os
+import sys
+import json
+import time
+import logging
+import tempfile
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtGui import QImage, QColor
+from PyQt5.QtWidgets import QAction
+from pyQtAPI import WindowMaker
+
+ICONS = 20
+SHORTCUT_KEYS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+COMMON = ["复制", "粘贴", "属性"]
+RECENT = 20
+
+
+def _icons(directory):
+	paths = []
+	for index in range(ICONS):
+		image = QImage(16, 16, QImage.Format_ARGB32)
+		image.fill(QColor.fromHsv(index * 360 // ICONS, 200, 200))
+		path = os.path.join(directory, f"icon{index}.png")
+		image.save(path)
+		paths.append(path)
+	return paths
+
+
+def _spec(menus, submenus, items, icons, slot):
+	spec = []
+	shortcuts = iter(f"Ctrl+{modifier}{key}" for modifier in ("", "Shift+", "Alt+") for key in SHORTCUT_KEYS)
+	for menu_index in range(menus):
+		groups = []
+		for sub_index in range(submenus):
+			entries = []
+			for item_index in range(items - len(COMMON)):
+				entry = {"text": f"操作 {menu_index}-{sub_index}-{item_index}", "slot": slot,
+						 "icon": icons[(menu_index + sub_index + item_index) % len(icons)]}
+				if item_index == 0:
+					entry["shortcut"] = next(shortcuts, None)
+				entries.append(entry)
+			entries.append("-")
+			entries.extend({"text": text, "slot": slot, "id": text} for text in COMMON)
+			groups.append({"title": f"分组 {sub_index}", "items": entries})
+		spec.append({"title": f"菜单 {menu_index}", "items": groups})
+	spec[0]["items"].append({"title": "最近打开", "items": lambda: [{"text": f"文件{index}.txt", "slot": slot}
+																  for index in range(RECENT)]})
+	return spec
+
+
+def _window():
+	wm = WindowMaker(feedback_type=WindowMaker.FEEDBACK_LOG, log_file_path=os.devnull)
+	wm.logger.setLevel(logging.WARNING)
+	return wm
+
+
+def _add_eager(wm, menu, items):
+	for item in items:
+		if item == "-":
+			menu.addSeparator()
+		elif "items" in item:
+			sub_items = item["items"]() if callable(item["items"]) else item["items"]
+			_add_eager(wm, wm.add_sub_menu(menu, item["title"]), sub_items)
+		else:
+			wm.add_menu_item(menu, item["text"], slot=item.get("slot"), shortcut=item.get("shortcut"),
+							 icon=item.get("icon"))
+
+
+def _ready_ms(wm, build):
+	start = time.perf_counter()
+	build()
+	wm.main_window.show()
+	wm.app.processEvents()
+	return (time.perf_counter() - start) * 1000
+
+
+def bench_eager(spec):
+	wm = _window()
+
+	def build():
+		for entry in spec:
+			_add_eager(wm, wm.add_menu(entry["title"]), entry["items"])
+
+	result = {"ready_ms": round(_ready_ms(wm, build), 3),
+			  "actions": len(wm.main_window.findChildren(QAction))}
+	wm.main_window.deleteLater()
+	return result
+
+
+def bench_lazy(spec):
+	wm = _window()
+	result = {"ready_ms": round(_ready_ms(wm, lambda: wm.build_menus(spec)), 3)}
+	builder = wm.get_menu_builder()
+	start = time.perf_counter()
+	builder.menus[0].aboutToShow.emit()
+	result["first_menu_open_ms"] = round((time.perf_counter() - start) * 1000, 3)
+	start = time.perf_counter()
+	builder.populate_all()
+	result["populate_rest_ms"] = round((time.perf_counter() - start) * 1000, 3)
+	result["stats"] = builder.stats()
+	wm.main_window.deleteLater()
+	return result
+
+
+def main():
+	menus, submenus, items = (int(arg) for arg in sys.argv[1:4]) if len(sys.argv) > 3 else (10, 10, 15)
+	with tempfile.TemporaryDirectory() as directory:
+		_window()
+		icons = _icons(directory)
+		spec = _spec(menus, submenus, items, icons, lambda: None)
+		report = {
+			"menu_items": menus * submenus * items + RECENT,
+			"eager": bench_eager(spec),
+			"lazy": bench_lazy(spec),
+		}
+	print(json.dumps(report, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,101 @@
+"""
+深层嵌套布局的缩放基准：row()/column() 嵌套层数对窗口缩放耗时的影响
+
+仪表盘是交替的行/列组成的满二叉树，叶子是一个标签和一个输入框，层数越多布局对象越多。
+分别统计构建并首次显示、窗口缩放（来回交替的尺寸和连续拖动）、修改一个标签文字后重新布局的耗时，
+以及暂停绘制时只做布局计算和移动控件的耗时，用来判断缩放的开销在布局还是在绘制。
+
+--flatten 时同一棵树再用 column(flatten=True) 构建一次（整棵树编译成一个带跨行/跨列的 QGridLayout），
+与嵌套布局对比。
+用法: python benchmarks/bench_nested_layout.py [--flatten] [层数1 层数2 ...]
+"""
+import os
+import sys
+import json
+import time
+import logging
+import statistics
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtWidgets import QLayout
+from pyQtAPI import WindowMaker
+
+RESIZES = 40
+
+
+def _fill(wm, depth, horizontal, labels, path=""):
+	if depth == 0:
+		labels.append(wm.add_label(f"指标 {path}"))
+		wm.add_line_edit(text=path or "0")
+		return
+	for branch in "01":
+		wm.row() if horizontal else wm.column()
+		_fill(wm, depth - 1, not horizontal, labels, path + branch)
+		wm.end()
+
+
+def _median_ms(wm, steps):
+	samples = []
+	for step in steps:
+		start = time.perf_counter()
+		step()
+		wm.app.processEvents()
+		samples.append((time.perf_counter() - start) * 1000)
+	return round(statistics.median(samples), 3)
+
+
+def bench(depth, flatten=False):
+	wm = WindowMaker(feedback_type=WindowMaker.FEEDBACK_LOG, log_file_path=os.devnull)
+	wm.logger.setLevel(logging.WARNING)
+	labels = []
+	start = time.perf_counter()
+	# 两种方式都放在一列中，与嵌套时所在的中央布局相同
+	wm.column(flatten=flatten)
+	_fill(wm, depth, True, labels)
+	wm.end()
+	window = wm.main_window
+	window.resize(window.sizeHint())
+	window.show()
+	wm.app.processEvents()
+	build_ms = (time.perf_counter() - start) * 1000
+
+	# 从首选尺寸开始放大，窗口不能缩到最小尺寸以下
+	width, height = window.width(), window.height()
+	alternate = [(width, height) if index % 2 else (width * 5 // 4, height * 5 // 4) for index in range(RESIZES)]
+	drag = [(width + index * 3, height + index) for index in range(RESIZES)]
+	result = {
+		"layouts": len(window.findChildren(QLayout)),
+		"widgets": len(labels) * 2,
+		"build_and_show_ms": round(build_ms, 3),
+		"resize_alternate_ms": _median_ms(wm, [lambda size=size: window.resize(*size) for size in alternate]),
+		"resize_drag_ms": _median_ms(wm, [lambda size=size: window.resize(*size) for size in drag]),
+		"text_change_ms": _median_ms(wm, [
+			lambda index=index: labels[index * 7 % len(labels)].setText("已更新的指标" * (1 + index % 2))
+			for index in range(RESIZES)
+		]),
+	}
+	# 暂停绘制，只剩布局计算和移动控件
+	window.setUpdatesEnabled(False)
+	result["relayout_no_paint_ms"] = _median_ms(wm, [lambda size=size: window.resize(*size) for size in alternate])
+	window.setUpdatesEnabled(True)
+	result["layout_share"] = round(result["relayout_no_paint_ms"] / result["resize_alternate_ms"], 3)
+	window.deleteLater()
+	wm.app.processEvents()
+	return result
+
+
+def main():
+	args = sys.argv[1:]
+	flatten = "--flatten" in args
+	depths = [int(arg) for arg in args if arg != "--flatten"] or [4, 6, 8, 10]
+	if flatten:
+		report = {str(depth): {"nested": bench(depth), "flat": bench(depth, True)} for depth in depths}
+	else:
+		report = {str(depth): bench(depth) for depth in depths}
+	print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+	main()
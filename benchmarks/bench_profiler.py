@@ -0,0 +1,61 @@
+"""
+性能分析器开销基准：信号触发槽函数的单次耗时
+
+比较：直接连接的槽函数、经 _wrap_slot 连接但未开启分析器、开启分析器。
+用法: python benchmarks/bench_profiler.py [次数]
+"""
+import os
+import sys
+import json
+import time
+import logging
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtCore import QObject, pyqtSignal
+from pyQtAPI import WindowMaker
+
+
+class _Emitter(QObject):
+	fired = pyqtSignal(bool)
+
+
+def _per_emit_us(emitter, count):
+	start = time.perf_counter()
+	for _ in range(count):
+		emitter.fired.emit(False)
+	return (time.perf_counter() - start) / count * 1e6
+
+
+def main():
+	count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+	wm = WindowMaker(feedback_type=WindowMaker.FEEDBACK_LOG, log_file_path=os.devnull)
+	wm.logger.setLevel(logging.WARNING)
+	calls = []
+
+	def slot():
+		calls.append(None)
+
+	results = {}
+	raw = _Emitter()
+	raw.fired.connect(slot)
+	results["direct"] = _per_emit_us(raw, count)
+
+	wrapped = _Emitter()
+	wrapped.fired.connect(wm._wrap_slot(slot))
+	results["wrapped_profiler_off"] = _per_emit_us(wrapped, count)
+
+	profiler = wm.enable_profiler()
+	results["wrapped_profiler_on"] = _per_emit_us(wrapped, count)
+	wm.disable_profiler()
+
+	print(json.dumps({
+		"count": count,
+		"per_emit_us": {name: round(value, 3) for name, value in results.items()},
+		"recorded_calls": sum(summary["count"] for summary in profiler.stats()["slots"].values()),
+	}, indent=2))
+
+
+if __name__ == "__main__":
+	main()
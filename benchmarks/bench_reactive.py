@@ -0,0 +1,97 @@
+"""
+响应式界面更新基准：状态变化后差量更新 vs 销毁重建
+
+仪表盘由若干行、每行若干标签组成，每次状态变化只改动少量单元格。
+用法: python benchmarks/bench_reactive.py [行数] [每行列数] [更新次数]
+"""
+import os
+import sys
+import json
+import time
+import logging
+import statistics
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pyQtAPI import WindowMaker
+
+
+def dashboard(rows, columns):
+	def render(state):
+		values = state["values"]
+		return [
+			{"type": "label", "id": "title", "text": f"第 {state['tick']} 次刷新"},
+			[{"type": "row", "key": row, "children": [
+				{"type": "label", "key": column, "text": f"{values[row * columns + column]:.2f}"}
+				for column in range(columns)
+			]} for row in range(rows)],
+		]
+	return render
+
+
+def _new_window():
+	wm = WindowMaker(feedback_type=WindowMaker.FEEDBACK_LOG, log_file_path=os.devnull)
+	wm.logger.setLevel(logging.WARNING)
+	wm.main_window.show()
+	return wm
+
+
+def _next_state(state, tick, cells):
+	values = list(state["values"])
+	for offset in range(5):
+		values[(tick * 7 + offset * 13) % cells] += 1
+	return {"tick": tick, "values": values}
+
+
+def bench_diff(rows, columns, updates):
+	wm = _new_window()
+	state = {"tick": 0, "values": [0.0] * (rows * columns)}
+	view = wm.reactive(dashboard(rows, columns), state)
+	wm.app.processEvents()
+	samples = []
+	for tick in range(1, updates + 1):
+		start = time.perf_counter()
+		view.set_state(**_next_state(view.state, tick, rows * columns))
+		wm.app.processEvents()
+		samples.append((time.perf_counter() - start) * 1000)
+	wm.main_window.deleteLater()
+	return {"median_ms": round(statistics.median(samples), 3), "max_ms": round(max(samples), 3),
+			"last_patch": view.last_patch}
+
+
+def bench_rebuild(rows, columns, updates):
+	wm = _new_window()
+	render = dashboard(rows, columns)
+	state = {"tick": 0, "values": [0.0] * (rows * columns)}
+	container = None
+	samples = []
+	for tick in range(updates + 1):
+		start = time.perf_counter()
+		if container is not None:
+			container.setParent(None)
+			container.deleteLater()
+		with wm.batch() as container:
+			wm._build_node(render(state), {})
+		wm.app.processEvents()
+		if tick:
+			samples.append((time.perf_counter() - start) * 1000)
+		state = _next_state(state, tick + 1, rows * columns)
+	wm.main_window.deleteLater()
+	return {"median_ms": round(statistics.median(samples), 3), "max_ms": round(max(samples), 3)}
+
+
+def main():
+	rows = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+	columns = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+	updates = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+	results = {
+		"diff": bench_diff(rows, columns, updates),
+		"rebuild": bench_rebuild(rows, columns, updates),
+	}
+	print(json.dumps({"cells": rows * columns, "updates": updates, "results": results},
+					 indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,105 @@
+"""
+启动快照基准：冷启动时用户看到第一帧的时间
+
+每次测量都在新进程中运行同一个构建脚本（本文件的 --child 模式）：菜单栏加若干行控件。
+比较：不使用启动快照、启动快照未命中（第一次运行，写入快照）、命中（显示上次的截图）。
+时间从导入 pyQtAPI 开始计时。
+用法: python benchmarks/bench_startup_cache.py [行数] [重复次数]
+"""
+import os
+import sys
+import json
+import tempfile
+import statistics
+import subprocess
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def child(rows, cache_path):
+	import logging
+	from PyQt5.QtCore import QTimer
+	from PyQt5.QtWidgets import QScrollArea, QVBoxLayout, QWidget
+	from pyQtAPI import WindowMaker
+
+	wm = WindowMaker(feedback_type=WindowMaker.FEEDBACK_LOG, log_file_path=os.devnull,
+					 log_level=logging.WARNING, size=(800, 600), startup_cache=cache_path or None)
+	menu = wm.add_menu("文件")
+	for index in range(20):
+		wm.add_menu_item(menu, f"菜单项 {index}", lambda: None)
+	# 行放在滚动区域里，窗口保持固定大小
+	scroll = QScrollArea()
+	scroll.setWidgetResizable(True)
+	content = QWidget()
+	wm.layout_stack.append(QVBoxLayout(content))
+	for row in range(rows):
+		wm.row()
+		wm.add_label(f"第 {row} 行", css={"color": "#333"})
+		wm.add_line_edit(text=str(row))
+		wm.add_checkbox(None, "启用")
+		wm.add_button("删除", css={"color": "#F66"}, command=lambda: None)
+		wm.end()
+	wm.layout_stack.pop()
+	scroll.setWidget(content)
+	wm.layout_stack[-1].addWidget(scroll)
+
+	def report():
+		stats = wm.get_startup_stats() or {}
+		print(json.dumps({"first_frame_ms": stats.get("first_frame_ms"),
+						  "cached_frame_ms": stats.get("cached_frame_ms")}), flush=True)
+		wm.main_window.close()
+
+	# 第一次绘制之后再报告
+	QTimer.singleShot(0, lambda: QTimer.singleShot(0, report))
+	if not cache_path:
+		# 不使用快照时自己记录第一帧
+		from pyQtAPI import StartupSnapshot
+		wm.startup_snapshot = StartupSnapshot(os.devnull, "")
+		wm.startup_snapshot.save = lambda background=True: False
+	wm.run()
+
+
+def _run(rows, cache_path):
+	output = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", str(rows), cache_path],
+							capture_output=True, text=True, timeout=300).stdout
+	return json.loads(output.strip().splitlines()[-1])
+
+
+def _summary(samples, field):
+	values = [sample[field] for sample in samples if sample[field] is not None]
+	return round(statistics.median(values), 1) if values else None
+
+
+def main():
+	rows = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+	repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+	with tempfile.TemporaryDirectory() as directory:
+		cache_path = os.path.join(directory, "bench.snap")
+		baseline = []
+		misses = []
+		hits = []
+		# 三种情况交替运行，减少机器负载波动的影响
+		for _ in range(repeat):
+			baseline.append(_run(rows, ""))
+			if os.path.exists(cache_path):
+				os.remove(cache_path)
+			misses.append(_run(rows, cache_path))
+			hits.append(_run(rows, cache_path))
+		snapshot_bytes = os.path.getsize(cache_path)
+	print(json.dumps({
+		"widgets": rows * 4,
+		"runs": repeat,
+		"no_cache_first_frame_ms": _summary(baseline, "first_frame_ms"),
+		"miss_first_frame_ms": _summary(misses, "first_frame_ms"),
+		"hit_cached_frame_ms": _summary(hits, "cached_frame_ms"),
+		"hit_first_frame_ms": _summary(hits, "first_frame_ms"),
+		"snapshot_bytes": snapshot_bytes,
+	}, indent=2))
+
+
+if __name__ == "__main__":
+	if len(sys.argv) > 1 and sys.argv[1] == "--child":
+		child(int(sys.argv[2]), sys.argv[3] if len(sys.argv) > 3 else "")
+	else:
+		main()
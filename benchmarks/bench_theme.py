@@ -0,0 +1,147 @@
+"""
+主题切换基准：在大量控件的窗口中切换两套配色
+
+比较：逐个控件 setStyleSheet（css= 参数的做法）、直接替换 QApplication 的样式表、
+ThemeManager 预先打包两套主题后切换；另外统计主题文件首次编译和命中编译缓存的耗时。
+用法: python benchmarks/bench_theme.py [控件数] [切换次数]
+"""
+import os
+import sys
+import json
+import time
+import logging
+import tempfile
+import statistics
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtWidgets import QScrollArea, QVBoxLayout, QWidget
+from pyQtAPI import WindowMaker
+
+PALETTES = {
+	"light": {"bg": "#FFFFFF", "fg": "#222222", "primary": "#4CAF50", "border": "#CCCCCC"},
+	"dark": {"bg": "#202124", "fg": "#E8EAED", "primary": "#8AB4F8", "border": "#5F6368"},
+}
+
+BASE_QSS = """
+QPushButton { background: $primary; color: $bg; border: 1px solid $border; border-radius: 4px; padding: 4px; }
+QPushButton:hover { background: $fg; }
+QLabel { color: $fg; }
+QLineEdit { background: $bg; color: $fg; border: 1px solid $border; }
+"""
+
+# 逐个控件设置时，每种控件使用的样式
+PER_WIDGET = {
+	"QPushButton": "background: {primary}; color: {bg}; border: 1px solid {border}; border-radius: 4px; padding: 4px;",
+	"QLabel": "color: {fg};",
+	"QLineEdit": "background: {bg}; color: {fg}; border: 1px solid {border};",
+}
+
+
+def _build(widgets):
+	wm = WindowMaker(feedback_type=WindowMaker.FEEDBACK_LOG, log_file_path=os.devnull)
+	wm.logger.setLevel(logging.WARNING)
+	scroll = QScrollArea()
+	scroll.setWidgetResizable(True)
+	content = QWidget()
+	wm.layout_stack.append(QVBoxLayout(content))
+	created = []
+	for row in range(widgets // 3):
+		wm.row()
+		created.append(wm.add_label(f"第 {row} 行"))
+		created.append(wm.add_line_edit(text=str(row)))
+		created.append(wm.add_button("确定"))
+		wm.end()
+	wm.layout_stack.pop()
+	scroll.setWidget(content)
+	wm.layout_stack[-1].addWidget(scroll)
+	wm.main_window.resize(800, 600)
+	wm.main_window.show()
+	wm.app.processEvents()
+	return wm, created
+
+
+def _switch(wm, apply, switches):
+	samples = []
+	for index in range(switches):
+		start = time.perf_counter()
+		apply(("light", "dark")[index % 2])
+		wm.app.processEvents()
+		samples.append((time.perf_counter() - start) * 1000)
+	return round(statistics.median(samples), 2)
+
+
+def bench_per_widget(widgets, switches):
+	wm, created = _build(widgets)
+
+	def apply(palette):
+		for widget in created:
+			widget.setStyleSheet(PER_WIDGET[widget.metaObject().className()].format(**PALETTES[palette]))
+
+	result = _switch(wm, apply, switches)
+	wm.main_window.deleteLater()
+	return result
+
+
+def _write_themes(directory):
+	with open(os.path.join(directory, "base.qss"), "w", encoding="utf-8") as file:
+		file.write(BASE_QSS)
+	paths = {}
+	for name, palette in PALETTES.items():
+		paths[name] = os.path.join(directory, f"{name}.qss")
+		with open(paths[name], "w", encoding="utf-8") as file:
+			file.write('@import "base.qss";\n' + "".join(f"${key}: {value};\n" for key, value in palette.items()))
+	return paths
+
+
+def bench_app_sheet(widgets, switches, directory):
+	wm, _ = _build(widgets)
+	paths = _write_themes(directory)
+	manager = wm.get_theme_manager()
+	sheets = {name: manager.compile(path).sheet for name, path in paths.items()}
+	result = _switch(wm, lambda palette: wm.app.setStyleSheet(sheets[palette]), switches)
+	wm.app.setStyleSheet("")
+	wm.main_window.deleteLater()
+	return result
+
+
+def bench_theme(widgets, switches, directory):
+	wm, _ = _build(widgets)
+	paths = _write_themes(directory)
+	manager = wm.get_theme_manager()
+
+	start = time.perf_counter()
+	manager.compile(paths["light"])
+	first_compile = (time.perf_counter() - start) * 1000
+	start = time.perf_counter()
+	manager.compile(paths["light"])
+	cached_compile = (time.perf_counter() - start) * 1000
+
+	start = time.perf_counter()
+	manager.preload(paths["light"], paths["dark"])
+	wm.app.processEvents()
+	preload = (time.perf_counter() - start) * 1000
+
+	result = _switch(wm, lambda palette: manager.apply(paths[palette]), switches)
+	stats = manager.stats()
+	manager.clear()
+	wm.main_window.deleteLater()
+	return {"switch_ms": result, "preload_ms": round(preload, 2), "first_compile_ms": round(first_compile, 3),
+			"cached_compile_ms": round(cached_compile, 3), "stats": stats}
+
+
+def main():
+	widgets = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+	switches = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+	with tempfile.TemporaryDirectory() as directory:
+		results = {
+			"per_widget_switch_ms": bench_per_widget(widgets, switches),
+			"app_sheet_switch_ms": bench_app_sheet(widgets, switches, directory),
+			"theme_manager": bench_theme(widgets, switches, directory),
+		}
+	print(json.dumps({"widgets": widgets, "switches": switches, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+	main()
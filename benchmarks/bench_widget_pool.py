@@ -0,0 +1,81 @@
+"""
+控件池基准：反复创建、移除成行的按钮/标签/输入框/复选框，比较开启与关闭控件池的耗时
+
+开启控件池时还统计停放控件的常驻内存增量，平均到每个停放控件（WidgetPool.ESTIMATED_WIDGET_BYTES 的来源）。
+
+用法: python benchmarks/bench_widget_pool.py [每轮行数] [轮数]
+"""
+import os
+import sys
+import json
+import time
+import logging
+import statistics
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pyQtAPI import WindowMaker
+
+
+def _rss_kb():
+	"""当前进程的常驻内存（KB），仅Linux"""
+	try:
+		with open("/proc/self/statm") as file:
+			return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+	except (OSError, ValueError):
+		return None
+
+
+def churn(pooled, rows, rounds):
+	wm = WindowMaker(feedback_type=WindowMaker.FEEDBACK_LOG, log_file_path=os.devnull)
+	wm.logger.setLevel(logging.WARNING)
+	if pooled:
+		wm.use_widget_pool(max_per_key=rows)
+	wm.main_window.show()
+	wm.app.processEvents()
+
+	rss_before = _rss_kb()
+	samples = []
+	for round_index in range(rounds):
+		start = time.perf_counter()
+		created = []
+		wm.column()
+		column = wm.layout_stack[-1]
+		for row in range(rows):
+			wm.row()
+			created.append(wm.add_label(f"第 {row} 行", css={"color": "#DDD"}))
+			created.append(wm.add_line_edit(text=str(round_index), placeholder="值"))
+			created.append(wm.add_checkbox(None, "启用", checked=bool(row % 2)))
+			created.append(wm.add_button("删除", css={"color": "#F66"}, command=lambda: None))
+			wm.end()
+		wm.end()
+		wm.app.processEvents()
+		for widget in created:
+			wm.release_widget(widget)
+		# 空的行布局随列布局一起销毁，避免逐轮累积
+		wm.main_layout.removeItem(column)
+		column.deleteLater()
+		wm.app.processEvents()
+		samples.append((time.perf_counter() - start) * 1000)
+
+	result = {"median_round_ms": round(statistics.median(samples[1:] or samples), 3)}
+	if pooled:
+		result["pool"] = wm.get_widget_pool_stats()
+		rss_after = _rss_kb()
+		parked = result["pool"]["parked"]
+		if rss_before is not None and parked:
+			result["rss_per_parked_bytes"] = (rss_after - rss_before) * 1024 // parked
+	wm.main_window.deleteLater()
+	return result
+
+
+def main():
+	rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+	rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+	results = {"no_pool": churn(False, rows, rounds), "pool": churn(True, rows, rounds)}
+	print(json.dumps({"widgets_per_round": rows * 4, "rounds": rounds, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,239 @@
+"""
+WindowMaker 无界面基准测试
+
+在 QT_QPA_PLATFORM=offscreen 下测量 WindowMaker 的构建开销和事件吞吐，结果输出为JSON。
+传入 --baseline 时与上一次的结果比较，超过阈值的项目记为回归，并以退出码1结束。
+
+用法:
+  python benchmarks/bench_windowmaker.py --output result.json
+  python benchmarks/bench_windowmaker.py --baseline result.json --threshold 0.2
+"""
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import platform
+import statistics
+import subprocess
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from PyQt5.QtCore import QSize
+from PyQt5.QtGui import QImage, QColor, QPixmap
+from PyQt5.QtWidgets import QLabel
+from pyQtAPI import WindowMaker, AutoScaledLabel
+
+# import pyQtAPI 时不应该被拉进来的模块
+IMPORT_FORBIDDEN = ("BSODwindow", "ctypes", "asyncio", "concurrent.futures", "numpy",
+					"logging.handlers", "mmap", "hashlib", "json")
+
+
+def check_import():
+	"""在子进程中用 -X importtime 导入pyQtAPI，返回耗时和多余的模块"""
+	output = subprocess.run(
+		[sys.executable, "-X", "importtime", "-c", "import pyQtAPI"],
+		cwd=ROOT, capture_output=True, text=True, env=dict(os.environ),
+	).stderr
+	modules = {}
+	for line in output.splitlines():
+		if not line.startswith("import time:") or "|" not in line:
+			continue
+		_, cumulative, name = line[len("import time:"):].split("|")
+		if cumulative.strip().isdigit():
+			modules[name.strip()] = int(cumulative)
+	forbidden = sorted(name for name in modules if name.split(".")[0] in IMPORT_FORBIDDEN
+					   or name in IMPORT_FORBIDDEN)
+	return {
+		"import_ms": modules.get("pyQtAPI", 0) / 1000,
+		"module_count": len(modules),
+		"forbidden_modules": forbidden,
+	}
+
+
+def _new_window():
+	wm = WindowMaker(feedback_type=WindowMaker.FEEDBACK_LOG, log_file_path=os.devnull)
+	wm.logger.setLevel(logging.WARNING)
+	return wm
+
+
+def _settle(wm):
+	wm.app.processEvents()
+
+
+def _timed(fn, repeat):
+	"""运行repeat次，返回耗时中位数（毫秒）"""
+	samples = []
+	for _ in range(repeat):
+		start = time.perf_counter()
+		fn()
+		samples.append((time.perf_counter() - start) * 1000)
+	return statistics.median(samples)
+
+
+def bench_init(count):
+	def run():
+		for _ in range(count):
+			wm = _new_window()
+			wm.main_window.deleteLater()
+	return run
+
+
+def bench_add(method, count, **kwargs):
+	def run():
+		wm = _new_window()
+		add = getattr(wm, method)
+		for _ in range(count):
+			add(**kwargs)
+		wm.main_window.show()
+		_settle(wm)
+		wm.main_window.deleteLater()
+	return run
+
+
+def bench_nested(depth, width):
+	def run():
+		wm = _new_window()
+		for level in range(depth):
+			if level % 2:
+				wm.column()
+			else:
+				wm.row()
+			for index in range(width):
+				wm.add_label(f"{level}-{index}")
+		for _ in range(depth):
+			wm.end()
+		wm.main_window.show()
+		_settle(wm)
+		wm.main_window.deleteLater()
+	return run
+
+
+def bench_styles(count, shared):
+	def run():
+		wm = _new_window()
+		wm.use_shared_styles(shared)
+		for index in range(count):
+			wm.add_button(f"b{index}", css={"color": "#333", "padding": "4px", "hover-color": "#f00"})
+		wm._flush_shared_styles()
+		wm.main_window.show()
+		_settle(wm)
+		wm.main_window.deleteLater()
+	return run
+
+
+def bench_resize_storm(labels, steps):
+	image = QImage(2000, 1500, QImage.Format_RGB32)
+	image.fill(QColor("#3D3D6B"))
+
+	def run():
+		wm = _new_window()
+		# QPixmap 只能在 QApplication 创建之后构造
+		pixmap = QPixmap.fromImage(image)
+		for _ in range(labels):
+			label = AutoScaledLabel(wm.central_widget)
+			label.original_pixmap = pixmap
+			wm.layout_stack[-1].addWidget(label)
+		wm.main_window.show()
+		for step in range(steps):
+			wm.main_window.resize(QSize(400 + step * 5, 300 + step * 3))
+			_settle(wm)
+		wm.main_window.deleteLater()
+	return run
+
+
+def bench_toggle(boxes, children, toggles):
+	def run():
+		wm = _new_window()
+		items = []
+		for index in range(boxes):
+			box = wm.add_collapsible_box(f"box {index}")
+			for child in range(children):
+				box.get_content_layout().addWidget(QLabel(f"{index}-{child}"))
+			items.append(box)
+		wm.main_window.show()
+		_settle(wm)
+		for _ in range(toggles):
+			for box in items:
+				box.toggle()
+			_settle(wm)
+		wm.main_window.deleteLater()
+	return run
+
+
+def run_all(scale, repeat):
+	n = max(1, int(200 * scale))
+	cases = {
+		"init_x10": bench_init(10),
+		"add_button": bench_add("add_button", n, text="按钮", css={"color": "#333"}),
+		"add_label": bench_add("add_label", n, text="标签"),
+		"add_line_edit": bench_add("add_line_edit", n, placeholder="输入"),
+		"add_text_edit": bench_add("add_text_edit", n, text="文本"),
+		"add_list_widget": bench_add("add_list_widget", n),
+		"add_box": bench_add("add_box", n),
+		"add_checkbox": bench_add("add_checkbox", n, parent=None, text="勾选"),
+		"add_radio_button": bench_add("add_radio_button", n, text="单选"),
+		"add_scroll_area": bench_add("add_scroll_area", n),
+		"add_collapsible_box": bench_add("add_collapsible_box", n, title="折叠"),
+		"nested_layouts": bench_nested(10, max(1, n // 20)),
+		"styles_per_widget": bench_styles(n, shared=False),
+		"styles_shared": bench_styles(n, shared=True),
+		"autoscaled_resize_storm": bench_resize_storm(4, 50),
+		"collapsible_toggle": bench_toggle(max(1, n // 10), 10, 10),
+	}
+	return {name: round(_timed(case, repeat), 3) for name, case in cases.items()}
+
+
+def compare(results, baseline, threshold):
+	"""返回超过阈值的回归项：{名称: (基线, 当前, 变化比例)}"""
+	regressions = {}
+	for name, value in results.items():
+		base = baseline.get(name)
+		if not base:
+			continue
+		change = (value - base) / base
+		if change > threshold:
+			regressions[name] = {"baseline_ms": base, "current_ms": value, "change": round(change, 3)}
+	return regressions
+
+
+def main():
+	parser = argparse.ArgumentParser(description="WindowMaker 无界面基准测试")
+	parser.add_argument("--output", help="把结果写入JSON文件")
+	parser.add_argument("--baseline", help="用于比较的基线JSON文件")
+	parser.add_argument("--threshold", type=float, default=0.2, help="判定为回归的变慢比例，默认0.2")
+	parser.add_argument("--scale", type=float, default=1.0, help="控件数量倍数")
+	parser.add_argument("--repeat", type=int, default=3, help="每项重复次数，取中位数")
+	args = parser.parse_args()
+
+	import_info = check_import()
+	timings = run_all(args.scale, args.repeat)
+	report = {
+		"python": platform.python_version(),
+		"platform": sys.platform,
+		"qpa": os.environ.get("QT_QPA_PLATFORM"),
+		"scale": args.scale,
+		"import": import_info,
+		"timings_ms": timings,
+	}
+
+	failed = bool(import_info["forbidden_modules"])
+	if args.baseline:
+		with open(args.baseline, "r", encoding="utf-8") as file:
+			baseline = json.load(file)
+		report["regressions"] = compare(timings, baseline.get("timings_ms", {}), args.threshold)
+		failed = failed or bool(report["regressions"])
+
+	text = json.dumps(report, indent=2, ensure_ascii=False)
+	if args.output:
+		with open(args.output, "w", encoding="utf-8") as file:
+			file.write(text)
+	print(text)
+	sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+	main()
@@ -1,6 +1,14 @@
-from BSODwindow import BSODWindow
-from PyQt5.QtCore import Qt, QTimer, QThread, pyqtSignal, QUrl, QSize, pyqtSlot, QEvent
-from PyQt5.QtGui import QIcon, QFont, QColor, QPixmap, QPainter, QImage, QKeySequence
+from PyQt5.QtCore import (
+	Qt, QTimer, QThread, pyqtSignal, QUrl, QSize, QPoint, QRect, pyqtSlot, QEvent,
+	QAbstractListModel, QAbstractTableModel, QModelIndex, QObject, QRunnable, QThreadPool,
+	QStringListModel, QVariantAnimation, QEasingCurve, QByteArray, QBuffer, QIODevice, QStandardPaths,
+	QT_VERSION_STR, QFileSystemWatcher
+)
+from PyQt5 import sip
+from PyQt5.QtGui import (
+	QIcon, QFont, QColor, QPixmap, QPainter, QImage, QKeySequence, QImageReader, QTextCursor,
+	QRegion
+)
 from PyQt5.QtWidgets import (
 	QApplication, QMainWindow, QWidget, QLabel, QPushButton, QLineEdit,
 	QTextEdit, QComboBox, QCheckBox, QRadioButton, QSlider, QProgressBar,
@@ -8,24 +16,1122 @@ from PyQt5.QtWidgets import (
 	QGroupBox, QFormLayout, QHBoxLayout, QVBoxLayout, QGridLayout,
 	QDialog, QMessageBox, QFileDialog, QInputDialog, QColorDialog,
 	QMenu, QToolBar, QStatusBar, QAction, QSystemTrayIcon, QMenuBar,
-	QLayout, QTextBrowser, QDialogButtonBox, QButtonGroup, QSizePolicy, QScrollArea, QFrame
+	QLayout, QTextBrowser, QDialogButtonBox, QButtonGroup, QSizePolicy, QScrollArea, QFrame,
+	QListView, QTableView, QHeaderView, QPlainTextEdit, QCompleter, QSplashScreen
 )
 import time
 import os
 import sys
 import traceback
-import datetime
 import logging
-import ctypes
+import importlib
+import contextlib
+import threading
+import inspect
+import math
+import re
 import atexit
+import bisect
+from array import array
+from collections import OrderedDict, namedtuple, deque
+
+# 导入本模块的时间，作为启动耗时的起点
+_IMPORT_TIME = time.perf_counter()
+
+
+# 可选子系统：名称 -> (模块名, 支持的平台)，平台为None表示不限平台
+# 这些模块只在首次使用时导入，避免拖慢 import pyQtAPI
+_OPTIONAL_SUBSYSTEMS = {
+	"bsod": ("BSODwindow", ("win32",)),
+}
+_loaded_subsystems = {}
+
+
+def _load_subsystem(name):
+	"""
+	按需加载可选子系统
+
+	:param name: _OPTIONAL_SUBSYSTEMS 中登记的子系统名称
+	:return: 已导入的模块；当前平台不支持时返回None
+	"""
+	if name in _loaded_subsystems:
+		return _loaded_subsystems[name]
+	module_name, platforms = _OPTIONAL_SUBSYSTEMS[name]
+	module = None
+	if platforms is None or sys.platform in platforms:
+		module = importlib.import_module(module_name)
+	_loaded_subsystems[name] = module
+	return module
+
+
+# 编译后的样式：key为缓存键，sheet为单控件样式表，rules为(伪状态, 声明)列表
+CompiledStyle = namedtuple("CompiledStyle", ["key", "sheet", "rules"])
+
+
+class StyleSheetCompiler:
+	"""
+	css字典 -> Qt样式表 的编译器，编译结果按LRU缓存
+
+	缓存键由选择器、基础样式、按原顺序排列的css键值对和hover/selected样式组成，
+	样式相同的控件共享同一份编译结果，不再重复拼接字符串。
+	"""
+
+	def __init__(self, max_size=512):
+		self.max_size = max_size
+		self.hits = 0
+		self.misses = 0
+		self._cache = OrderedDict()
+		self._class_ids = {}
+
+	def compile(self, css=None, selector=None, base="", hover=None, selected=None):
+		"""
+		编译样式
+
+		:param css: css字典；指定selector时以"hover-"开头的键编译为:hover样式
+		:param selector: 控件选择器，如"QPushButton"；为None时输出裸声明
+		:param base: 放在css之前的基础样式字符串
+		:param hover: :hover 状态的样式字符串
+		:param selected: :selected 状态的样式字符串
+		:return: CompiledStyle 对象
+		"""
+		items = ()
+		if css and isinstance(css, dict):
+			# 保持调用方的顺序：Qt样式表中后写的声明覆盖先写的，排序会改变显示效果
+			items = tuple((str(k), str(v)) for k, v in css.items())
+		key = (selector, base or "", items, hover, selected)
+
+		style = self._cache.get(key)
+		if style is not None:
+			self._cache.move_to_end(key)
+			self.hits += 1
+			return style
+
+		self.misses += 1
+		style = self._compile(key)
+		self._cache[key] = style
+		if len(self._cache) > self.max_size:
+			self._cache.popitem(last=False)
+		return style
+
+	@staticmethod
+	def _compile(key):
+		selector, base, items, hover, selected = key
+		normal_style = base
+		hover_style = ""
+		for name, value in items:
+			if selector and name.startswith("hover-"):
+				hover_style += f"{name[len('hover-'):]}: {value};"
+			else:
+				normal_style += f"{name}: {value};"
+
+		rules = []
+		if normal_style:
+			rules.append(("", normal_style))
+		if hover_style:
+			rules.append((":hover", hover_style))
+		if hover is not None:
+			rules.append((":hover", hover))
+		if selected is not None:
+			rules.append((":selected", selected))
+
+		if selector:
+			sheet = " ".join(f"{selector}{pseudo} {{{decl}}}" for pseudo, decl in rules)
+		else:
+			sheet = ""
+			if hover is not None:
+				sheet += f":hover {{ {hover} }}"
+			if selected is not None:
+				sheet += f":selected {{ {selected} }}"
+			sheet += normal_style
+		return CompiledStyle(key, sheet, tuple(rules))
+
+	def class_id(self, style):
+		"""返回样式的稳定编号，用于共享样式表中的属性选择器"""
+		class_id = self._class_ids.get(style.key)
+		if class_id is None:
+			class_id = len(self._class_ids) + 1
+			self._class_ids[style.key] = class_id
+		return class_id
+
+	def stats(self):
+		"""
+		获取缓存统计
+
+		:return: 包含 hits/misses/size/max_size/hit_rate 的字典
+		"""
+		total = self.hits + self.misses
+		return {
+			"hits": self.hits,
+			"misses": self.misses,
+			"size": len(self._cache),
+			"max_size": self.max_size,
+			"hit_rate": self.hits / total if total else 0.0,
+		}
+
+	def clear(self):
+		"""清空缓存和统计"""
+		self._cache.clear()
+		self.hits = 0
+		self.misses = 0
+
+
+# 编译后的主题：sheet为展开@import并替换变量后的完整样式表，files为 ((路径, 修改时间, 大小), ...)，
+# variables为最终使用的变量，missing为引用了但没有定义的变量名
+Theme = namedtuple("Theme", ["name", "path", "sheet", "files", "variables", "missing"])
+
+_THEME_IMPORT = re.compile(r'@import\s+(?:url\()?\s*["\']?([^"\')\s;]+)["\']?\s*\)?\s*;')
+_THEME_VARIABLE_DEF = re.compile(r'^[ \t]*\$([\w-]+)[ \t]*:[ \t]*([^;\n]+);[ \t]*\n?', re.M)
+_THEME_VARIABLE_REF = re.compile(r'\$([\w-]+)')
+_THEME_COMMENT = re.compile(r'/\*.*?\*/', re.S)
+_THEME_RULE = re.compile(r'([^{}]+)\{([^{}]*)\}')
+
+
+def _file_stamp(path):
+	"""(修改时间, 大小)，文件不存在时返回None"""
+	try:
+		stat = os.stat(path)
+	except OSError:
+		return None
+	return stat.st_mtime_ns, stat.st_size
+
+
+class ThemeManager(QObject):
+	"""
+	QSS/CSS 主题文件管理
+
+	主题在 QApplication 上整体应用，控件自己的样式表（css= 参数）优先级高于主题。
+
+	应用过的主题合并成一份打包样式表：每个主题的规则都限定在带有 pqlTheme 属性的
+	顶层窗口之下，应用主题时给所有顶层窗口标记当前主题的编号。之后新建的没有父窗口的
+	顶层窗口要用 tag_window() 标记（WindowMaker 创建的窗口会自动标记），
+	有父窗口的对话框和弹出菜单随父窗口的主题。
+	切换到已打包的主题时只修改顶层窗口的属性并重新polish一遍控件，不再替换
+	QApplication 的样式表——Qt替换应用级样式表时要撤销并重建每个控件的样式，
+	耗时是重新polish的数倍（见 benchmarks/bench_theme.py）。
+	加载新主题或主题内容变化时才重建打包样式表。
+
+	主题文件支持：
+	- @import "other.qss"; 按相对路径展开
+	- 变量：$primary: #4CAF50; 定义，$primary 引用；apply() 传入的变量优先于文件中的定义
+
+	编译结果按 (路径, 变量) 缓存，文件未修改时再次切换到同一主题不重新读取和编译；
+	export() 可把编译结果写成不含导入和变量的单个文件，直接作为主题加载。
+	开启 watch 后，主题涉及的任一文件变化时经过防抖延迟自动重新加载。
+	"""
+
+	# 文件变化后等待多少毫秒再重新加载，编辑器保存时常连续触发多次变化
+	RELOAD_DELAY = 200
+
+	# 顶层窗口上标记当前主题的动态属性名
+	THEME_PROPERTY = "pqlTheme"
+
+	# 应用了新主题，参数为 Theme
+	theme_changed = pyqtSignal(object)
+	# 自动重新加载失败（例如文件正在写入），参数为错误信息；当前主题保持不变
+	reload_failed = pyqtSignal(str)
+
+	def __init__(self, max_cached=16, parent=None):
+		super().__init__(parent)
+		self.max_cached = max_cached
+		self.current = None
+		self.compiles = 0
+		self.hits = 0
+		self.reloads = 0
+		self.restyles = 0
+		self.switches = 0
+		self._variables = {}
+		self._compiled = OrderedDict()
+		# 打包样式表中的主题：路径 -> (编号, Theme)
+		self._bundle = {}
+		# 应用级样式表是否为当前的打包样式表
+		self._installed = False
+		self._watcher = None
+		self._reload_timer = QTimer(self)
+		self._reload_timer.setSingleShot(True)
+		self._reload_timer.setInterval(self.RELOAD_DELAY)
+		self._reload_timer.timeout.connect(self.reload)
+
+	def compile(self, path, variables=None):
+		"""
+		编译主题文件
+
+		:param path: 主题文件路径
+		:param variables: 覆盖文件中定义的变量，如 {"primary": "#2196F3"}
+		:return: Theme 对象
+		"""
+		path = os.path.abspath(path)
+		variables = {str(name): str(value) for name, value in (variables or {}).items()}
+		key = (path, tuple(sorted(variables.items())))
+		theme = self._compiled.get(key)
+		if theme is not None and all(_file_stamp(file) == stamp for file, stamp in theme.files):
+			self._compiled.move_to_end(key)
+			self.hits += 1
+			return theme
+
+		theme = self._compile(path, variables)
+		self.compiles += 1
+		self._compiled[key] = theme
+		if len(self._compiled) > self.max_cached:
+			self._compiled.popitem(last=False)
+		return theme
+
+	@staticmethod
+	def _compile(path, overrides):
+		files = []
+
+		def expand(file_path, importers):
+			if file_path in importers:
+				raise ValueError(f"主题文件循环导入: {' -> '.join(importers + (file_path,))}")
+			stamp = _file_stamp(file_path)
+			with open(file_path, encoding="utf-8") as file:
+				text = file.read()
+			files.append((file_path, stamp))
+			base_dir = os.path.dirname(file_path)
+			return _THEME_IMPORT.sub(
+				lambda match: expand(os.path.normpath(os.path.join(base_dir, match.group(1))),
+									 importers + (file_path,)),
+				text)
+
+		sheet = expand(path, ())
+		definitions = {name: value.strip() for name, value in _THEME_VARIABLE_DEF.findall(sheet)}
+		definitions.update(overrides)
+		sheet = _THEME_VARIABLE_DEF.sub("", sheet)
+
+		missing = set()
+
+		def substitute(match):
+			name = match.group(1)
+			if name in definitions:
+				return definitions[name]
+			missing.add(name)
+			return match.group(0)
+
+		# 变量的值可以引用其他变量，先把定义本身展开（最多展开8层，防止循环引用）
+		for _ in range(8):
+			resolved = {name: _THEME_VARIABLE_REF.sub(substitute, value) for name, value in definitions.items()}
+			if resolved == definitions:
+				break
+			definitions = resolved
+		sheet = _THEME_VARIABLE_REF.sub(substitute, sheet)
+		name = os.path.splitext(os.path.basename(path))[0]
+		return Theme(name, path, sheet, tuple(files), definitions, tuple(sorted(missing)))
+
+	def apply(self, theme, variables=None, watch=None):
+		"""
+		在 QApplication 上应用主题
+
+		:param theme: 主题文件路径或 Theme 对象
+		:param variables: 主题为路径时覆盖的变量
+		:param watch: 是否监视文件变化并自动重新加载；为None时保持当前设置
+		:return: 应用的 Theme 对象
+		"""
+		if not isinstance(theme, Theme):
+			self._variables = dict(variables or {})
+			theme = self.compile(theme, self._variables)
+		bundled = self._bundle.get(theme.path)
+		if self._installed and bundled is not None and bundled[1].sheet == theme.sheet:
+			if self.current is None or self.current.path != theme.path:
+				self._switch(bundled[0])
+		else:
+			self._add_to_bundle(theme)
+			self._restyle(theme)
+		self.current = theme
+		if watch is not None:
+			self.watch(watch)
+		elif self._watcher is not None:
+			self._watch_files()
+		self.theme_changed.emit(theme)
+		return theme
+
+	def preload(self, *paths):
+		"""
+		预先编译并打包多个主题，之后在它们之间切换都不再替换应用级样式表
+
+		当前主题保持不变；没有当前主题时应用第一个主题。
+
+		:param paths: 主题文件路径
+		"""
+		themes = [self.compile(path) for path in paths]
+		for theme in themes:
+			self._add_to_bundle(theme)
+		if self.current is None:
+			self.apply(themes[0])
+		else:
+			self._restyle(self.current)
+
+	def _add_to_bundle(self, theme):
+		bundled = self._bundle.get(theme.path)
+		self._bundle[theme.path] = (bundled[0] if bundled is not None else len(self._bundle) + 1, theme)
+
+	def _restyle(self, theme):
+		"""重建打包样式表并替换应用级样式表，顶层窗口标记为 theme"""
+		self._installed = True
+		self._tag(self._bundle[theme.path][0])
+		self.restyles += 1
+		QApplication.instance().setStyleSheet(self._bundle_sheet())
+
+	def _bundle_sheet(self):
+		# 所有主题都限定在各自编号的窗口内，切换后旧主题的规则不会残留在窗口上
+		return "\n".join(self._scope(theme.sheet, f'[{self.THEME_PROPERTY}="{theme_id}"]')
+						 for theme_id, theme in self._bundle.values())
+
+	@staticmethod
+	def _scope(sheet, attr):
+		"""
+		把样式规则限定到带有属性 attr 的窗口内：
+		每个选择器 S 改写为 "*attr S"（窗口的后代）和在 S 的第一个简单选择器上加 attr（窗口本身）
+		"""
+		rules = []
+		for selectors, declarations in _THEME_RULE.findall(_THEME_COMMENT.sub("", sheet)):
+			scoped = []
+			for selector in selectors.split(","):
+				selector = selector.strip()
+				if not selector:
+					continue
+				first, separator, rest = selector.partition(" ")
+				pseudo = first.find(":")
+				if pseudo == -1:
+					pseudo = len(first)
+				scoped.append(f"*{attr} {selector}")
+				scoped.append(f"{first[:pseudo]}{attr}{first[pseudo:]}{separator}{rest}")
+			if scoped:
+				rules.append(f"{', '.join(scoped)} {{{declarations}}}")
+		return "\n".join(rules)
+
+	def tag_window(self, window):
+		"""
+		给应用主题之后新建的顶层窗口标记当前主题，须在窗口显示之前调用
+
+		:param window: 没有父窗口的顶层窗口
+		"""
+		if self.current is not None and self.current.path in self._bundle:
+			window.setProperty(self.THEME_PROPERTY, str(self._bundle[self.current.path][0]))
+
+	def _tag(self, theme_id):
+		"""在所有顶层窗口上标记主题编号"""
+		windows = QApplication.topLevelWidgets()
+		for window in windows:
+			window.setProperty(self.THEME_PROPERTY, str(theme_id))
+		return windows
+
+	def _switch(self, theme_id):
+		"""切换到已打包的主题：标记顶层窗口后按属性选择器重新polish所有控件"""
+		self.switches += 1
+		for window in self._tag(theme_id):
+			for widget in [window] + window.findChildren(QWidget):
+				# 样式表样式的polish会先丢弃该控件缓存的规则并重置调色板，无需再单独unpolish
+				widget.style().polish(widget)
+
+	def set_variables(self, **variables):
+		"""
+		修改当前主题的变量并重新应用
+
+		:return: 应用的 Theme 对象，没有当前主题时返回None
+		"""
+		if self.current is None:
+			return None
+		return self.apply(self.current.path, {**self._variables, **variables})
+
+	def watch(self, enabled=True):
+		"""开始或停止监视当前主题涉及的文件"""
+		if not enabled:
+			if self._watcher is not None:
+				self._watcher.fileChanged.disconnect(self._on_file_changed)
+				self._watcher.deleteLater()
+				self._watcher = None
+			self._reload_timer.stop()
+			return
+		if self._watcher is None:
+			self._watcher = QFileSystemWatcher(self)
+			self._watcher.fileChanged.connect(self._on_file_changed)
+		self._watch_files()
+
+	def _watch_files(self):
+		watched = set(self._watcher.files())
+		wanted = {file for file, _ in self.current.files} if self.current is not None else set()
+		if watched - wanted:
+			self._watcher.removePaths(list(watched - wanted))
+		if wanted - watched:
+			self._watcher.addPaths([file for file in wanted - watched if os.path.exists(file)])
+
+	def _on_file_changed(self, path):
+		# 编辑器保存时常先删除再重建文件，监视随之失效，这里重新加入
+		if path not in self._watcher.files() and os.path.exists(path):
+			self._watcher.addPath(path)
+		self._reload_timer.start()
+
+	def reload(self):
+		"""重新编译当前主题，样式表有变化时重新应用"""
+		if self.current is None:
+			return
+		try:
+			theme = self.compile(self.current.path, self._variables)
+		except (OSError, ValueError, UnicodeDecodeError) as e:
+			self.reload_failed.emit(f"重新加载主题 {self.current.name} 失败: {str(e)}")
+			return
+		if self._watcher is not None:
+			# 导入关系可能已变化
+			self.current = self.current._replace(files=theme.files)
+			self._watch_files()
+		if theme.sheet != self.current.sheet:
+			self.reloads += 1
+			self.apply(theme)
+
+	def export(self, path, theme=None):
+		"""
+		把编译好的主题写成单个QSS文件（已展开导入、替换变量），可直接用 apply() 加载
+
+		:param path: 输出路径
+		:param theme: Theme 对象，默认为当前主题
+		"""
+		theme = theme or self.current
+		if theme is None:
+			raise ValueError("没有可导出的主题")
+		atomic_write(path, f"/* 由主题 {os.path.basename(theme.path)} 编译生成，请勿直接修改 */\n{theme.sheet}")
+
+	def clear(self):
+		"""移除 QApplication 上的主题并停止监视"""
+		self.watch(False)
+		if self.current is not None:
+			QApplication.instance().setStyleSheet("")
+			self.current = None
+		self._bundle.clear()
+		self._installed = False
+
+	def stats(self):
+		"""
+		获取统计信息
+
+		:return: compiles（编译次数）、hits（编译缓存命中次数）、reloads（文件变化后重新应用的次数）、
+			restyles（替换应用级样式表的次数）、switches（只重新polish的切换次数）、
+			bundled（打包的主题数）、cached（缓存的主题数）、current（当前主题名）、watching（监视中的文件数）
+		"""
+		return {
+			"compiles": self.compiles,
+			"hits": self.hits,
+			"reloads": self.reloads,
+			"restyles": self.restyles,
+			"switches": self.switches,
+			"bundled": len(self._bundle),
+			"cached": len(self._compiled),
+			"current": self.current.name if self.current is not None else None,
+			"watching": len(self._watcher.files()) if self._watcher is not None else 0,
+		}
+
+
+class _RowSource:
+	"""
+	虚拟模型的数据源，按页读取行数据
+
+	序列（list、NumPy数组等支持len和下标的对象）直接按下标访问，不做拷贝；
+	生成器/迭代器只在滚动到末尾时才继续取下一页。
+	"""
+
+	def __init__(self, source, page_size=1000):
+		self.page_size = max(1, int(page_size))
+		self.loaded = 0
+		if hasattr(source, "__len__") and hasattr(source, "__getitem__"):
+			self.sequence = source
+			self.iterator = None
+			self._owned = False
+		else:
+			self.sequence = []
+			self.iterator = iter(source)
+			self._owned = True
+		self.fetch(self.page_size)
+
+	def append(self, item):
+		"""
+		在末尾追加一行，返回追加前是否已读完全部行
+
+		第一次追加时把数据源换成自己持有的列表：序列被复制，不修改调用方的对象；生成器被一次读完。
+		"""
+		if self.iterator is not None:
+			self.sequence.extend(self.iterator)
+			self.iterator = None
+		elif not self._owned:
+			self.sequence = list(self.sequence)
+			self._owned = True
+		complete = self.loaded == len(self.sequence)
+		self.sequence.append(item)
+		return complete
+
+	def can_fetch(self):
+		if self.loaded < len(self.sequence):
+			return True
+		return self.iterator is not None
+
+	def fetch(self, count=None):
+		"""再读取最多count行，返回新增的行数"""
+		count = count or self.page_size
+		if self.iterator is not None:
+			missing = self.loaded + count - len(self.sequence)
+			for _ in range(missing):
+				try:
+					self.sequence.append(next(self.iterator))
+				except StopIteration:
+					self.iterator = None
+					break
+		new_loaded = min(self.loaded + count, len(self.sequence))
+		added = new_loaded - self.loaded
+		self.loaded = new_loaded
+		return added
+
+	def row(self, index):
+		return self.sequence[index]
+
+
+class VirtualListModel(QAbstractListModel):
+	"""按需读取行数据的列表模型，配合 QListView 使用"""
+
+	def __init__(self, source=(), formatter=str, page_size=1000, row_height=None, parent=None):
+		super().__init__(parent)
+		self.formatter = formatter
+		self.row_height = row_height
+		self._source = _RowSource(source, page_size)
+
+	def set_source(self, source):
+		"""替换数据源"""
+		self.beginResetModel()
+		self._source = _RowSource(source, self._source.page_size)
+		self.endResetModel()
+
+	def refresh(self):
+		"""数据源（序列）变长后调用，通知视图有新行可读"""
+		if self.canFetchMore(QModelIndex()):
+			self.fetchMore(QModelIndex())
+
+	def append(self, item):
+		"""
+		在末尾追加一行
+
+		前面的行都已读取时立即显示，否则随滚动按页读到；数据源会先换成模型自己持有的列表。
+		"""
+		if self._source.append(item):
+			row = self._source.loaded
+			self.beginInsertRows(QModelIndex(), row, row)
+			self._source.loaded += 1
+			self.endInsertRows()
+
+	def rowCount(self, parent=QModelIndex()):
+		if parent.isValid():
+			return 0
+		return self._source.loaded
+
+	def data(self, index, role=Qt.DisplayRole):
+		if not index.isValid():
+			return None
+		if role == Qt.SizeHintRole and self.row_height:
+			return QSize(0, self.row_height)
+		# 可编辑的 QComboBox 用 EditRole 读取选项文本
+		if role not in (Qt.DisplayRole, Qt.EditRole):
+			return None
+		return self.formatter(self._source.row(index.row()))
+
+	def canFetchMore(self, parent):
+		if parent.isValid():
+			return False
+		return self._source.can_fetch()
+
+	def fetchMore(self, parent):
+		if parent.isValid():
+			return
+		first = self._source.loaded
+		added = self._source.fetch()
+		if added > 0:
+			self.beginInsertRows(QModelIndex(), first, first + added - 1)
+			self.endInsertRows()
+
+
+class VirtualTableModel(QAbstractTableModel):
+	"""按需读取行数据的表格模型，每行是一个序列（或二维NumPy数组的一行）"""
+
+	def __init__(self, source=(), headers=None, formatter=str, page_size=1000, parent=None):
+		super().__init__(parent)
+		self.headers = list(headers) if headers else None
+		self.formatter = formatter
+		self._source = _RowSource(source, page_size)
+		self._columns = self._detect_columns()
+
+	def _detect_columns(self):
+		if self.headers:
+			return len(self.headers)
+		if self._source.loaded:
+			return len(self._source.row(0))
+		return 0
+
+	def set_source(self, source):
+		"""替换数据源"""
+		self.beginResetModel()
+		self._source = _RowSource(source, self._source.page_size)
+		self._columns = self._detect_columns()
+		self.endResetModel()
+
+	def refresh(self):
+		"""数据源（序列）变长后调用，通知视图有新行可读"""
+		if self.canFetchMore(QModelIndex()):
+			self.fetchMore(QModelIndex())
+
+	def rowCount(self, parent=QModelIndex()):
+		if parent.isValid():
+			return 0
+		return self._source.loaded
+
+	def columnCount(self, parent=QModelIndex()):
+		if parent.isValid():
+			return 0
+		return self._columns
+
+	def data(self, index, role=Qt.DisplayRole):
+		if not index.isValid() or role != Qt.DisplayRole:
+			return None
+		row = self._source.row(index.row())
+		column = index.column()
+		if column >= len(row):
+			return None
+		return self.formatter(row[column])
+
+	def headerData(self, section, orientation, role=Qt.DisplayRole):
+		if role != Qt.DisplayRole:
+			return None
+		if orientation == Qt.Horizontal and self.headers and section < len(self.headers):
+			return self.headers[section]
+		return super().headerData(section, orientation, role)
+
+	def canFetchMore(self, parent):
+		if parent.isValid():
+			return False
+		return self._source.can_fetch()
+
+	def fetchMore(self, parent):
+		if parent.isValid():
+			return
+		first = self._source.loaded
+		added = self._source.fetch()
+		if added > 0:
+			self.beginInsertRows(QModelIndex(), first, first + added - 1)
+			self.endInsertRows()
+			if not self._columns:
+				self.beginResetModel()
+				self._columns = self._detect_columns()
+				self.endResetModel()
+
+
+class PrefixIndex:
+	"""
+	按前缀查找的有序索引
+
+	建立时对全部文本排序一次，之后每次查找只需二分定位，与条目总数基本无关。
+	"""
+
+	def __init__(self, texts, case_sensitive=False):
+		self.case_sensitive = case_sensitive
+		folded = texts if case_sensitive else [text.casefold() for text in texts]
+		self._rows = sorted(range(len(folded)), key=folded.__getitem__)
+		self._keys = [folded[row] for row in self._rows]
+
+	def __len__(self):
+		return len(self._keys)
+
+	def add(self, text, row):
+		"""
+		加入一个条目
+
+		:param text: 条目文本
+		:param row: 条目的原始下标
+		"""
+		key = text if self.case_sensitive else text.casefold()
+		position = bisect.bisect_right(self._keys, key)
+		self._keys.insert(position, key)
+		self._rows.insert(position, row)
+
+	def search(self, prefix, limit=50):
+		"""
+		查找以prefix开头的条目
+
+		:param prefix: 前缀
+		:param limit: 最多返回的条数
+		:return: 原始下标列表，按文本排序
+		"""
+		key = prefix if self.case_sensitive else prefix.casefold()
+		start = bisect.bisect_left(self._keys, key)
+		rows = []
+		for position in range(start, min(start + limit, len(self._keys))):
+			if not self._keys[position].startswith(key):
+				break
+			rows.append(self._rows[position])
+		return rows
+
+
+class PrefixCompleter(QCompleter):
+	"""
+	基于 PrefixIndex 的输入补全，用于条目很多的可编辑下拉框
+
+	QComboBox 自带的补全器每次输入都遍历整个模型；这里每次输入只取出前 max_results 个匹配项，
+	选中补全项时同步设置下拉框的当前项。
+	"""
+
+	def __init__(self, texts, combo, max_results=50, case_sensitive=False):
+		super().__init__(combo)
+		self.combo = combo
+		self.texts = texts
+		self.max_results = max_results
+		self.index = PrefixIndex(texts, case_sensitive)
+		self._rows = []
+		self._model = QStringListModel(self)
+		self.setModel(self._model)
+		self.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+		self.setCaseSensitivity(Qt.CaseSensitive if case_sensitive else Qt.CaseInsensitive)
+		self.activated[QModelIndex].connect(self._select)
+
+	def add_text(self, text):
+		"""下拉框末尾追加选项后调用，把它加入补全"""
+		self.index.add(text, len(self.texts))
+		self.texts.append(text)
+
+	def update_prefix(self, prefix):
+		"""按输入的前缀刷新候选项"""
+		self._rows = self.index.search(prefix, self.max_results) if prefix else []
+		self._model.setStringList([self.texts[row] for row in self._rows])
+		if self._rows:
+			self.complete()
+		else:
+			self.popup().hide()
+
+	def _select(self, index):
+		if not 0 <= index.row() < len(self._rows):
+			return
+		row = self._rows[index.row()]
+		# 延迟加载的模型可能还没读到这一行
+		model = self.combo.model()
+		while row >= model.rowCount() and model.canFetchMore(QModelIndex()):
+			model.fetchMore(QModelIndex())
+		self.combo.setCurrentIndex(row)
+
+
+class _GridBox:
+	"""
+	扁平化区域中的一行或一列
+
+	row(flatten=True)/column(flatten=True) 开始的区域内，行/列只记录子项，不创建Qt布局；
+	区域结束时由 _compile_grid 把整棵树编译成一个 QGridLayout。
+	"""
+
+	def __init__(self, horizontal, grid=None):
+		self.horizontal = horizontal
+		# 只有区域的根节点持有网格
+		self.grid = grid
+		self.children = []
+		# _grid_size 的结果，区域结束后子项不再变化
+		self.size = None
+
+	def addWidget(self, widget, stretch=0, alignment=None):
+		self.children.append((widget, stretch, alignment))
+
+	def addLayout(self, layout, stretch=0):
+		self.children.append((layout, stretch, None))
+
+
+def _grid_size(node):
+	"""
+	子树在网格中占用的 (行数, 列数)
+
+	行沿水平方向排开子项、行数取子项行数的最小公倍数，列反之；
+	这样每个子项分到的行/列数都是自身所需的整数倍，跨行/列后与嵌套布局的切分一致。
+	"""
+	if not isinstance(node, _GridBox):
+		return 1, 1
+	if node.size is not None:
+		return node.size
+	sizes = [size for size in (_grid_size(child) for child, _, _ in node.children) if size[0]]
+	if not sizes:
+		node.size = (0, 0)
+		return node.size
+	along = sum(size[1] if node.horizontal else size[0] for size in sizes)
+	across = 1
+	for size in sizes:
+		count = size[0] if node.horizontal else size[1]
+		across = across * count // math.gcd(across, count)
+	node.size = (across, along) if node.horizontal else (along, across)
+	return node.size
+
+
+def _compile_grid(node, grid, row, column, rows, columns):
+	"""把子树放进网格中 (row, column) 起、rows×columns 大小的区域"""
+	natural_rows, natural_columns = _grid_size(node)
+	scale = columns // natural_columns if node.horizontal else rows // natural_rows
+	offset = column if node.horizontal else row
+	for child, stretch, alignment in node.children:
+		child_rows, child_columns = _grid_size(child)
+		if not child_rows:
+			continue
+		if node.horizontal:
+			span = child_columns * scale
+			cell = (row, offset, rows, span)
+		else:
+			span = child_rows * scale
+			cell = (offset, column, span, columns)
+		if isinstance(child, _GridBox):
+			_compile_grid(child, grid, *cell)
+		elif isinstance(child, QLayout):
+			grid.addLayout(child, *cell)
+		elif alignment is not None:
+			grid.addWidget(child, *cell, alignment)
+		else:
+			grid.addWidget(child, *cell)
+		if stretch:
+			# 网格的拉伸系数作用于整行/整列，这里只能近似嵌套布局中子项的拉伸
+			for index in range(offset, offset + span):
+				if node.horizontal:
+					grid.setColumnStretch(index, max(grid.columnStretch(index), stretch))
+				else:
+					grid.setRowStretch(index, max(grid.rowStretch(index), stretch))
+		offset += span
+
+
+def _clear_layout(layout):
+	"""移除并销毁布局中的所有控件和子布局"""
+	while layout.count():
+		item = layout.takeAt(0)
+		widget = item.widget()
+		if widget is not None:
+			widget.deleteLater()
+		elif item.layout() is not None:
+			_clear_layout(item.layout())
+			item.layout().deleteLater()
+
+
+class _LazyContent:
+	"""
+	折叠容器的延迟内容
+
+	第一次展开时才调用工厂函数构建内容；设置了unload_after时，
+	折叠超过unload_after秒后销毁内容，下次展开再重新构建。
+	工厂函数出错时交给on_error，内容保持未构建，下次展开重试。
+	"""
+
+	def __init__(self, owner, layout, factory=None, unload_after=None, on_error=None):
+		self.layout = layout
+		self.factory = factory
+		self.on_error = on_error
+		self.materialized = factory is None
+		self._unload_timer = None
+		if factory is not None and unload_after:
+			self._unload_timer = QTimer(owner)
+			self._unload_timer.setSingleShot(True)
+			self._unload_timer.setInterval(int(unload_after * 1000))
+			self._unload_timer.timeout.connect(self.unload)
+
+	def on_expand(self):
+		if self._unload_timer is not None:
+			self._unload_timer.stop()
+		if not self.materialized:
+			self.materialize()
+
+	def on_collapse(self):
+		if self._unload_timer is not None:
+			self._unload_timer.start()
+
+	def materialize(self):
+		"""
+		调用工厂函数构建内容
+
+		工厂函数以内容布局为参数，可以直接往布局里添加控件，
+		也可以返回一个控件或控件列表，由这里添加到布局中。
+		"""
+		try:
+			result = self.factory(self.layout)
+			if isinstance(result, QWidget):
+				self.layout.addWidget(result)
+			elif isinstance(result, (list, tuple)):
+				for widget in result:
+					self.layout.addWidget(widget)
+			self.materialized = True
+		except Exception as e:
+			# 去掉构建了一半的内容，下次展开重新构建
+			_clear_layout(self.layout)
+			if self.on_error is not None:
+				self.on_error(f"构建折叠容器内容时出错: {str(e)}")
+			else:
+				raise
+
+	def unload(self):
+		"""销毁已构建的内容，只对有工厂函数的容器生效"""
+		if self.factory is None or not self.materialized:
+			return
+		_clear_layout(self.layout)
+		self.materialized = False
+
+
+class _CollapseAnimator:
+	"""
+	折叠容器的展开/折叠动画
+
+	动画过程中隐藏真实内容，用一个显示内容截图的占位标签代替，逐帧只改变占位标签的高度；
+	最后一帧结束后才显示真实内容，子控件只做一次布局。
+	duration为0时直接切换可见性。
+	"""
+
+	# 全局帧回调 fn(owner, frame_ms)，用于检测动画是否能维持60fps
+	frame_hook = None
+	FRAME_BUDGET_MS = 1000 / 60
+
+	def __init__(self, owner, main_layout, content_area, duration=0, on_frame=None):
+		self.owner = owner
+		self.main_layout = main_layout
+		self.content_area = content_area
+		self.duration = duration
+		self.on_frame = on_frame
+		self.expanding = False
+		self.frame_times = []
+		self._last_frame = None
+		self._target_height = 0
+		self._placeholder = None
+		self._animation = None
+
+	def is_expanded(self):
+		"""逻辑上的展开状态，动画过程中返回动画的目标状态"""
+		if self.is_running():
+			return self.expanding
+		return not self.content_area.isHidden()
+
+	def is_running(self):
+		return self._animation is not None and self._animation.state() == QVariantAnimation.Running
+
+	def set_expanded(self, expand):
+		if self.duration <= 0:
+			self.content_area.setVisible(expand)
+			return
+		if self.is_running():
+			# 动画中途反向：沿用已有截图，从当前高度开始
+			start = self._placeholder.height()
+			self._animation.stop()
+		else:
+			if expand:
+				height = self._measure()
+				# 展开后超出窗口高度的部分在动画中看不到，不需要截
+				self._ensure_placeholder().setPixmap(self._snapshot(self.owner.window().height()))
+				start = 0
+			else:
+				height = self.content_area.height()
+				visible = self.content_area.visibleRegion().boundingRect()
+				self._ensure_placeholder().setPixmap(self._snapshot(visible.bottom() + 1))
+				start = height
+			self._target_height = height
+			self.content_area.hide()
+			self._placeholder.setFixedHeight(start)
+			self._placeholder.show()
+
+		self.expanding = expand
+		self.frame_times = []
+		self._last_frame = time.perf_counter()
+		end = self._target_height if expand else 0
+		self._animation.setStartValue(start)
+		self._animation.setEndValue(end)
+		# 中途反向时按剩余距离缩短时长，保持速度一致
+		self._animation.setDuration(max(1, int(self.duration * abs(end - start)
+											   / max(self._target_height, 1))))
+		self._animation.start()
+
+	def finish(self):
+		"""立即结束正在进行的动画"""
+		if self.is_running():
+			self._animation.stop()
+			self._on_finished()
+
+	def frame_stats(self):
+		"""
+		获取最近一次动画的帧时间统计
+
+		:return: frames（帧数）、mean_ms、max_ms、dropped（超过1.5倍帧预算的帧数）
+		"""
+		times = self.frame_times
+		return {
+			"frames": len(times),
+			"mean_ms": sum(times) / len(times) if times else 0.0,
+			"max_ms": max(times) if times else 0.0,
+			"dropped": sum(1 for t in times if t > self.FRAME_BUDGET_MS * 1.5),
+		}
+
+	def _ensure_placeholder(self):
+		if self._placeholder is None:
+			self._placeholder = QLabel(self.owner)
+			self._placeholder.setStyleSheet("padding: 0; margin: 0; border: none; background: transparent;")
+			self._placeholder.setAlignment(Qt.AlignLeft | Qt.AlignTop)
+			self._placeholder.setSizePolicy(QSizePolicy.Ignored, QSizePolicy.Fixed)
+			self._placeholder.hide()
+			index = self.main_layout.indexOf(self.content_area)
+			self.main_layout.insertWidget(index + 1, self._placeholder)
+
+			self._animation = QVariantAnimation(self.owner)
+			self._animation.setEasingCurve(QEasingCurve.OutCubic)
+			self._animation.valueChanged.connect(self._on_frame)
+			self._animation.finished.connect(self._on_finished)
+		return self._placeholder
+
+	def _measure(self):
+		"""计算隐藏内容展开后的尺寸，并把内容调整到该尺寸"""
+		margins = self.main_layout.contentsMargins()
+		width = max(1, self.owner.width() - margins.left() - margins.right())
+		layout = self.content_area.layout()
+		if layout is not None:
+			layout.activate()
+		if self.content_area.hasHeightForWidth():
+			height = self.content_area.heightForWidth(width)
+		else:
+			height = self.content_area.sizeHint().height()
+		self.content_area.resize(width, height)
+		if layout is not None:
+			layout.activate()
+		return height
+
+	def _snapshot(self, limit):
+		"""截取内容顶部limit像素高的区域，截图耗时和截取的面积成正比"""
+		# grab() 对隐藏控件会按屏幕裁剪高度，这里直接render到图片上
+		ratio = self.owner.devicePixelRatioF()
+		width = self.content_area.width()
+		height = max(1, min(limit, self.content_area.height()))
+		pixmap = QPixmap(int(width * ratio), int(height * ratio))
+		pixmap.setDevicePixelRatio(ratio)
+		pixmap.fill(Qt.transparent)
+		self.content_area.render(pixmap, QPoint(), QRegion(0, 0, width, height))
+		return pixmap
+
+	def _on_frame(self, value):
+		now = time.perf_counter()
+		frame_ms = (now - self._last_frame) * 1000
+		self._last_frame = now
+		self.frame_times.append(frame_ms)
+		self._placeholder.setFixedHeight(int(value))
+		if self.on_frame is not None:
+			self.on_frame(frame_ms)
+		if _CollapseAnimator.frame_hook is not None:
+			_CollapseAnimator.frame_hook(self.owner, frame_ms)
+
+	def _on_finished(self):
+		self._placeholder.hide()
+		self._placeholder.setPixmap(QPixmap())
+		if self.expanding:
+			self.content_area.show()
 
 
 class CollapsibleVBox(QWidget):
-	def __init__(self, title="", css=None, parent=None):
+	def __init__(self, title="", css=None, parent=None, factory=None, unload_after=None,
+				 animation_duration=0, on_frame=None, on_error=None):
+		"""
+		:param factory: 内容工厂函数，传入时内容在第一次展开时才构建
+		:param unload_after: 折叠多少秒后卸载内容（需要factory）
+		:param animation_duration: 展开/折叠动画时长（毫秒），0表示不使用动画
+		:param on_frame: 动画每帧的回调，参数为距上一帧的毫秒数
+		:param on_error: 内容工厂函数出错时调用的函数，参数为错误信息；为None时抛出异常
+		"""
 		super().__init__(parent)
 		self.title = title
 		self.css = css or {}
 		self.initUI()
+		self.lazy_content = _LazyContent(self, self.content_layout, factory, unload_after, on_error)
+		self.animator = _CollapseAnimator(self, self.main_layout, self.content_area,
+										  animation_duration, on_frame)
 	
 	def initUI(self):
 		# 主布局
@@ -62,7 +1168,12 @@ class CollapsibleVBox(QWidget):
 		self.setStyleSheet(self._generate_css())
 	
 	def toggle(self):
-		self.content_area.setVisible(not self.content_area.isVisible())
+		expand = not self.animator.is_expanded()
+		if expand:
+			self.lazy_content.on_expand()
+		else:
+			self.lazy_content.on_collapse()
+		self.animator.set_expanded(expand)
 	
 	def _generate_css(self):
 		# 确保self.css是字典
@@ -80,80 +1191,2516 @@ class CollapsibleVBox(QWidget):
 	def get_content_layout(self):
 		return self.content_layout
 
-class AutoScaledLabel(QLabel):
-	def __init__(self, parent=None):
-		super().__init__(parent)
-		self.original_pixmap = None
-		self.setAlignment(Qt.AlignCenter)
-		# 关键修复：设置尺寸策略为可忽略
-		self.setSizePolicy(QSizePolicy.Ignored, QSizePolicy.Ignored)
+class ScaledPixmapCache:
+	"""
+	缩放后图片的LRU缓存，按占用字节数淘汰
+
+	键通常为 (原图cacheKey, 宽, 高)，同一张图缩放到同一尺寸只做一次平滑缩放。
+	"""
+
+	def __init__(self, max_bytes=64 * 1024 * 1024):
+		self.max_bytes = max_bytes
+		self.bytes = 0
+		self.hits = 0
+		self.misses = 0
+		self._cache = OrderedDict()
+
+	@staticmethod
+	def _pixmap_bytes(pixmap):
+		return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+	def get(self, key):
+		pixmap = self._cache.get(key)
+		if pixmap is None:
+			self.misses += 1
+			return None
+		self._cache.move_to_end(key)
+		self.hits += 1
+		return pixmap
+
+	def put(self, key, pixmap):
+		size = self._pixmap_bytes(pixmap)
+		if size > self.max_bytes:
+			return
+		old = self._cache.pop(key, None)
+		if old is not None:
+			self.bytes -= self._pixmap_bytes(old)
+		self._cache[key] = pixmap
+		self.bytes += size
+		while self.bytes > self.max_bytes:
+			_, evicted = self._cache.popitem(last=False)
+			self.bytes -= self._pixmap_bytes(evicted)
+
+	def stats(self):
+		"""
+		获取缓存统计
+
+		:return: 包含 hits/misses/size/bytes/max_bytes 的字典
+		"""
+		return {
+			"hits": self.hits,
+			"misses": self.misses,
+			"size": len(self._cache),
+			"bytes": self.bytes,
+			"max_bytes": self.max_bytes,
+		}
+
+	def clear(self):
+		"""清空缓存"""
+		self._cache.clear()
+		self.bytes = 0
+
+
+class _ImageDecodeSignals(QObject):
+	finished = pyqtSignal(QImage)
+
+
+class _ImageDecodeTask(QRunnable):
+	"""在线程池中解码图片，解码时直接缩小到不超过max_size"""
+
+	def __init__(self, path, max_size=None):
+		super().__init__()
+		self.path = path
+		self.max_size = max_size
+		self.signals = _ImageDecodeSignals()
+
+	def run(self):
+		reader = QImageReader(self.path)
+		reader.setAutoTransform(True)
+		if self.max_size is not None:
+			original_size = reader.size()
+			if original_size.isValid() and (original_size.width() > self.max_size.width()
+											or original_size.height() > self.max_size.height()):
+				reader.setScaledSize(original_size.scaled(self.max_size, Qt.KeepAspectRatio))
+		# QImage可以跨线程传递，QPixmap只能在GUI线程创建
+		self.signals.finished.emit(reader.read())
+
+
+_image_decode_pool = None
+
+
+def _get_image_decode_pool():
+	"""
+	图片解码专用线程池
+
+	不能使用全局线程池：Qt的平滑缩放会把分块任务提交到全局线程池并在GUI线程等待，
+	若解码任务占满全局线程池并等待GIL，就会与GUI线程互相等待。
+	"""
+	global _image_decode_pool
+	if _image_decode_pool is None:
+		_image_decode_pool = QThreadPool()
+		_image_decode_pool.setMaxThreadCount(max(1, min(4, QThread.idealThreadCount())))
+	return _image_decode_pool
+
+
+class AutoScaledLabel(QLabel):
+	# 所有实例共享的平滑缩放结果缓存
+	pixmap_cache = ScaledPixmapCache()
+
+	# 连续缩放停止多少毫秒后做一次平滑缩放
+	SMOOTH_DELAY = 150
+
+	def __init__(self, parent=None):
+		super().__init__(parent)
+		self.original_pixmap = None
+		self.setAlignment(Qt.AlignCenter)
+		# 关键修复：设置尺寸策略为可忽略
+		self.setSizePolicy(QSizePolicy.Ignored, QSizePolicy.Ignored)
+
+		self._smooth_timer = QTimer(self)
+		self._smooth_timer.setSingleShot(True)
+		self._smooth_timer.setInterval(self.SMOOTH_DELAY)
+		self._smooth_timer.timeout.connect(self.rescale_pixmap)
+
+	def setPixmap(self, pixmap):
+		self.original_pixmap = pixmap
+		# 初始时不设置图片，等待首次resizeEvent
+		self.rescale_pixmap()
+
+	def rescale_pixmap(self, smooth=True):
+		"""
+		独立出来的缩放方法
+
+		:param smooth: True时使用平滑缩放并写入缓存，False时使用快速缩放（用于拖动过程中）
+		"""
+		if self.original_pixmap and not self.original_pixmap.isNull():
+			# 获取当前可用空间（排除边框和内边距）
+			available_size = self.size()
+			key = (self.original_pixmap.cacheKey(), available_size.width(), available_size.height())
+
+			scaled = self.pixmap_cache.get(key)
+			if scaled is None:
+				# 计算保持宽高比的缩放
+				scaled = self.original_pixmap.scaled(
+					available_size,
+					Qt.KeepAspectRatio,
+					Qt.SmoothTransformation if smooth else Qt.FastTransformation
+				)
+				if smooth:
+					self.pixmap_cache.put(key, scaled)
+			super().setPixmap(scaled)
+
+	def resizeEvent(self, event):
+		# 只在有原始图片时才缩放
+		if self.original_pixmap:
+			# 拖动过程中先快速缩放，停止后再平滑缩放一次
+			self.rescale_pixmap(smooth=False)
+			self._smooth_timer.start()
+			self.setMinimumSize(1, 1)  # 最小尺寸为1px
+			self.setMaximumSize(16777215, 16777215)  # 恢复最大尺寸限制
+
+		super().resizeEvent(event)
+
+class CollapsibleWidget(QWidget):
+	def __init__(self, title, parent=None, factory=None, unload_after=None,
+				 animation_duration=0, on_frame=None, on_error=None):
+		"""
+		:param factory: 内容工厂函数，传入时内容在第一次展开时才构建
+		:param unload_after: 折叠多少秒后卸载内容（需要factory）
+		:param animation_duration: 展开/折叠动画时长（毫秒），0表示不使用动画
+		:param on_frame: 动画每帧的回调，参数为距上一帧的毫秒数
+		:param on_error: 内容工厂函数出错时调用的函数，参数为错误信息；为None时抛出异常
+		"""
+		super().__init__(parent)
+		self.initUI(title)
+		self.lazy_content = _LazyContent(self, self.content_layout, factory, unload_after, on_error)
+		self.animator = _CollapseAnimator(self, self.layout, self.content_area,
+										  animation_duration, on_frame)
+
+	def initUI(self, title):
+		# 创建布局
+		self.layout = QVBoxLayout()
+		self.layout.setContentsMargins(0, 0, 0, 0)
+		self.setLayout(self.layout)
+
+		# 创建折叠按钮
+		self.toggle_button = QPushButton(title)
+		self.toggle_button.setStyleSheet("text-align: left;")
+		self.toggle_button.clicked.connect(self.toggle_collapse)
+		self.layout.addWidget(self.toggle_button)
+
+		# 创建容器
+		self.content_area = QFrame()
+		self.content_area.setFrameShape(QFrame.NoFrame)
+		self.content_area.setContentsMargins(0, 0, 0, 0)
+		self.content_layout = QVBoxLayout(self.content_area)
+		self.content_layout.setContentsMargins(10, 0, 0, 0)
+		self.content_area.setVisible(False)
+		self.layout.addWidget(self.content_area)
+
+	def add_widget(self, widget):
+		# 向容器中添加子控件
+		self.content_layout.addWidget(widget)
+
+	def toggle_collapse(self):
+		# 切换折叠状态
+		if self.animator.is_expanded():
+			self.lazy_content.on_collapse()
+			self.animator.set_expanded(False)
+		else:
+			self.lazy_content.on_expand()
+			self.animator.set_expanded(True)
+	def get_content_layout(self):
+		return self.content_layout
+class BackgroundTask(QObject):
+	"""
+	run_in_background 返回的任务句柄
+
+	任务函数在工作线程中执行，结果、错误和进度通过信号排队回到GUI线程。
+	取消是协作式的：任务函数应定期检查 task.cancelled 并自行返回。
+	"""
+
+	finished = pyqtSignal(object)
+	failed = pyqtSignal(str)
+	progress = pyqtSignal(int)
+	# 无论成功、失败还是取消都会发出，用于回收任务
+	completed = pyqtSignal()
+
+	def __init__(self, fn, args=(), kwargs=None, pass_task=False):
+		super().__init__()
+		self.fn = fn
+		self.args = args
+		self.kwargs = kwargs or {}
+		self.pass_task = pass_task
+		self.done = False
+		self._cancel_event = threading.Event()
+		self._future = None
+		# 线程池任务由工作线程开始执行或被撤销，两者只能发生一次
+		self._claim_lock = threading.Lock()
+		self._claimed = False
+
+	@property
+	def cancelled(self):
+		"""是否已请求取消"""
+		return self._cancel_event.is_set()
+
+	def cancel(self):
+		"""请求取消任务；尚未开始的进程任务会直接被撤销"""
+		self._cancel_event.set()
+		if self._future is not None:
+			self._future.cancel()
+
+	def report_progress(self, value):
+		"""在任务函数中报告进度（0-100），可在任意线程调用"""
+		if not self.cancelled:
+			self.progress.emit(int(value))
+
+	def _claim(self):
+		"""标记任务已开始或已撤销，返回是否由本次调用标记"""
+		with self._claim_lock:
+			if self._claimed:
+				return False
+			self._claimed = True
+			return True
+
+	def _drop(self):
+		"""撤销还在线程池队列中的任务：清空队列后它不会再执行，在这里结束它"""
+		if self._claim():
+			self.done = True
+			self.completed.emit()
+
+	def _execute(self):
+		"""在工作线程中执行任务函数"""
+		if not self._claim():
+			return
+		try:
+			if self.cancelled:
+				return
+			args = (self,) + tuple(self.args) if self.pass_task else self.args
+			try:
+				result = self.fn(*args, **self.kwargs)
+			except Exception:
+				self.failed.emit(traceback.format_exc())
+				return
+			if not self.cancelled:
+				self.finished.emit(result)
+		finally:
+			self.done = True
+			self.completed.emit()
+
+	def _on_future_done(self, future):
+		"""进程池任务结束时的回调（在执行器的线程中调用）"""
+		try:
+			if future.cancelled() or self.cancelled:
+				return
+			error = future.exception()
+			if error is not None:
+				self.failed.emit("".join(traceback.format_exception(type(error), error, error.__traceback__)))
+			else:
+				self.finished.emit(future.result())
+		finally:
+			self.done = True
+			self.completed.emit()
+
+
+class _TaskRunnable(QRunnable):
+	def __init__(self, task):
+		super().__init__()
+		self.task = task
+
+	def run(self):
+		self.task._execute()
+
+
+class UpdateCoalescer(QObject):
+	"""
+	合并高频界面更新的通道
+
+	任意线程都可以调用 post() 写入；同一控件的同一属性只保留最新值，
+	由GUI线程的定时器每帧最多刷新一次。
+	"""
+
+	_wake = pyqtSignal()
+
+	def __init__(self, interval=16, parent=None):
+		super().__init__(parent)
+		self._lock = threading.Lock()
+		self._pending = {}
+		self.posted = 0
+		self.merged = 0
+		self.dropped = 0
+		self.applied = 0
+		self.flushes = 0
+
+		self._timer = QTimer(self)
+		self._timer.setSingleShot(True)
+		self._timer.setInterval(interval)
+		self._timer.timeout.connect(self.flush)
+		# 其他线程不能直接启动定时器，通过信号排队到GUI线程
+		self._wake.connect(self._timer.start)
+
+	def set_interval(self, interval):
+		"""设置两次刷新之间的最短间隔（毫秒）"""
+		self._timer.setInterval(interval)
+
+	def post(self, widget, prop, value):
+		"""
+		提交一次更新，可在任意线程调用
+
+		:param widget: 目标控件
+		:param prop: 属性名，如 "text"、"value"；也可以是方法名，如 "showMessage"
+		:param value: 新值
+		"""
+		with self._lock:
+			key = (id(widget), prop)
+			was_empty = not self._pending
+			if key in self._pending:
+				self.merged += 1
+			self._pending[key] = (widget, prop, value)
+			self.posted += 1
+		if was_empty:
+			self._wake.emit()
+
+	def flush(self):
+		"""立即把所有待刷新的值写到控件上（只能在GUI线程调用）"""
+		with self._lock:
+			pending, self._pending = self._pending, {}
+		if not pending:
+			return
+		self.flushes += 1
+		for widget, prop, value in pending.values():
+			if sip.isdeleted(widget):
+				self.dropped += 1
+				continue
+			self._apply(widget, prop, value)
+			self.applied += 1
+
+	@staticmethod
+	def _apply(widget, prop, value):
+		setter = getattr(widget, "set" + prop[:1].upper() + prop[1:], None)
+		if setter is None:
+			setter = getattr(widget, prop, None)
+		if callable(setter):
+			setter(value)
+		else:
+			widget.setProperty(prop, value)
+
+	def stats(self):
+		"""
+		获取统计信息
+
+		:return: posted（提交数）、merged（被后来的值覆盖的数）、dropped（控件已销毁而丢弃的数）、
+			applied（实际写入数）、flushes（刷新次数）、pending（待刷新数）
+		"""
+		with self._lock:
+			pending = len(self._pending)
+		return {
+			"posted": self.posted,
+			"merged": self.merged,
+			"dropped": self.dropped,
+			"applied": self.applied,
+			"flushes": self.flushes,
+			"pending": pending,
+		}
+
+
+class StreamingTextAppender(QObject):
+	"""
+	文本框的流式追加器
+
+	任意线程都可以调用 append()/extend()；行先进入缓冲区，
+	再由GUI线程的定时器成批插入文档，文档最多保留max_blocks行（环形缓冲）。
+	"""
+
+	_wake = pyqtSignal()
+
+	def __init__(self, edit, max_blocks=None, interval=50, plain_text=True):
+		super().__init__(edit)
+		self.edit = edit
+		self.max_blocks = max_blocks
+		self.plain_text = plain_text
+		self._lock = threading.Lock()
+		self._lines = []
+
+		document = edit.document()
+		# 日志不需要撤销，撤销栈会让内存随行数无限增长
+		document.setUndoRedoEnabled(False)
+		if max_blocks:
+			document.setMaximumBlockCount(max_blocks)
+
+		self._timer = QTimer(self)
+		self._timer.setSingleShot(True)
+		self._timer.setInterval(interval)
+		self._timer.timeout.connect(self.flush)
+		self._wake.connect(self._timer.start)
+
+	def append(self, line):
+		"""追加一行，可在任意线程调用"""
+		self.extend((line,))
+
+	def extend(self, lines):
+		"""追加多行，可在任意线程调用"""
+		lines = [str(line).rstrip("\r\n") for line in lines]
+		if not lines:
+			return
+		with self._lock:
+			was_empty = not self._lines
+			self._lines.extend(lines)
+		if was_empty:
+			self._wake.emit()
+
+	def flush(self):
+		"""把缓冲区中的行一次性插入文档（只能在GUI线程调用）"""
+		with self._lock:
+			lines, self._lines = self._lines, []
+		if not lines:
+			return
+		if self.max_blocks and len(lines) > self.max_blocks:
+			# 超出上限的部分插入后也会被立刻删掉，直接丢弃
+			lines = lines[-self.max_blocks:]
+
+		scroll_bar = self.edit.verticalScrollBar()
+		at_bottom = scroll_bar.value() >= scroll_bar.maximum() - 4
+
+		document = self.edit.document()
+		cursor = QTextCursor(document)
+		cursor.movePosition(QTextCursor.End)
+		cursor.beginEditBlock()
+		if not document.isEmpty():
+			cursor.insertBlock()
+		if self.plain_text:
+			# 换行符会被转换为段落分隔，一次调用插入所有行
+			cursor.insertText("\n".join(lines))
+		else:
+			for index, line in enumerate(lines):
+				if index:
+					cursor.insertBlock()
+				cursor.insertHtml(line)
+		cursor.endEditBlock()
+
+		if at_bottom:
+			scroll_bar.setValue(scroll_bar.maximum())
+
+
+def tail_file(path, poll_interval=0.2, from_start=False, stop_event=None, encoding="utf-8"):
+	"""
+	持续读取文件新增的行（类似 tail -f）
+
+	:param path: 文件路径
+	:param poll_interval: 没有新内容时的等待间隔（秒）
+	:param from_start: 是否从文件开头读起，默认只读新增内容
+	:param stop_event: threading.Event，置位后结束
+	:return: 逐行产生文本的生成器
+	"""
+	with open(path, "r", encoding=encoding, errors="replace") as file:
+		if not from_start:
+			file.seek(0, os.SEEK_END)
+		pending = ""
+		while stop_event is None or not stop_event.is_set():
+			chunk = file.readline()
+			if not chunk:
+				time.sleep(poll_interval)
+				continue
+			pending += chunk
+			if pending.endswith("\n"):
+				yield pending
+				pending = ""
+
+
+def iter_line_chunks(path, chunk_size=1 << 20, encoding="utf-8", stop_event=None):
+	"""
+	按块读取文本文件，每次产生一批行
+
+	整块读取、整块解码后再切分，比逐行迭代文件对象快得多，适合把大文件送入控件。
+
+	:param path: 文件路径
+	:param chunk_size: 每次读取的字节数
+	:param stop_event: threading.Event，置位后结束
+	:return: 生成器，每次产生一个行列表（不含换行符）
+	"""
+	with open(path, "rb") as file:
+		pending = b""
+		while stop_event is None or not stop_event.is_set():
+			chunk = file.read(chunk_size)
+			if not chunk:
+				break
+			data = pending + chunk
+			cut = data.rfind(b"\n")
+			if cut == -1:
+				pending = data
+				continue
+			pending = data[cut + 1:]
+			yield data[:cut].decode(encoding, errors="replace").split("\n")
+		if pending and (stop_event is None or not stop_event.is_set()):
+			yield [pending.decode(encoding, errors="replace")]
+
+
+def atomic_write(path, data, encoding="utf-8"):
+	"""
+	原子写入文件：先写同目录下的临时文件并刷到磁盘，再替换目标文件
+
+	写入中途出错或进程退出时，目标文件保持原样，不会出现写了一半的内容。
+
+	:param path: 目标文件路径
+	:param data: str 或 bytes
+	:return: 写入的字节数
+	"""
+	if isinstance(data, str):
+		data = data.encode(encoding)
+	directory = os.path.dirname(os.path.abspath(path))
+	os.makedirs(directory, exist_ok=True)
+	temp_path = os.path.join(directory, f".{os.path.basename(path)}.{os.getpid()}.{threading.get_ident()}.tmp")
+	# 新文件的权限按umask决定；覆盖已有文件时保留原来的权限
+	fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o666)
+	try:
+		with contextlib.suppress(FileNotFoundError):
+			os.chmod(temp_path, os.stat(path).st_mode & 0o7777)
+		with os.fdopen(fd, "wb") as file:
+			file.write(data)
+			file.flush()
+			os.fsync(file.fileno())
+		os.replace(temp_path, path)
+	except BaseException:
+		with contextlib.suppress(OSError):
+			os.remove(temp_path)
+		raise
+	return len(data)
+
+
+class MappedLineFile:
+	"""
+	内存映射的只读文本文件，可按行号随机读取
+
+	文件内容不读入内存，由操作系统按需换页。行号通过稀疏索引定位：每隔约 chunk_size
+	字节记录一个检查点（行首偏移, 行号），读取某一行时从最近的检查点向后查找换行符；
+	顺序读取时从上一次读到的位置继续，不必回到检查点。
+
+	构造时只索引第一块，第一屏可以立即显示；其余部分由 build_index() 完成，
+	可在后台线程中调用，索引进行中 len() 随已索引的行数增长。
+	支持 len() 和下标访问，可以直接作为 add_virtual_list 的数据源。
+
+	用完后调用 close() 或用 with 语句：Windows 上映射着的文件不能被替换或删除。
+	"""
+
+	def __init__(self, path, encoding="utf-8", chunk_size=16 * 1024):
+		import mmap
+		self.path = path
+		self.encoding = encoding
+		self.chunk_size = chunk_size
+		self._file = open(path, "rb")
+		self.size = os.fstat(self._file.fileno()).st_size
+		# 空文件无法映射
+		self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else b""
+		# 检查点：行首偏移和行号，两个列表同步增长（先追加偏移，读取时以行号列表长度为准）
+		self._offsets = array("q", [0])
+		self._lines = array("q", [0])
+		self._indexed_to = 0
+		self._count = 0
+		self._cursor = (0, 0)
+		self.indexed = False
+		self.closed = False
+		# 后台线程建立索引时，关闭映射要等当前这一块扫描完
+		self._lock = threading.Lock()
+		self._index_step()
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, exc_type, exc_value, tb):
+		self.close()
+
+	def _index_step(self):
+		"""索引下一块，返回是否还有未索引的内容"""
+		with self._lock:
+			return not self.closed and self._index_chunk()
+
+	def _index_chunk(self):
+		data = self._data
+		start = self._indexed_to
+		if start >= self.size:
+			self._finish_index()
+			return False
+		end = min(start + self.chunk_size, self.size)
+		newline = data.rfind(b"\n", start, end)
+		if newline == -1:
+			# 本块中没有换行：超长行，找到它的结尾为止
+			newline = data.find(b"\n", end)
+			if newline == -1:
+				self._finish_index()
+				return False
+		self._count += data[start:newline + 1].count(b"\n")
+		self._indexed_to = newline + 1
+		self._offsets.append(self._indexed_to)
+		self._lines.append(self._count)
+		if end >= self.size:
+			# 已扫描到文件末尾，最后一个换行之后只可能是没有换行符的最后一行
+			self._finish_index()
+			return False
+		return True
+
+	def _finish_index(self):
+		if self._indexed_to < self.size:
+			# 最后一行没有换行符
+			self._count += 1
+			self._indexed_to = self.size
+		self.indexed = True
+
+	def build_index(self, task=None, lines=None):
+		"""
+		索引整个文件，可在后台线程中调用
+
+		:param task: run_in_background(pass_task=True) 传入的任务句柄，用于报告进度和检查取消
+		:param lines: 索引到至少这么多行就停止，为None时索引整个文件
+		:return: 已索引的行数
+		"""
+		last_percent = -1
+		while (lines is None or self._count < lines) and self._index_step():
+			if task is not None:
+				if task.cancelled:
+					break
+				percent = self._indexed_to * 100 // self.size
+				if percent != last_percent:
+					last_percent = percent
+					task.report_progress(percent)
+		return self._count
+
+	def __len__(self):
+		return self._count
+
+	def _line_start(self, index):
+		"""返回第 index 行的起始偏移"""
+		cursor_line, cursor_offset = self._cursor
+		checkpoint = bisect.bisect_right(self._lines, index, 0, len(self._lines)) - 1
+		if index < cursor_line or self._lines[checkpoint] > cursor_line:
+			# 不是顺序读取，或最近的检查点比上次读到的位置更近
+			cursor_line, cursor_offset = self._lines[checkpoint], self._offsets[checkpoint]
+		data = self._data
+		skip = index - cursor_line
+		if skip > 8:
+			# 一次切分到下一个检查点为止的数据，比逐个 find 换行符快得多
+			bound = self._offsets[checkpoint + 1] if checkpoint + 1 < len(self._lines) else self.size
+			parts = data[cursor_offset:bound].split(b"\n", skip)
+			return cursor_offset + sum(map(len, parts[:skip])) + skip
+		while cursor_line < index:
+			cursor_offset = data.find(b"\n", cursor_offset) + 1
+			cursor_line += 1
+		return cursor_offset
+
+	def __getitem__(self, index):
+		if index < 0:
+			index += self._count
+		if not 0 <= index < self._count:
+			raise IndexError("行号超出范围")
+		start = self._line_start(index)
+		end = self._data.find(b"\n", start)
+		if end == -1:
+			end = self.size
+		self._cursor = (index + 1, end + 1)
+		if end > start and self._data[end - 1:end] == b"\r":
+			end -= 1
+		return self._data[start:end].decode(self.encoding, errors="replace")
+
+	def close(self):
+		"""关闭映射和文件，之后 len() 为0；可以重复调用，进行中的 build_index() 随之结束"""
+		with self._lock:
+			if self.closed:
+				return
+			self.closed = True
+			if not isinstance(self._data, bytes):
+				self._data.close()
+			self._data = b""
+			self._count = 0
+			self._file.close()
+
+
+class ErrorNotificationPanel(QWidget):
+	"""非模态的错误汇总面板，相同的错误只显示一行并累计次数"""
+
+	def __init__(self, parent=None):
+		super().__init__(parent, Qt.Tool | Qt.WindowStaysOnTopHint)
+		self.setWindowTitle("错误与警告")
+		self.resize(520, 260)
+
+		layout = QVBoxLayout(self)
+		self.summary_label = QLabel()
+		layout.addWidget(self.summary_label)
+		self.list_widget = QListWidget()
+		self.list_widget.setWordWrap(True)
+		layout.addWidget(self.list_widget)
+
+		button_box = QDialogButtonBox()
+		self.clear_button = button_box.addButton("清空", QDialogButtonBox.ResetRole)
+		close_button = button_box.addButton("关闭", QDialogButtonBox.RejectRole)
+		close_button.clicked.connect(self.hide)
+		layout.addWidget(button_box)
+
+	def set_entries(self, entries):
+		"""
+		刷新显示内容
+
+		:param entries: (级别, 消息, 调用位置, 次数) 列表
+		"""
+		self.list_widget.clear()
+		total = 0
+		for level, message, call_site, count in entries:
+			total += count
+			suffix = f"  ×{count}" if count > 1 else ""
+			self.list_widget.addItem(f"[{level}] {message}{suffix}\n    {call_site}")
+		self.summary_label.setText(f"共 {len(entries)} 类问题，{total} 次")
+		self.list_widget.scrollToBottom()
+
+
+class ErrorReporter(QObject):
+	"""
+	错误上报管线
+
+	按 (消息, 调用位置) 去重，同一错误在rate_window秒内只写一次日志，
+	其余只计数；界面上只有一个汇总面板，合并刷新，不会弹出模态对话框。
+	"""
+
+	_wake = pyqtSignal()
+	# 第一次创建汇总面板，参数为面板窗口
+	panel_created = pyqtSignal(QWidget)
+
+	def __init__(self, logger, rate_window=1.0, max_entries=200, refresh_interval=200, parent=None):
+		super().__init__(parent)
+		self.logger = logger
+		self.rate_window = rate_window
+		self.max_entries = max_entries
+		self._lock = threading.Lock()
+		# 键 -> [级别, 消息, 调用位置, 总次数, 上次写日志的时间, 未写日志的次数]
+		self._entries = OrderedDict()
+		self._panel = None
+		# 已安排面板刷新但还没刷新；期间的新错误不再重新计时，最多延迟一个刷新间隔
+		self._refresh_pending = False
+
+		self._timer = QTimer(self)
+		self._timer.setSingleShot(True)
+		self._timer.setInterval(refresh_interval)
+		self._timer.timeout.connect(self._refresh_panel)
+		self._wake.connect(self._timer.start)
+
+	def report(self, level, message, call_site="", notify=True):
+		"""
+		上报一条错误，可在任意线程调用
+
+		:param level: logging级别，如 logging.ERROR
+		:param message: 错误消息
+		:param call_site: 调用位置，如 "app.py:42"
+		:param notify: 是否显示在汇总面板中
+		"""
+		key = (message, call_site)
+		now = time.monotonic()
+		suppressed = None
+		with self._lock:
+			entry = self._entries.get(key)
+			if entry is None:
+				entry = [logging.getLevelName(level), message, call_site, 0, None, 0]
+				self._entries[key] = entry
+				if len(self._entries) > self.max_entries:
+					self._entries.popitem(last=False)
+			else:
+				self._entries.move_to_end(key)
+			entry[3] += 1
+			if entry[4] is None or now - entry[4] >= self.rate_window:
+				suppressed = entry[5]
+				entry[4] = now
+				entry[5] = 0
+			else:
+				entry[5] += 1
+			wake = notify and not self._refresh_pending
+			if wake:
+				self._refresh_pending = True
+
+		if suppressed is not None:
+			if suppressed:
+				message = f"{message}（此前重复 {suppressed} 次）"
+			self.logger.log(level, f"{message} [{call_site}]" if call_site else message)
+		if wake:
+			self._wake.emit()
+
+	def entries(self):
+		"""返回 (级别, 消息, 调用位置, 次数) 列表"""
+		with self._lock:
+			return [(entry[0], entry[1], entry[2], entry[3]) for entry in self._entries.values()]
+
+	def clear(self):
+		"""清空所有记录"""
+		with self._lock:
+			self._entries.clear()
+		if self._panel is not None:
+			self._panel.set_entries([])
+
+	def _refresh_panel(self):
+		with self._lock:
+			self._refresh_pending = False
+		if self._panel is None:
+			self._panel = ErrorNotificationPanel()
+			self._panel.clear_button.clicked.connect(self.clear)
+			self.panel_created.emit(self._panel)
+		self._panel.set_entries(self.entries())
+		if not self._panel.isVisible():
+			self._panel.show()
+
+
+class _LatencyHistogram:
+	"""按固定毫秒区间统计耗时分布"""
+
+	BOUNDS_MS = (0.1, 0.5, 1, 2, 5, 10, 16, 33, 50, 100, 250, 500, 1000)
+
+	__slots__ = ("count", "total", "max", "buckets")
+
+	def __init__(self):
+		self.count = 0
+		self.total = 0.0
+		self.max = 0.0
+		self.buckets = [0] * (len(self.BOUNDS_MS) + 1)
+
+	def add(self, ms):
+		self.count += 1
+		self.total += ms
+		if ms > self.max:
+			self.max = ms
+		self.buckets[bisect.bisect_left(self.BOUNDS_MS, ms)] += 1
+
+	def _percentile(self, fraction):
+		"""返回分位数所在区间的上界（超过最大区间时返回最大值）"""
+		target = self.count * fraction
+		seen = 0
+		for index, count in enumerate(self.buckets):
+			seen += count
+			if seen >= target and count:
+				return self.BOUNDS_MS[index] if index < len(self.BOUNDS_MS) else self.max
+		return self.max
+
+	def summary(self):
+		labels = [f"<={bound}ms" for bound in self.BOUNDS_MS] + [f">{self.BOUNDS_MS[-1]}ms"]
+		return {
+			"count": self.count,
+			"mean_ms": self.total / self.count if self.count else 0.0,
+			"p50_ms": self._percentile(0.5),
+			"p95_ms": self._percentile(0.95),
+			"max_ms": self.max,
+			"histogram": {label: count for label, count in zip(labels, self.buckets) if count},
+		}
+
+
+class EventLoopProfiler(QObject):
+	"""
+	事件循环性能分析器
+
+	- 槽函数：经 _wrap_slot 连接的 command=/slot= 回调逐个计时，按函数统计耗时分布
+	- 卡顿：心跳定时器按固定间隔触发，实际间隔比预期晚超过阈值即记为一次卡顿
+	- 绘制/布局：在应用上安装事件过滤器，计时顶层窗口的 UpdateRequest（整窗重绘）和
+	  LayoutRequest（布局计算）
+
+	所有记录可用 dump_trace() 导出为 Chrome trace-event JSON，在 chrome://tracing 或 Perfetto 中查看。
+	"""
+
+	def __init__(self, heartbeat_ms=10, stall_threshold_ms=50, max_events=100000, parent=None):
+		super().__init__(parent)
+		self.heartbeat_ms = heartbeat_ms
+		self.stall_threshold_ms = stall_threshold_ms
+		self.slots = {}
+		self.stalls = _LatencyHistogram()
+		self.paint = _LatencyHistogram()
+		self.layout = _LatencyHistogram()
+		self.events = deque(maxlen=max_events)
+		self.running = False
+		self._origin = time.perf_counter()
+		self._last_beat = None
+		self._pid = os.getpid()
+		self._tid = threading.get_ident()
+
+		self._timer = QTimer(self)
+		self._timer.setTimerType(Qt.PreciseTimer)
+		self._timer.setInterval(heartbeat_ms)
+		self._timer.timeout.connect(self._beat)
+
+	def start(self):
+		if self.running:
+			return
+		self.running = True
+		self._last_beat = time.perf_counter()
+		self._timer.start()
+		QApplication.instance().installEventFilter(self)
+
+	def stop(self):
+		if not self.running:
+			return
+		self.running = False
+		self._timer.stop()
+		QApplication.instance().removeEventFilter(self)
+
+	def time_slot(self, name, slot, args):
+		"""调用槽函数并记录耗时"""
+		start = time.perf_counter()
+		try:
+			return slot(*args)
+		finally:
+			histogram = self.slots.get(name)
+			if histogram is None:
+				histogram = self.slots[name] = _LatencyHistogram()
+			self._record("slot", name, start, time.perf_counter(), histogram)
+
+	def _record(self, category, name, start, end, histogram, args=None):
+		histogram.add((end - start) * 1000)
+		event = {
+			"name": name, "cat": category, "ph": "X",
+			"ts": (start - self._origin) * 1e6, "dur": (end - start) * 1e6,
+			"pid": self._pid, "tid": self._tid,
+		}
+		if args:
+			event["args"] = args
+		self.events.append(event)
+
+	def _beat(self):
+		now = time.perf_counter()
+		late_ms = (now - self._last_beat) * 1000 - self.heartbeat_ms
+		self._last_beat = now
+		if late_ms > self.stall_threshold_ms:
+			self._record("stall", "事件循环卡顿", now - late_ms / 1000, now, self.stalls)
+
+	def eventFilter(self, obj, event):
+		event_type = event.type()
+		if event_type == QEvent.UpdateRequest and obj.isWidgetType() and obj.isWindow():
+			# UpdateRequest 没有布局或其他过滤器要处理，直接在这里分发以便计时
+			start = time.perf_counter()
+			obj.event(event)
+			self._record("paint", "重绘", start, time.perf_counter(), self.paint,
+						 {"window": obj.metaObject().className()})
+			return True
+		if event_type == QEvent.LayoutRequest and obj.isWidgetType() and obj.layout() is not None:
+			# 先计时完成布局计算，之后Qt的正常处理发现布局已是最新，几乎不再耗时
+			start = time.perf_counter()
+			obj.layout().activate()
+			self._record("layout", "布局", start, time.perf_counter(), self.layout,
+						 {"widget": obj.metaObject().className()})
+		return False
+
+	def stats(self):
+		"""
+		获取统计信息
+
+		:return: slots（按槽函数的耗时分布）、stalls（卡顿）、paint（重绘）、layout（布局）
+		"""
+		return {
+			"slots": {name: histogram.summary() for name, histogram in self.slots.items()},
+			"stalls": self.stalls.summary(),
+			"paint": self.paint.summary(),
+			"layout": self.layout.summary(),
+		}
+
+	def dump_trace(self, path):
+		"""
+		导出 Chrome trace-event JSON
+
+		:param path: 输出文件路径
+		"""
+		import json
+		metadata = [
+			{"name": "process_name", "ph": "M", "pid": self._pid, "args": {"name": "WindowMaker"}},
+			{"name": "thread_name", "ph": "M", "pid": self._pid, "tid": self._tid, "args": {"name": "GUI"}},
+		]
+		with open(path, "w", encoding="utf-8") as file:
+			json.dump({"traceEvents": metadata + list(self.events), "displayTimeUnit": "ms"},
+					  file, ensure_ascii=False)
+
+
+def _slot_name(slot):
+	"""分析器中显示的槽函数名：限定名加定义位置，便于区分多个lambda"""
+	name = getattr(slot, "__qualname__", None) or repr(slot)
+	code = getattr(slot, "__code__", None)
+	if code is not None:
+		name += f" ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+	return name
+
+
+# 进程内共享的日志处理器：控制台处理器一个，每个日志文件一个
+_LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+_LOG_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+_logging_lock = threading.Lock()
+
+
+class _LightQueueHandler(logging.Handler):
+	"""
+	把日志记录放进队列交给监听线程
+
+	与 logging.handlers.QueueHandler 相同，但只在调用线程合并消息参数，不复制记录、不格式化；
+	直接继承 logging.Handler，导入本模块时不必加载 logging.handlers（它会连带导入 socket 和 pickle）。
+	"""
+
+	def __init__(self, log_queue):
+		super().__init__()
+		self.queue = log_queue
+
+	def emit(self, record):
+		try:
+			if record.args:
+				record.msg = record.getMessage()
+				record.args = None
+			if record.exc_info:
+				# 异常对象不能安全地跨线程保留，先转成文本
+				record.exc_text = logging.Formatter().formatException(record.exc_info)
+				record.exc_info = None
+			self.queue.put_nowait(record)
+		except Exception:
+			self.handleError(record)
+
+
+_logging_state = {"listener": None, "console": None, "files": {}}
+
+
+def _setup_shared_logging(logger, log_file_path, max_bytes=None, backup_count=3, when=None,
+						  async_logging=True, level=logging.DEBUG):
+	"""
+	为logger配置处理器，重复调用是幂等的
+
+	第一次调用时设置日志级别、创建控制台处理器，并决定是否使用队列（后台线程写日志）；
+	之后每个新出现的日志文件只添加一次文件处理器，不再改动共享logger的级别。
+	"""
+	# 只在用到队列或轮转时才加载，避免拖慢 import pyQtAPI
+	if async_logging or max_bytes or when:
+		import queue
+		from logging import handlers as log_handlers
+	with _logging_lock:
+		state = _logging_state
+		formatter = logging.Formatter(_LOG_FORMAT, datefmt=_LOG_DATE_FORMAT)
+
+		if state["console"] is None:
+			logger.setLevel(level)
+			console_handler = logging.StreamHandler()
+			console_handler.setLevel(logging.INFO)
+			console_handler.setFormatter(formatter)
+			state["console"] = console_handler
+
+			if async_logging:
+				# 业务线程只把记录放进队列，格式化和写文件都在监听线程中完成
+				log_queue = queue.SimpleQueue()
+				listener = log_handlers.QueueListener(log_queue, console_handler, respect_handler_level=True)
+				listener.start()
+				atexit.register(listener.stop)
+				state["listener"] = listener
+				logger.addHandler(_LightQueueHandler(log_queue))
+			else:
+				logger.addHandler(console_handler)
+
+		file_key = os.path.abspath(log_file_path)
+		if file_key in state["files"]:
+			return
+
+		if max_bytes:
+			file_handler = log_handlers.RotatingFileHandler(
+				log_file_path, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8'
+			)
+		elif when:
+			file_handler = log_handlers.TimedRotatingFileHandler(
+				log_file_path, when=when, backupCount=backup_count, encoding='utf-8'
+			)
+		else:
+			file_handler = logging.FileHandler(log_file_path, encoding='utf-8')
+		file_handler.setLevel(logging.DEBUG)
+		file_handler.setFormatter(formatter)
+		state["files"][file_key] = file_handler
+
+		listener = state["listener"]
+		if listener is not None:
+			# 监听线程每条记录都会重新读取handlers，直接替换即可
+			listener.handlers = listener.handlers + (file_handler,)
+		else:
+			logger.addHandler(file_handler)
+
+
+def _remove_from_layout(widget, layout=None):
+	"""把控件从所在布局中移除，控件本身和父部件不变"""
+	if layout is not None:
+		layout.removeWidget(widget)
+		return
+	parent = widget.parentWidget()
+	if parent is not None and parent.layout() is not None:
+		layout = _find_layout(parent.layout(), widget)
+		if layout is not None:
+			layout.removeWidget(widget)
+
+
+def _find_layout(layout, widget):
+	"""在布局及其子布局中查找直接包含该控件的布局，找不到时返回None"""
+	if layout.indexOf(widget) >= 0:
+		return layout
+	for index in range(layout.count()):
+		child = layout.itemAt(index).layout()
+		if child is not None:
+			found = _find_layout(child, widget)
+			if found is not None:
+				return found
+	return None
+
+
+def _reset_button(button):
+	button.setText("")
+	button.setIcon(QIcon())
+	button.setShortcut(QKeySequence())
+	button.setChecked(False)
+	button.setCheckable(False)
+	button.setFlat(False)
+
+
+def _reset_label(label):
+	label.clear()
+	label.setWordWrap(False)
+	label.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
+	label.setTextFormat(Qt.AutoText)
+	label.setOpenExternalLinks(False)
+
+
+def _reset_checkbox(checkbox):
+	checkbox.setText("")
+	checkbox.setIcon(QIcon())
+	checkbox.setTristate(False)
+	checkbox.setChecked(False)
+
+
+def _reset_line_edit(line):
+	line.clear()
+	line.setPlaceholderText("")
+	line.setEchoMode(QLineEdit.Normal)
+	line.setReadOnly(False)
+	line.setMaxLength(32767)
+	line.setValidator(None)
+	line.setInputMask("")
+	line.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
+
+
+def _dynamic_properties(widget):
+	"""控件当前的动态属性（setProperty 设置的属性）"""
+	names = (bytes(name).decode() for name in widget.dynamicPropertyNames())
+	return {name: widget.property(name) for name in names if not name.startswith("_q_")}
+
+
+class WidgetPool:
+	"""
+	控件对象池
+
+	回收的控件按 (类型, 样式键) 分组停放，add_* 创建同类型、同样式的控件时优先取用，
+	省去构造和样式解析的开销。停放的控件只从布局中移除并隐藏，不更换父部件
+	（换父部件会触发样式重算）；父部件被销毁时停放的控件随之销毁，取用时自动跳过。
+	回收时断开通过 connect() 连接的信号，样式表和动态属性恢复为 register() 时的状态。
+	"""
+
+	# 每种控件回收时：要断开的信号、要执行的重置函数
+	RESETTERS = {
+		QPushButton: ("clicked", _reset_button),
+		QLabel: (None, _reset_label),
+		QLineEdit: (None, _reset_line_edit),
+		QCheckBox: ("stateChanged", _reset_checkbox),
+	}
+	# 每个停放控件占用内存的粗略估计（字节），来自 benchmarks/bench_widget_pool.py 的 rss_per_parked_bytes
+	ESTIMATED_WIDGET_BYTES = 24 * 1024
+
+	def __init__(self, max_per_key=64):
+		self.max_per_key = max_per_key
+		self.created = 0
+		self.reused = 0
+		self.released = 0
+		self.discarded = 0
+		self._parked = {}
+
+	def acquire(self, cls, key):
+		"""
+		取出一个停放的控件
+
+		:return: 控件，池中没有可用控件时返回None
+		"""
+		parked = self._parked.get((cls, key))
+		while parked:
+			widget = parked.pop()
+			if not sip.isdeleted(widget):
+				self.reused += 1
+				return widget
+		return None
+
+	def register(self, widget, key):
+		"""记录新建控件的样式键以及当前的样式表和动态属性，之后才能被回收"""
+		widget._pool_key = key
+		widget._pool_sheet = widget.styleSheet()
+		widget._pool_properties = _dynamic_properties(widget)
+		widget._pool_connections = []
+		self.created += 1
+
+	@staticmethod
+	def hint_layout(widget, layout):
+		"""记录控件将被添加到的布局，回收时先在这里查找，省去遍历整棵布局树"""
+		widget._pool_layout = layout if isinstance(layout, QLayout) else None
+
+	def connect(self, widget, signal, slot):
+		"""连接控件的信号并记录下来，控件回收时断开"""
+		signal.connect(slot)
+		connections = getattr(widget, "_pool_connections", None)
+		if connections is not None:
+			connections.append((signal, slot))
+
+	def release(self, widget, layout=None):
+		"""
+		回收控件：重置后停放，无法回收或池已满时销毁
+
+		:param layout: 控件所在的布局，为None时在父部件的布局中查找
+		:return: 停放返回True，销毁返回False
+		"""
+		cls = type(widget)
+		key = getattr(widget, "_pool_key", None)
+		parked = self._parked.get((cls, key), ())
+		if layout is None:
+			hint = getattr(widget, "_pool_layout", None)
+			if hint is not None and not sip.isdeleted(hint) and hint.indexOf(widget) >= 0:
+				layout = hint
+		_remove_from_layout(widget, layout)
+		widget.hide()
+		if key is None or cls not in self.RESETTERS or len(parked) >= self.max_per_key:
+			widget.deleteLater()
+			self.discarded += 1
+			return False
+
+		signal, reset = self.RESETTERS[cls]
+		for bound, slot in widget._pool_connections:
+			try:
+				bound.disconnect(slot)
+			except TypeError:
+				# 已经被调用方断开
+				pass
+		widget._pool_connections.clear()
+		if signal is not None:
+			try:
+				getattr(widget, signal).disconnect()
+			except TypeError:
+				# 没有连接任何槽函数
+				pass
+		widget.blockSignals(True)
+		reset(widget)
+		widget.setMinimumSize(0, 0)
+		widget.setMaximumSize(16777215, 16777215)
+		widget.setEnabled(True)
+		widget.setToolTip("")
+		self._restore_style(widget)
+		widget.blockSignals(False)
+		self._parked.setdefault((cls, key), []).append(widget)
+		self.released += 1
+		return True
+
+	@staticmethod
+	def _restore_style(widget):
+		"""恢复 register() 时的样式表和动态属性，属性有变化时重新应用样式"""
+		if widget.styleSheet() != widget._pool_sheet:
+			widget.setStyleSheet(widget._pool_sheet)
+		properties = _dynamic_properties(widget)
+		if properties == widget._pool_properties:
+			return
+		for name in properties.keys() - widget._pool_properties.keys():
+			widget.setProperty(name, None)
+		for name, value in widget._pool_properties.items():
+			if properties.get(name) != value:
+				widget.setProperty(name, value)
+		style = widget.style()
+		style.unpolish(widget)
+		style.polish(widget)
+
+	def clear(self):
+		"""销毁所有停放的控件"""
+		for parked in self._parked.values():
+			for widget in parked:
+				if not sip.isdeleted(widget):
+					widget.deleteLater()
+		self._parked.clear()
+
+	def stats(self):
+		"""
+		获取统计信息
+
+		:return: created（新建数）、reused（复用数）、released（回收停放数）、discarded（销毁数）、
+			parked（当前停放数）、reuse_ratio（复用占全部取用的比例）、held_bytes（停放控件的估计内存）
+		"""
+		parked = sum(len(widgets) for widgets in self._parked.values())
+		total = self.created + self.reused
+		return {
+			"created": self.created,
+			"reused": self.reused,
+			"released": self.released,
+			"discarded": self.discarded,
+			"parked": parked,
+			"reuse_ratio": self.reused / total if total else 0.0,
+			"held_bytes": parked * self.ESTIMATED_WIDGET_BYTES,
+		}
+
+
+MemorySnapshot = namedtuple("MemorySnapshot", ["time", "rss_bytes", "counts", "bytes", "pixmaps", "stylesheets", "caches"])
+
+
+def _rss_bytes():
+	"""当前进程的常驻内存（字节），无法获取时返回None"""
+	try:
+		with open("/proc/self/statm") as file:
+			return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+	except (OSError, ValueError, AttributeError):
+		return None
+
+
+class MemoryInspector(QObject):
+	"""
+	控件树内存检查器
+
+	从所有顶层窗口出发遍历QObject树，按类型统计对象数和估计字节数：
+	控件、布局等按每个对象的粗略估计计算，图片按实际像素计算（隐式共享的同一张图只算一次），
+	样式表按字符串长度计算。保留最近若干次快照，可比较两次快照的差异，
+	并找出在连续多次快照中数量持续增长的类型（疑似泄漏）。
+
+	每个顶层窗口只调用一次 findChildren，对象先按Python类型分组，类型相关的判断每种类型只做一次，
+	逐个对象只读取样式表和标签图片，适合在生产环境中定期运行，见 benchmarks/bench_memory_inspector.py。
+	"""
+
+	# 每个对象的粗略估计（字节）：控件沿用 WidgetPool 的测量值，布局和其他QObject为空对象批量创建时的RSS增量
+	ESTIMATED_BYTES = {"widget": WidgetPool.ESTIMATED_WIDGET_BYTES, "layout": 768, "object": 320}
+
+	# 定期快照中发现持续增长的类型，参数为 {类型: 最近几次快照中的数量}
+	growth_detected = pyqtSignal(dict)
+
+	def __init__(self, maker, history=20, parent=None):
+		super().__init__(parent)
+		self.maker = maker
+		self.history = deque(maxlen=history)
+		self._timer = QTimer(self)
+		self._timer.timeout.connect(self._tick)
+		self._window = 3
+		self._reported = set()
+
+	def snapshot(self, record=True):
+		"""
+		遍历控件树生成一次快照
+
+		:param record: 是否加入历史记录，供 diff() 和 growing() 使用
+		:return: MemorySnapshot
+		"""
+		counts = {}
+		sizes = {}
+		pixmaps = {"count": 0, "bytes": 0}
+		sheets = {"count": 0, "chars": 0, "unique": 0}
+		unique_sheets = set()
+		seen_pixmaps = set()
+		pixmap_bytes = ScaledPixmapCache._pixmap_bytes
+
+		# 先按Python类型分组，类型相关的判断每种类型只做一次
+		by_type = {}
+		for root in QApplication.topLevelWidgets():
+			objects = root.findChildren(QObject)
+			objects.append(root)
+			for obj in objects:
+				group = by_type.get(type(obj))
+				if group is None:
+					by_type[type(obj)] = [obj]
+				else:
+					group.append(obj)
+
+		for cls, objects in by_type.items():
+			name = cls.__name__
+			if issubclass(cls, QWidget):
+				size = len(objects) * self.ESTIMATED_BYTES["widget"]
+				for sheet in map(cls.styleSheet, objects):
+					if sheet:
+						sheets["count"] += 1
+						sheets["chars"] += len(sheet)
+						unique_sheets.add(sheet)
+						# Qt字符串为UTF-16
+						size += len(sheet) * 2
+				if issubclass(cls, QLabel):
+					for label in objects:
+						candidates = [label.pixmap()]
+						if issubclass(cls, AutoScaledLabel):
+							candidates.append(label.original_pixmap)
+						for pixmap in candidates:
+							# 隐式共享的同一张图只算一次
+							if pixmap is None or pixmap.isNull() or pixmap.cacheKey() in seen_pixmaps:
+								continue
+							seen_pixmaps.add(pixmap.cacheKey())
+							pixmaps["count"] += 1
+							pixmaps["bytes"] += pixmap_bytes(pixmap)
+							size += pixmap_bytes(pixmap)
+			elif issubclass(cls, QLayout):
+				size = len(objects) * self.ESTIMATED_BYTES["layout"]
+			else:
+				size = len(objects) * self.ESTIMATED_BYTES["object"]
+			# 不同模块中的同名类型合并统计
+			counts[name] = counts.get(name, 0) + len(objects)
+			sizes[name] = sizes.get(name, 0) + size
+		sheets["unique"] = len(unique_sheets)
+
+		caches = {
+			"scaled_pixmaps": AutoScaledLabel.pixmap_cache.stats(),
+			"style_compiler": self.maker.style_compiler.stats(),
+		}
+		if self.maker.widget_pool is not None:
+			caches["widget_pool"] = self.maker.widget_pool.stats()
+
+		result = MemorySnapshot(time.time(), _rss_bytes(), counts, sizes, pixmaps, sheets, caches)
+		if record:
+			self.history.append(result)
+		return result
+
+	def diff(self, old=None, new=None):
+		"""
+		比较两次快照中各类型的数量
+
+		:param old: 较早的快照，默认为历史中的倒数第二次
+		:param new: 较晚的快照，默认为历史中的最后一次
+		:return: {类型: (数量变化, 估计字节变化)}，只包含有变化的类型，按字节变化从大到小排序
+		"""
+		if old is None or new is None:
+			if len(self.history) < 2:
+				return {}
+			old = old or self.history[-2]
+			new = new or self.history[-1]
+		changes = []
+		for name in set(old.counts) | set(new.counts):
+			count = new.counts.get(name, 0) - old.counts.get(name, 0)
+			size = new.bytes.get(name, 0) - old.bytes.get(name, 0)
+			if count or size:
+				changes.append((name, (count, size)))
+		changes.sort(key=lambda item: abs(item[1][1]), reverse=True)
+		return dict(changes)
+
+	def growing(self, window=3):
+		"""
+		找出在最近 window 次快照间每次都增长的类型
+
+		:param window: 连续增长的次数，需要至少 window+1 次快照
+		:return: {类型: [最近 window+1 次快照中的数量]}
+		"""
+		if len(self.history) <= window:
+			return {}
+		recent = list(self.history)[-(window + 1):]
+		result = {}
+		for name in recent[-1].counts:
+			series = [snap.counts.get(name, 0) for snap in recent]
+			if all(later > earlier for earlier, later in zip(series, series[1:])):
+				result[name] = series
+		return result
+
+	def start(self, interval_ms=60000, window=3):
+		"""
+		定期生成快照，发现持续增长的类型时发出 growth_detected 信号
+
+		:param interval_ms: 快照间隔（毫秒）
+		:param window: 连续增长多少次后报告
+		"""
+		self._window = window
+		self._timer.start(interval_ms)
+
+	def stop(self):
+		self._timer.stop()
+
+	def is_running(self):
+		return self._timer.isActive()
+
+	def _tick(self):
+		self.snapshot()
+		suspects = self.growing(self._window)
+		# 同一类型只在开始增长时报告一次，停止增长后重新计入
+		new = {name: series for name, series in suspects.items() if name not in self._reported}
+		self._reported = set(suspects)
+		if new:
+			self.growth_detected.emit(new)
+
+
+class StartupSnapshot(QObject):
+	"""
+	启动快照缓存
+
+	上次运行时把主窗口首帧的截图和窗口几何信息写入一个文件，文件键为构建脚本内容、
+	本模块版本、Qt版本和窗口参数的哈希。再次启动时，QApplication 创建后立即把截图作为
+	启动画面显示在原位置，真实控件树在其后照常构建，主窗口第一次绘制完成后启动画面消失。
+
+	控件树本身不做序列化：回调函数和闭包只存在于构建脚本中，反序列化一棵可用的控件树
+	仍要逐个创建控件，省不下时间。省下的是用户看到第一帧之前的等待。
+
+	文件格式: b"PQLS" + 4字节头部长度 + JSON头部 + PNG截图
+	"""
+
+	MAGIC = b"PQLS"
+
+	def __init__(self, path, key, runner=None, parent=None):
+		"""
+		:param path: 快照文件路径
+		:param key: 快照键，与文件中的不一致时按未命中处理
+		:param runner: 后台执行函数，签名同 WindowMaker.run_in_background；为None时在GUI线程写入
+		"""
+		super().__init__(parent)
+		self.path = path
+		self.key = key
+		self.runner = runner
+		self.header = None
+		self.splash = None
+		self.window = None
+		self.stats = {"cache_hit": False, "cached_frame_ms": None, "first_frame_ms": None, "saved": False}
+		self._saved_this_run = False
+		# 后台写入和关闭时的同步写入可能同时进行，只保留最后一次截取的画面
+		self._write_lock = threading.Lock()
+		self._generation = 0
+
+	@staticmethod
+	def default_key(*extra):
+		"""
+		构建脚本（__main__ 模块文件）内容、本模块文件版本、Qt版本及额外参数的哈希
+
+		:return: 十六进制字符串，构建脚本不是文件时返回None
+		"""
+		import hashlib
+		script = getattr(sys.modules.get("__main__"), "__file__", None)
+		if not script or not os.path.isfile(script):
+			return None
+		digest = hashlib.sha1()
+		with open(script, "rb") as file:
+			digest.update(file.read())
+		module_stat = os.stat(__file__)
+		digest.update(f"{module_stat.st_size}:{module_stat.st_mtime_ns}:{QT_VERSION_STR}".encode())
+		digest.update(repr(extra).encode())
+		return digest.hexdigest()
+
+	@staticmethod
+	def default_path(key):
+		"""系统缓存目录下的快照文件路径，文件名包含构建脚本名和键的前缀"""
+		cache_dir = QStandardPaths.writableLocation(QStandardPaths.CacheLocation) or \
+			os.path.join(os.path.expanduser("~"), ".cache")
+		script = os.path.splitext(os.path.basename(getattr(sys.modules.get("__main__"), "__file__", "app")))[0]
+		return os.path.join(cache_dir, "pyQtAPI", "startup", f"{script}-{key[:16]}.snap")
+
+	def _read(self):
+		"""读取并校验快照文件，返回 (头部, PNG数据)，不存在或已过期时返回 (None, None)"""
+		try:
+			with open(self.path, "rb") as file:
+				data = file.read()
+		except OSError:
+			return None, None
+		if data[:4] != self.MAGIC:
+			return None, None
+		import json
+		import struct
+		try:
+			header_length, = struct.unpack(">I", data[4:8])
+			header = json.loads(data[8:8 + header_length].decode("utf-8"))
+			# show_cached() 和 attach() 用到的字段，缺少任何一个都按损坏处理
+			valid = isinstance(header, dict) and {"key", "rect", "dpr", "geometry"} <= header.keys()
+		except (struct.error, ValueError, KeyError, UnicodeDecodeError):
+			valid = False
+		if not valid:
+			# 文件损坏或被截断（例如写入时进程被杀死），删除后本次按未命中处理
+			self.discard()
+			return None, None
+		if header["key"] != self.key:
+			return None, None
+		return header, data[8 + header_length:]
+
+	def show_cached(self):
+		"""
+		有可用快照时立即显示启动画面
+
+		:return: 是否命中缓存
+		"""
+		header, png = self._read()
+		if header is None:
+			return False
+		pixmap = QPixmap()
+		if not pixmap.loadFromData(png, "PNG"):
+			return False
+		pixmap.setDevicePixelRatio(header["dpr"])
+		self.header = header
+		self.splash = QSplashScreen(pixmap, Qt.WindowStaysOnTopHint)
+		x, y, width, height = header["rect"]
+		self.splash.setGeometry(x, y, width, height)
+		self.splash.show()
+		# 画出启动画面后才返回，之后的控件构建不会推迟第一帧
+		self.splash.repaint()
+		QApplication.instance().processEvents()
+		self.stats["cache_hit"] = True
+		self.stats["cached_frame_ms"] = (time.perf_counter() - _IMPORT_TIME) * 1000
+		return True
+
+	def attach(self, window):
+		"""
+		在主窗口显示前调用：恢复上次的窗口几何，等待主窗口第一次绘制
+
+		:param window: 主窗口
+		"""
+		self.window = window
+		if self.header is not None:
+			window.restoreGeometry(QByteArray.fromBase64(self.header["geometry"].encode("ascii")))
+		window.installEventFilter(self)
+
+	def eventFilter(self, obj, event):
+		if obj is self.window:
+			if event.type() == QEvent.Paint and self.stats["first_frame_ms"] is None:
+				self.stats["first_frame_ms"] = (time.perf_counter() - _IMPORT_TIME) * 1000
+				# 本次绘制结束后再关闭启动画面，并在空闲时写入新快照
+				QTimer.singleShot(0, self._on_first_frame)
+			elif event.type() == QEvent.Close:
+				# 关闭前保存最终的几何和画面，下次启动按此显示；程序即将退出，不能交给后台
+				self.save(background=False)
+		return False
+
+	def _on_first_frame(self):
+		if self.splash is not None:
+			self.splash.close()
+			self.splash.deleteLater()
+			self.splash = None
+		if self.header is None:
+			self.save()
+
+	def save(self, background=True):
+		"""
+		截取主窗口当前画面，连同窗口几何写入快照文件（先写临时文件再替换）
+
+		GUI线程只截图，PNG编码和写入磁盘在后台进行（没有runner时仍在GUI线程）。
+
+		:param background: 是否在后台编码和写入
+		:return: 是否已截取画面；后台写入完成后 stats["saved"] 才为True
+		"""
+		window = self.window
+		if window is None or not window.isVisible():
+			return False
+		import json
+		# 只保存屏幕上能看到的部分，启动画面不会比屏幕更高
+		screen = window.windowHandle().screen() if window.windowHandle() else QApplication.primaryScreen()
+		height = min(window.height(), screen.availableGeometry().height())
+		# QPixmap 只能在GUI线程使用，交给后台前转换为 QImage
+		image = window.grab(QRect(0, 0, window.width(), height)).toImage()
+		geometry = window.geometry()
+		header = json.dumps({
+			"key": self.key,
+			"rect": [geometry.x(), geometry.y(), geometry.width(), height],
+			"dpr": image.devicePixelRatio(),
+			"geometry": bytes(window.saveGeometry().toBase64()).decode("ascii"),
+			"saved_at": time.time(),
+		}).encode("utf-8")
+		self._generation += 1
+		if background and self.runner is not None:
+			self.runner(self._write, image, header, self._generation, on_done=self._on_written)
+		else:
+			self._on_written(self._write(image, header, self._generation))
+		return True
+
+	def _write(self, image, header, generation):
+		"""编码PNG并写入快照文件，可在后台线程调用；已有更新的截图时跳过，返回是否写入"""
+		import struct
+		buffer = QBuffer()
+		buffer.open(QIODevice.WriteOnly)
+		image.save(buffer, "PNG")
+		with self._write_lock:
+			if generation != self._generation:
+				return False
+			atomic_write(self.path, self.MAGIC + struct.pack(">I", len(header)) + header + bytes(buffer.data()))
+		return True
+
+	def _on_written(self, written):
+		if written:
+			self.stats["saved"] = True
+
+	def discard(self):
+		"""删除快照文件"""
+		with contextlib.suppress(OSError):
+			os.remove(self.path)
+
+
+# 无法获取签名（如PyQt控件的内置方法 widget.close）时 _positional_arity 的返回值
+_UNKNOWN_ARITY = -1
+
+
+def _positional_arity(fn):
+	"""函数最多接受的位置参数个数，有*args时返回None，无法获取签名时返回 _UNKNOWN_ARITY"""
+	try:
+		params = inspect.signature(fn).parameters.values()
+	except (TypeError, ValueError):
+		return _UNKNOWN_ARITY
+	if any(p.kind == p.VAR_POSITIONAL for p in params):
+		return None
+	return sum(1 for p in params if p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD))
+
+
+def _call_trimmed(fn, args):
+	"""
+	调用签名未知的函数，与PyQt对槽函数的处理一致：参数过多引发TypeError时去掉末尾的参数重试
+
+	只在TypeError由这次调用本身引发时重试，函数内部引发的TypeError照常抛出。
+	"""
+	for count in range(len(args), -1, -1):
+		try:
+			return fn(*args[:count])
+		except TypeError:
+			if count == 0 or sys.exc_info()[2].tb_next is not None:
+				raise
+
+
+def _set_text(widget, value):
+	if isinstance(widget, (QTextEdit, QPlainTextEdit)):
+		if widget.toPlainText() != value:
+			widget.setPlainText(value)
+	elif widget.text() != value:
+		# 内容相同时不写入，避免打断输入框的光标和选区
+		widget.setText(value)
+
+
+class _MountedNode:
+	"""已挂载的描述节点：记录描述参数、创建出的控件/布局以及子节点"""
+
+	__slots__ = ("kind", "key", "options", "widget", "placed", "layout", "children", "handlers")
+
+	def __init__(self, kind, key, options):
+		self.kind = kind
+		self.key = key
+		self.options = options
+		self.widget = None
+		self.placed = None
+		self.layout = None
+		self.children = []
+		self.handlers = {}
+
+
+class ReactiveView:
+	"""
+	响应式界面：界面描述是状态的函数
+
+	render(state) 返回与 WindowMaker.build 相同格式的描述。状态变化后重新调用render，
+	把新描述与当前控件树逐节点比较，只做必要的属性更新、插入、删除和移动。
+	兄弟节点按 key（或 id）匹配，没有key的按同类型出现的顺序匹配；
+	参数中的函数（command、slot等）在重新渲染时只替换引用，不重新连接信号。
+	只支持自动布局模式。
+	"""
+
+	# 可以原地更新的参数：参数名 -> setter(widget, value)
+	PROPERTY_SETTERS = {
+		"text": _set_text,
+		"placeholder": lambda widget, value: widget.setPlaceholderText(value),
+		"checked": lambda widget, value: widget.setChecked(value),
+		"title": lambda widget, value: widget.toggle_button.setText(value),
+		"min_size": lambda widget, value: widget.setMinimumSize(*(value or (0, 0))),
+		"max_size": lambda widget, value: widget.setMaximumSize(*(value or (16777215, 16777215))),
+	}
+	LAYOUT_SETTERS = {
+		"spacing": lambda layout, value: layout.setSpacing(-1 if value is None else value),
+		"margin": lambda layout, value: layout.setContentsMargins(*(value or (0, 0, 0, 0))),
+	}
 
-	def setPixmap(self, pixmap):
-		self.original_pixmap = pixmap
-		# 初始时不设置图片，等待首次resizeEvent
-		self.rescale_pixmap()
+	def __init__(self, maker, render, state=None):
+		self.maker = maker
+		self.render_fn = render
+		self.state = dict(state or {})
+		self.widgets = {}
+		self.container = None
+		self.last_patch = {}
+		self._roots = []
+
+	def mount(self, stretch=0):
+		"""在WindowMaker当前布局中构建初始界面"""
+		start = time.perf_counter()
+		with self.maker.batch(stretch) as container:
+			self.container = container
+			self._stats = dict.fromkeys(("updated", "inserted", "removed", "moved", "replaced"), 0)
+			self._roots = self._reconcile(container.layout(), [], self.render_fn(self.state))
+		self._finish(start)
+		return self
 
-	def rescale_pixmap(self):
-		"""独立出来的缩放方法"""
-		if self.original_pixmap and not self.original_pixmap.isNull():
-			# 获取当前可用空间（排除边框和内边距）
-			available_size = self.size()
+	def set_state(self, **changes):
+		"""合并状态并重新渲染"""
+		self.state.update(changes)
+		return self.rerender()
 
-			# 计算保持宽高比的缩放
-			scaled = self.original_pixmap.scaled(
-				available_size,
-				Qt.KeepAspectRatio,
-				Qt.SmoothTransformation
-			)
-			super().setPixmap(scaled)
+	def rerender(self):
+		"""
+		按当前状态重新渲染，只更新有变化的部分
 
-	def resizeEvent(self, event):
-		# 只在有原始图片时才缩放
-		if self.original_pixmap:
-			self.rescale_pixmap()
-			self.setMinimumSize(1, 1)  # 最小尺寸为1px
-			self.setMaximumSize(16777215, 16777215)  # 恢复最大尺寸限制
+		:return: 本次更新的统计，同 self.last_patch
+		"""
+		start = time.perf_counter()
+		self._stats = dict.fromkeys(("updated", "inserted", "removed", "moved", "replaced"), 0)
+		self.container.setUpdatesEnabled(False)
+		try:
+			self._roots = self._reconcile(self.container.layout(), self._roots, self.render_fn(self.state))
+		finally:
+			self.container.setUpdatesEnabled(True)
+		self._finish(start)
+		return self.last_patch
+
+	def _finish(self, start):
+		self.widgets = {}
+		self._collect_ids(self._roots)
+		self.last_patch = dict(self._stats, ms=(time.perf_counter() - start) * 1000)
+
+	def _collect_ids(self, records):
+		for record in records:
+			name = record.options.get("id")
+			if name is not None:
+				self.widgets[name] = record.widget if record.widget is not None else record.layout
+			self._collect_ids(record.children)
+
+	@staticmethod
+	def _flatten(nodes):
+		if isinstance(nodes, dict):
+			return [nodes]
+		flat = []
+		for node in nodes or ():
+			flat.extend(ReactiveView._flatten(node))
+		return flat
+
+	def _reconcile(self, layout, old_records, nodes):
+		"""让layout中的内容与nodes一致，返回新的节点记录列表"""
+		nodes = self._flatten(nodes)
+		keys = []
+		counters = {}
+		for node in nodes:
+			key = node.get("key", node.get("id"))
+			if key is None:
+				kind = node.get("type")
+				key = ("#", kind, counters.get(kind, 0))
+				counters[kind] = counters.get(kind, 0) + 1
+			keys.append(key)
+
+		old_by_key = {record.key: record for record in old_records}
+		matched = {}
+		for key, node in zip(keys, nodes):
+			record = old_by_key.get(key)
+			if record is not None and record.kind == node.get("type") and key not in matched:
+				matched[key] = record
+		# 先删除不再需要的节点，剩下的节点再按新顺序就位
+		for record in old_records:
+			if matched.get(record.key) is not record:
+				self._remove(layout, record)
+
+		records = []
+		for index, (key, node) in enumerate(zip(keys, nodes)):
+			record = matched.get(key)
+			if record is None:
+				record = self._mount(layout, node, key, index)
+			else:
+				record = self._patch(layout, record, node, index)
+				self._place(layout, record, index)
+			if record is not None:
+				records.append(record)
+		return records
+
+	@staticmethod
+	def _split(node):
+		options = dict(node)
+		kind = options.pop("type", None)
+		options.pop("key", None)
+		children = options.pop("children", [])
+		return kind, options, children
+
+	def _trampoline(self, record, name):
+		"""
+		信号始终连接到这个函数，由它调用最近一次渲染传入的函数
 
-		super().resizeEvent(event)
+		每个函数只在第一次被调用时检查一次签名，之后的调用直接使用缓存的结果。
+		"""
+		# 最近一次调用的函数及其准备好的调用方式
+		prepared = [None, None]
+
+		def call(*args):
+			handler = record.handlers[name]
+			if prepared[0] is not handler:
+				prepared[0], prepared[1] = handler, self._prepare_handler(handler)
+			return prepared[1](*args)
+		call.__qualname__ = f"{record.kind}[{record.key}].{name}"
+		return call
+
+	def _prepare_handler(self, handler):
+		"""按函数签名决定如何把信号参数传给它"""
+		arity = _positional_arity(handler)
+		# 外层连接时已经过 _wrap_slot 计时，这里不再重复记录
+		target = self.maker._wrap_slot(handler, profile=False)
+		if arity == _UNKNOWN_ARITY:
+			return lambda *args: _call_trimmed(target, args)
+		if arity is None:
+			return target
+		return lambda *args: target(*args[:arity])
+
+	def _mount(self, layout, node, key, index, stat="inserted"):
+		kind, options, children = self._split(node)
+		if kind is None:
+			self.maker._handle_error(f"无效的构建描述: {node}")
+			return None
+		record = _MountedNode(kind, key, options)
+		arguments = {name: value for name, value in options.items() if name != "id"}
+		for name, value in options.items():
+			if callable(value):
+				record.handlers[name] = value
+				arguments[name] = self._trampoline(record, name)
+
+		if kind in ("row", "column") and arguments.pop("flatten", False):
+			# 扁平化区域没有逐项的Qt布局，无法局部插入和删除
+			self.maker._handle_warning("响应式界面中的行/列不支持flatten，按嵌套布局创建")
+
+		count = layout.count()
+		stack = self.maker.layout_stack
+		stack.append(layout)
+		try:
+			if kind in ("row", "column"):
+				getattr(self.maker, kind)(**arguments)
+				if len(stack) > 1 and stack[-1] is not layout:
+					record.layout = stack[-1]
+					record.children = self._reconcile(record.layout, [], children)
+			else:
+				method = getattr(self.maker, f"add_{kind}", None)
+				if method is None:
+					self.maker._handle_error(f"未知的控件类型: {kind}")
+					return None
+				record.widget = method(**arguments)
+		finally:
+			while stack and stack[-1] is not layout:
+				stack.pop()
+			stack.pop()
+
+		if layout.count() == count + 1 and record.layout is None:
+			record.placed = layout.itemAt(count).widget()
+		if stat:
+			self._stats[stat] += 1
+		self._place(layout, record, index)
+		return record
+
+	def _patch(self, layout, record, node, index):
+		kind, options, children = self._split(node)
+		changed = []
+		for name in set(record.options) | set(options):
+			old, new = record.options.get(name), options.get(name)
+			if callable(old) and callable(new):
+				record.handlers[name] = new
+			elif old != new and name != "id":
+				changed.append(name)
+
+		setters = self.LAYOUT_SETTERS if record.layout is not None else self.PROPERTY_SETTERS
+		target = record.layout if record.layout is not None else record.widget
+		inplace = all(name in setters or name == "stretch" for name in changed)
+		if not inplace or (changed and target is None):
+			# 有无法原地更新的参数，整个节点重建
+			self._remove(layout, record, stat="replaced")
+			return self._mount(layout, node, record.key, index, stat=None)
+
+		for name in changed:
+			if name == "stretch":
+				position = self._index_of(layout, record)
+				if position >= 0:
+					layout.setStretch(position, options.get(name) or 0)
+			else:
+				setters[name](target, options.get(name))
+		if changed:
+			self._stats["updated"] += 1
+		record.options = options
+		if record.layout is not None:
+			record.children = self._reconcile(record.layout, record.children, children)
+		return record
+
+	@staticmethod
+	def _index_of(layout, record, hint=None):
+		if hint is not None and hint < layout.count():
+			item = layout.itemAt(hint)
+			if (record.placed is not None and item.widget() is record.placed) or \
+					(record.layout is not None and item.layout() is record.layout):
+				return hint
+		if record.placed is not None:
+			return layout.indexOf(record.placed)
+		for position in range(layout.count()):
+			if layout.itemAt(position).layout() is record.layout:
+				return position
+		return -1
+
+	def _place(self, layout, record, index):
+		"""把节点移动到布局中的index位置"""
+		if record.placed is None and record.layout is None:
+			return
+		current = self._index_of(layout, record, index)
+		if current < 0 or current == index:
+			return
+		stretch = layout.stretch(current)
+		if record.placed is not None:
+			alignment = layout.itemAt(current).alignment()
+			layout.removeWidget(record.placed)
+			layout.insertWidget(index, record.placed, stretch, alignment)
+		else:
+			layout.takeAt(current)
+			layout.insertLayout(index, record.layout, stretch)
+		self._stats["moved"] += 1
+
+	def _remove(self, layout, record, stat="removed"):
+		if record.placed is not None:
+			self.maker.release_widget(record.placed, layout)
+		elif record.layout is not None:
+			position = self._index_of(layout, record)
+			if position >= 0:
+				layout.takeAt(position)
+			_clear_layout(record.layout)
+			record.layout.deleteLater()
+		elif isinstance(record.widget, QWidget):
+			record.widget.deleteLater()
+		self._stats[stat] += 1
+
+
+# place() 的锚点：控件上放在计算位置处的点，占控件宽、高的比例，与 tkinter 的 anchor 相同
+PLACE_ANCHORS = {
+	"nw": (0.0, 0.0), "n": (0.5, 0.0), "ne": (1.0, 0.0),
+	"w": (0.0, 0.5), "center": (0.5, 0.5), "e": (1.0, 0.5),
+	"sw": (0.0, 1.0), "s": (0.5, 1.0), "se": (1.0, 1.0),
+}
+
+
+def _place_rows(values, count, name):
+	"""把 place() 的参数整理成每个控件一组：接受每个控件一个元组，或长度为控件数×4的一维数组"""
+	if values is None:
+		return [()] * count
+	values = list(values)
+	if values and not isinstance(values[0], (tuple, list)):
+		if len(values) != count * 4:
+			raise ValueError(f"{name} 为一维数组时长度必须是控件数的4倍")
+		return [tuple(values[i:i + 4]) for i in range(0, len(values), 4)]
+	if len(values) != count:
+		raise ValueError(f"{name} 的长度与控件数不一致")
+	return [tuple(row) for row in values]
+
+
+def _with_size_hint(widget, position, ratio):
+	"""
+	只给出位置 (x, y) 或什么都没给时补上像素尺寸：和 tkinter 一样，
+	给了 relwidth/relheight 的方向为0，其余方向取控件的首选尺寸
+	"""
+	if ratio[2] and ratio[3]:
+		width, height = 0, 0
+	else:
+		hint = widget.sizeHint()
+		width = 0 if ratio[2] else hint.width()
+		height = 0 if ratio[3] else hint.height()
+	return (position + (0, 0))[:2] + (width, height)
+
+
+class PlacementEngine(QObject):
+	"""
+	手动定位模式下的批量几何计算
+
+	和 tkinter 的 place() 一样，控件的位置和尺寸由像素偏移 (x, y, w, h) 加上父部件尺寸的比例
+	(relx, rely, relwidth, relheight) 组成，anchor 决定控件上哪个点放在算出的位置上。
+	例如 relx=1, rely=1, x=-10, y=-10, anchor="se" 让控件始终贴在父部件右下角。
+
+	所有控件的参数按列存放在 array 中，父部件缩放时逐列一次算出全部控件的区域，
+	只对区域有变化的控件调用一次 setGeometry（而不是 move 加 resize）。
+	不暂停父部件的刷新：Qt 本来就把一轮事件循环中的重绘合并成一次，而 setUpdatesEnabled(True)
+	会让所有子控件都重绘，见 benchmarks/bench_manual_layout.py。
+	"""
+
+	def __init__(self, parent_widget):
+		"""
+		:param parent_widget: 控件的父部件，缩放时按它的尺寸重新计算
+		"""
+		super().__init__(parent_widget)
+		self.widget = parent_widget
+		self._widgets = []
+		self._index = {}  # id(控件) -> 在各列中的下标
+		self._offsets = array("i")  # 每个控件4个数：x, y, w, h
+		self._ratios = array("d")  # 每个控件4个数：relx, rely, relwidth, relheight
+		self._anchors = array("d")  # 每个控件2个数：锚点占控件宽、高的比例
+		self._rects = []  # 上次设置的区域，区域没有变化的控件不再调用 setGeometry
+		self._relative = False  # 有控件使用比例时，父部件缩放才需要重新计算
+		self.passes = 0
+		self.moved = 0
+		self.skipped = 0
+		self.last_pass_ms = 0.0
+		parent_widget.installEventFilter(self)
+
+	def place(self, widgets, geometry=None, relative=None, anchor="nw"):
+		"""
+		批量设置控件的位置和尺寸，并立即排布一次
+
+		:param widgets: 控件列表，已经由本对象管理的控件会更新参数
+		:param geometry: 像素偏移，每个控件一个 (x, y) 或 (x, y, w, h)，也可以是长度为控件数×4的一维数组；
+			没有给出 w、h 时，没有 relwidth、relheight 的方向取控件的首选尺寸
+		:param relative: 父部件尺寸的比例，每个控件一个 (relx, rely) 或 (relx, rely, relwidth, relheight)，
+			也可以是一维数组；为None时是绝对定位
+		:param anchor: 锚点名称（见 PLACE_ANCHORS），或每个控件一个的列表
+		:return: self
+		"""
+		widgets = list(widgets)
+		count = len(widgets)
+		offsets = _place_rows(geometry, count, "geometry")
+		ratios = _place_rows(relative, count, "relative")
+		anchors = [anchor] * count if anchor is None or isinstance(anchor, str) else list(anchor)
+		if len(anchors) != count:
+			raise ValueError("anchor 的长度与控件数不一致")
+		if any(len(row) not in (0, 2, 4) for row in offsets) or any(len(row) not in (0, 2, 4) for row in ratios):
+			raise ValueError("每个控件的参数必须是 (x, y) 或 (x, y, w, h) 的形式")
+		# 整理成每个控件4个比例、4个像素值、2个锚点比例；没有给出尺寸的方向取首选尺寸
+		ratios = [row if len(row) == 4 else (row + (0.0, 0.0, 0.0, 0.0))[:4] for row in ratios]
+		offsets = [row if len(row) == 4 else _with_size_hint(widget, row, ratio)
+				   for widget, row, ratio in zip(widgets, offsets, ratios)]
+		anchor_points = [PLACE_ANCHORS[name or "nw"] for name in anchors]
+
+		# 在列表上追加或覆盖，最后整列重建 array
+		offset_list, ratio_list, anchor_list = self._offsets.tolist(), self._ratios.tolist(), self._anchors.tolist()
+		index_of = self._index
+		for widget, offset, ratio, anchor_point in zip(widgets, offsets, ratios, anchor_points):
+			index = index_of.get(id(widget))
+			if index is None:
+				index_of[id(widget)] = len(self._widgets)
+				self._widgets.append(widget)
+				self._rects.append(None)
+				offset_list += offset
+				ratio_list += ratio
+				anchor_list += anchor_point
+			else:
+				offset_list[index * 4:index * 4 + 4] = offset
+				ratio_list[index * 4:index * 4 + 4] = ratio
+				anchor_list[index * 2:index * 2 + 2] = anchor_point
+		self._offsets = array("i", map(int, offset_list))
+		self._ratios = array("d", ratio_list)
+		self._anchors = array("d", anchor_list)
+		self._relative = any(self._ratios)
+		self.apply()
+		return self
 
-class CollapsibleWidget(QWidget):
-	def __init__(self, title, parent=None):
+	def remove(self, widget):
+		"""
+		不再管理某个控件的位置，控件本身保持不变
+
+		:return: self
+		"""
+		index = self._index.get(id(widget))
+		if index is not None:
+			self._drop({index})
+		return self
+
+	def apply(self, force=False):
+		"""
+		按父部件当前的尺寸计算所有控件的区域，并一次性应用
+
+		:param force: 为True时对所有控件都调用 setGeometry（控件被其他代码移动过时使用）
+		"""
+		start = time.perf_counter()
+		# 逐个连接 destroyed 信号的开销比每次检查一遍大得多
+		if any(map(sip.isdeleted, self._widgets)):
+			self._drop({index for index, widget in enumerate(self._widgets) if sip.isdeleted(widget)})
+		width, height = self.widget.width(), self.widget.height()
+		offsets, ratios, anchors = self._offsets, self._ratios, self._anchors
+		# 逐列计算：先算出全部控件的宽高，再按锚点算左上角
+		widths = [max(0, round(w + rw * width)) for w, rw in zip(offsets[2::4], ratios[2::4])]
+		heights = [max(0, round(h + rh * height)) for h, rh in zip(offsets[3::4], ratios[3::4])]
+		xs = [round(x + rx * width - ax * w) for x, rx, ax, w in zip(offsets[0::4], ratios[0::4], anchors[0::2], widths)]
+		ys = [round(y + ry * height - ay * h) for y, ry, ay, h in zip(offsets[1::4], ratios[1::4], anchors[1::2], heights)]
+		rects = list(zip(xs, ys, widths, heights))
+		if force:
+			changed = range(len(rects))
+		else:
+			changed = [index for index, (old, new) in enumerate(zip(self._rects, rects)) if old != new]
+
+		widgets = self._widgets
+		for index in changed:
+			widgets[index].setGeometry(*rects[index])
+		self._rects = rects
+		self.passes += 1
+		self.moved += len(changed)
+		self.skipped += len(rects) - len(changed)
+		self.last_pass_ms = (time.perf_counter() - start) * 1000
+
+	def _drop(self, indices):
+		"""从各列中删除指定下标的控件"""
+		keep = [index for index in range(len(self._widgets)) if index not in indices]
+		self._widgets = [self._widgets[index] for index in keep]
+		self._rects = [self._rects[index] for index in keep]
+		self._offsets = array("i", (value for index in keep for value in self._offsets[index * 4:index * 4 + 4]))
+		self._ratios = array("d", (value for index in keep for value in self._ratios[index * 4:index * 4 + 4]))
+		self._anchors = array("d", (value for index in keep for value in self._anchors[index * 2:index * 2 + 2]))
+		self._index = {id(widget): index for index, widget in enumerate(self._widgets)}
+		self._relative = any(self._ratios)
+
+	def eventFilter(self, obj, event):
+		if event.type() == QEvent.Resize and obj is self.widget and self._relative:
+			self.apply()
+		return False
+
+	def stats(self):
+		"""
+		获取统计信息
+
+		:return: widgets（管理的控件数）、passes（计算次数）、moved（调用 setGeometry 的次数）、
+			skipped（区域没有变化而跳过的次数）、last_pass_ms（最近一次计算和应用的耗时）
+		"""
+		return {
+			"widgets": len(self._widgets),
+			"passes": self.passes,
+			"moved": self.moved,
+			"skipped": self.skipped,
+			"last_pass_ms": round(self.last_pass_ms, 3),
+		}
+
+
+class IconCache:
+	"""
+	按路径缓存的 QIcon
+
+	同一路径只做一次绝对路径转换、文件检查和 QIcon 创建；不存在的文件也记下来，
+	只在第一次遇到时调用 on_missing(绝对路径)。
+	"""
+
+	def __init__(self, on_missing=None):
+		self.on_missing = on_missing
+		self.hits = 0
+		self.misses = 0
+		self._icons = {}
+
+	def get(self, path):
+		"""
+		获取图标
+
+		:param path: 图标文件路径
+		:return: QIcon 对象，文件不存在时返回None
+		"""
+		if path in self._icons:
+			self.hits += 1
+			return self._icons[path]
+		self.misses += 1
+		abs_path = os.path.abspath(path)
+		icon = QIcon(abs_path) if os.path.exists(abs_path) else None
+		self._icons[path] = icon
+		if icon is None and self.on_missing is not None:
+			self.on_missing(abs_path)
+		return icon
+
+	def stats(self):
+		"""
+		获取缓存统计
+
+		:return: 包含 hits/misses/size/missing 的字典
+		"""
+		return {
+			"hits": self.hits,
+			"misses": self.misses,
+			"size": len(self._icons),
+			"missing": sum(icon is None for icon in self._icons.values()),
+		}
+
+	def clear(self):
+		"""清空缓存，图标文件变化后调用"""
+		self._icons.clear()
+
+
+class MenuBuilder(QObject):
+	"""
+	按声明式描述构建菜单栏
+
+	描述是顶级菜单的列表，每个菜单是 {"title": 标题, "items": [菜单项...]}，菜单项可以是：
+	- {"text", "slot", "shortcut", "icon", "checkable", "checked", "enabled", "id"}：普通菜单项，
+	  含义与 WindowMaker.add_menu_item() 的同名参数相同
+	- {"title", "items"}：子菜单；items 也可以是返回菜单项列表的函数，每次打开子菜单时
+	  重新调用，适合最近文件、插件菜单这类内容会变化的菜单
+	- 字符串：只有文本的菜单项，如最近文件列表里的路径
+	- None 或 "-"：分隔线
+
+	build() 只创建顶级菜单，菜单里的 QAction 和子菜单在该菜单第一次 aboutToShow 时才创建。
+	带快捷键的菜单项例外：构建时就创建并加到主窗口上，否则菜单没打开过快捷键不会生效；
+	函数形式的菜单要打开后才知道内容，其中的快捷键在打开过之后才生效。
+
+	id 相同、或文本/槽函数/快捷键/图标/可勾选都相同的菜单项共用一个 QAction，
+	勾选状态和启用状态也随之同步。函数形式的菜单里没有 id 的菜单项不共用，
+	每次打开都重新创建，随菜单清空一起销毁。
+	"""
+
+	SEPARATOR = "-"
+
+	def __init__(self, window, icon_cache, wrap_slot=None, on_error=None, parent=None):
 		super().__init__(parent)
-		self.initUI(title)
+		self.window = window
+		self.icon_cache = icon_cache
+		self.wrap_slot = wrap_slot
+		self.on_error = on_error
+		# 未填充的菜单 -> 菜单项列表或函数；函数形式的菜单填充后仍保留
+		self._pending = {}
+		self._actions = {}
+		# 为快捷键提前创建、还没有放进菜单的 QAction 的键，放进菜单时不算作复用
+		self._prebuilt = set()
+		self.menus = []
+		self.created = 0
+		self.shared = 0
+		self.populated = 0
+		self.populate_ms = 0.0
+		self.build_ms = 0.0
+		self.ready_ms = None
+
+	def build(self, spec):
+		"""
+		按描述添加顶级菜单
 
-	def initUI(self, title):
-		# 创建布局
-		self.layout = QVBoxLayout()
-		self.layout.setContentsMargins(0, 0, 0, 0)
-		self.setLayout(self.layout)
+		:param spec: 顶级菜单描述的列表
+		:return: 新添加的顶级菜单列表
+		"""
+		start = time.perf_counter()
+		menu_bar = self.window.menuBar()
+		menus = []
+		for entry in spec:
+			menu = menu_bar.addMenu(entry.get("title", ""))
+			self._defer(menu, entry.get("items", ()))
+			self._register_shortcuts(entry.get("items", ()))
+			menus.append(menu)
+		self.menus.extend(menus)
+		now = time.perf_counter()
+		self.build_ms += (now - start) * 1000
+		self.ready_ms = (now - _IMPORT_TIME) * 1000
+		return menus
+
+	def action(self, action_id):
+		"""
+		按 id 获取已创建的 QAction
 
-		# 创建折叠按钮
-		self.toggle_button = QPushButton(title)
-		self.toggle_button.setStyleSheet("text-align: left;")
-		self.toggle_button.clicked.connect(self.toggle_collapse)
-		self.layout.addWidget(self.toggle_button)
+		:param action_id: 菜单项描述中的 id
+		:return: QAction 对象，所在菜单还没打开过时返回None
+		"""
+		return self._actions.get(("id", action_id))
 
-		# 创建容器
-		self.content_area = QFrame()
-		self.content_area.setFrameShape(QFrame.NoFrame)
-		self.content_area.setContentsMargins(0, 0, 0, 0)
-		self.content_layout = QVBoxLayout(self.content_area)
-		self.content_layout.setContentsMargins(10, 0, 0, 0)
-		self.content_area.setVisible(False)
-		self.layout.addWidget(self.content_area)
+	def populate_all(self):
+		"""立即填充所有还没打开过的菜单，包括其中的子菜单"""
+		while True:
+			pending = [menu for menu, items in self._pending.items() if not callable(items)]
+			if not pending:
+				return
+			for menu in pending:
+				self._populate(menu)
+
+	def _defer(self, menu, items):
+		self._pending[menu] = items
+		menu.aboutToShow.connect(self._on_about_to_show)
+
+	def _register_shortcuts(self, items):
+		"""提前创建固定菜单里带快捷键的菜单项，使快捷键在菜单打开之前就生效"""
+		if callable(items):
+			return
+		for item in items:
+			if not isinstance(item, dict):
+				continue
+			if "items" in item:
+				self._register_shortcuts(item["items"])
+			elif item.get("shortcut"):
+				self._action(item, True, prebuild=True)
+
+	def _on_about_to_show(self):
+		menu = self.sender()
+		if menu in self._pending:
+			self._populate(menu)
+
+	def _populate(self, menu):
+		start = time.perf_counter()
+		items = self._pending[menu]
+		dynamic = callable(items)
+		try:
+			if dynamic:
+				# clear() 只移除子菜单的菜单项而不销毁子菜单，这里从待填充表里去掉后一并销毁
+				for child in menu.findChildren(QMenu):
+					self._pending.pop(child, None)
+					child.deleteLater()
+				menu.clear()
+				items = items()
+			else:
+				del self._pending[menu]
+				menu.aboutToShow.disconnect(self._on_about_to_show)
+			self._fill(menu, items, dynamic)
+		except Exception as e:
+			if self.on_error is not None:
+				self.on_error(f"填充菜单 '{menu.title()}' 时出错: {str(e)}")
+			else:
+				raise
+		finally:
+			self.populated += 1
+			self.populate_ms += (time.perf_counter() - start) * 1000
+
+	def _fill(self, menu, items, dynamic):
+		for item in items:
+			if item is None or item == self.SEPARATOR:
+				menu.addSeparator()
+				continue
+			if isinstance(item, str):
+				item = {"text": item}
+			elif not isinstance(item, dict):
+				self._error(f"无效的菜单项: {item!r}")
+				continue
+			if "items" in item:
+				self._defer(menu.addMenu(item.get("title", "")), item["items"])
+			else:
+				action = self._action(item, not dynamic or "id" in item, menu)
+				menu.addAction(action)
+
+	def _error(self, message):
+		"""报告描述中的错误后继续构建；没有 on_error 时抛出 ValueError"""
+		if self.on_error is None:
+			raise ValueError(message)
+		self.on_error(message)
+
+	def _action(self, item, share, owner=None, prebuild=False):
+		"""
+		创建菜单项对应的 QAction，share为True时相同的菜单项复用同一个
+
+		:param item: 菜单项描述
+		:param share: 是否查找和登记共用的 QAction
+		:param owner: 不共用时 QAction 的父对象
+		:param prebuild: 是否为快捷键提前创建，提前创建时找到已有的 QAction 不算作复用
+		"""
+		text = item.get("text", "")
+		key = None
+		if share:
+			if "id" in item:
+				key = ("id", item["id"])
+			else:
+				key = (text, item.get("slot"), item.get("shortcut"), item.get("icon"), bool(item.get("checkable")))
+			try:
+				action = self._actions.get(key)
+			except TypeError:
+				# 槽函数等不可哈希时不共用
+				key, action = None, None
+			if action is not None:
+				if key in self._prebuilt and not prebuild:
+					# 第一次放进菜单的是为快捷键提前创建的那个，不是复用
+					self._prebuilt.discard(key)
+				elif not prebuild:
+					self.shared += 1
+				return action
+
+		action = QAction(text, self.window if key is not None else owner)
+		slot = item.get("slot")
+		if slot is not None:
+			if callable(slot):
+				action.triggered.connect(self.wrap_slot(slot) if self.wrap_slot else slot)
+			else:
+				# 与 add_menu_item() 一致：报告错误，菜单项照常添加
+				self._error(f"菜单项 '{text}' 的slot参数必须是可调用对象")
+		shortcut = item.get("shortcut")
+		if shortcut:
+			action.setShortcut(QKeySequence(shortcut))
+			self.window.addAction(action)
+		icon_path = item.get("icon")
+		if icon_path:
+			icon = self.icon_cache.get(icon_path)
+			if icon is not None:
+				action.setIcon(icon)
+		if item.get("checkable"):
+			action.setCheckable(True)
+			action.setChecked(bool(item.get("checked", False)))
+		if not item.get("enabled", True):
+			action.setEnabled(False)
+		self.created += 1
+		if key is not None:
+			self._actions[key] = action
+			if prebuild:
+				self._prebuilt.add(key)
+		return action
+
+	def stats(self):
+		"""
+		获取统计信息
+
+		:return: menus（顶级菜单数）、populated（填充菜单的次数）、pending（还没打开过的菜单数）、
+			actions（创建的 QAction 数）、shared（复用已有 QAction 的次数）、
+			build_ms（build() 的总耗时）、ready_ms（菜单栏可用时距导入本模块的时间）、
+			populate_ms（打开菜单时填充的总耗时）、icons（图标缓存统计）
+		"""
+		return {
+			"menus": len(self.menus),
+			"populated": self.populated,
+			"pending": sum(not callable(items) for items in self._pending.values()),
+			"actions": self.created,
+			"shared": self.shared,
+			"build_ms": round(self.build_ms, 3),
+			"ready_ms": round(self.ready_ms, 3) if self.ready_ms is not None else None,
+			"populate_ms": round(self.populate_ms, 3),
+			"icons": self.icon_cache.stats(),
+		}
 
-	def add_widget(self, widget):
-		# 向容器中添加子控件
-		self.content_layout.addWidget(widget)
 
-	def toggle_collapse(self):
-		# 切换折叠状态
-		if self.content_area.isVisible():
-			self.content_area.setVisible(False)
-		else:
-			self.content_area.setVisible(True)
-	def get_content_layout(self):
-		return self.content_layout
 class WindowMaker:
 	"""简化PyQt5开发的辅助类"""
 
@@ -166,12 +3713,19 @@ class WindowMaker:
 		"warning": "background-color: #ff9800; color: white; border-radius: 4px;",
 	}
 
+	# 所有WindowMaker实例共享的样式编译器
+	style_compiler = StyleSheetCompiler()
+
+	# 共享样式模式下用于属性选择器的动态属性名
+	SHARED_STYLE_PROPERTY = "pqlStyle"
+
 	FEEDBACK_POPUP = "popup"
 	FEEDBACK_LOG = "log"
 	FEEDBACK_BOTH = "both"
 
 	def __init__(self, title="PyQt Window", icon=None, size=None, feedback_type=FEEDBACK_POPUP,
-				 log_file_path="error.log", fixedsize=None, CSS=None):
+				 log_file_path="error.log", fixedsize=None, CSS=None, log_level=logging.DEBUG,
+				 log_max_bytes=None, log_backup_count=3, log_when=None, async_logging=True, startup_cache=None):
 		"""
 		初始化WindowMaker实例
 
@@ -180,18 +3734,33 @@ class WindowMaker:
 		:param size: 窗口大小，元组形式(width, height)
 		:param feedback_type: 反馈类型，可选值为 "popup", "log", "both"
 		:param log_file_path: 日志文件路径
+		:param log_level: 日志级别；设为INFO及以上时DEBUG记录在创建前就被丢弃。
+			各实例共享同一个logger，级别只由第一个实例设置，之后通过 wm.logger.setLevel() 修改
+		:param log_max_bytes: 日志文件按大小轮转的字节数
+		:param log_backup_count: 轮转时保留的旧日志个数
+		:param log_when: 日志文件按时间轮转的周期，如 "midnight"
+		:param async_logging: 是否由后台线程写日志（只有进程内第一次初始化时生效）
+		:param startup_cache: 启动快照文件路径，为True时放在系统缓存目录；有可用快照时立即显示
+			上次的首帧截图，真实界面在 run() 中第一次绘制后替换它，见 StartupSnapshot
 		"""
 		# 初始化日志系统
-		self._init_logging(log_file_path)
+		self._init_logging(log_file_path, log_level, log_max_bytes, log_backup_count, log_when, async_logging)
+		# 之后的任何一步都可能报告错误，报告方式要先确定
+		self.feedback_type = feedback_type
+		self.log_file_path = log_file_path
 
 		try:
 			self.app = QApplication.instance()
 			if not self.app:
 				self.app = QApplication(sys.argv)
+
+			# 尽早显示上次的首帧截图，之后的构建在它后面进行
+			self.startup_snapshot = None
+			if startup_cache:
+				self._init_startup_snapshot(startup_cache, title, size, CSS)
+
 			self.main_window = QMainWindow()
 			self.menu_bar = None
-			self.feedback_type = feedback_type
-			self.log_file_path = log_file_path
 
 			# 设置窗口标题
 			self.main_window.setWindowTitle(title)
@@ -228,11 +3797,7 @@ class WindowMaker:
 			if fixedsize is not None:
 				self.main_window.setFixedSize(size[0], size[1])
 
-			final_style = ""
-
-			if CSS and isinstance(CSS, dict):
-				for key, value in CSS.items():
-					final_style += f"{key}: {value};"
+			final_style = self.style_compiler.compile(CSS).sheet
 
 			if final_style:
 				self.main_window.setStyleSheet(final_style)
@@ -252,52 +3817,140 @@ class WindowMaker:
 			# 定位模式
 			self.positioning_mode = self.POSITIONING_AUTO
 
+			# 手动定位的批量几何计算，调用 place_widgets() 或 get_placement() 后创建
+			self.placement = None
+
+			# 菜单图标按路径缓存；声明式菜单调用 build_menus() 或 get_menu_builder() 后创建
+			self.icon_cache = IconCache(on_missing=lambda path: self._handle_warning(f"图标文件不存在: {path}"))
+			self.menu_builder = None
+
+			# 共享样式模式：相同样式的控件共用中央部件上的一份样式表
+			self.share_styles = False
+			self._base_style = final_style
+			self._shared_style_rules = {}
+			self._shared_styles_dirty = False
+
+			# 事件循环性能分析器，调用 enable_profiler() 或 run(profile=True) 后创建
+			self.profiler = None
+
+			# 控件对象池，调用 use_widget_pool() 后开启
+			self.widget_pool = None
+			self._pooled_to_show = []
+
+			# 控件树内存检查器，调用 get_memory_inspector() 或 start_memory_monitor() 后创建
+			self.memory_inspector = None
+
+			# 主题文件管理，调用 load_theme() 或 get_theme_manager() 后创建
+			self.theme_manager = None
+
+			# 后台任务：线程池按需创建，进程池只在需要时才导入和创建
+			self._thread_pool = None
+			self._process_pool = None
+			self._background_tasks = set()
+
+			# save_file：按路径记录最新一次保存的序号；写入串行进行，不占用记录序号的锁
+			self._save_lock = threading.Lock()
+			self._write_lock = threading.Lock()
+			self._save_generations = {}
+			# add_file_view 创建的视图及其 page_size，保存同一文件前要先关闭它们的映射
+			self._file_views = {}
+
+			# asyncio 事件循环，在第一次使用协程时创建
+			self._asyncio_loop = None
+			self._asyncio_timer = None
+
+			# 合并高频更新的通道；必须在GUI线程创建，因为其他线程会向它提交更新
+			self._update_channel = UpdateCoalescer(16, self.main_window)
+
 			# 记录初始化成功
 			self.logger.info("WindowMaker 初始化成功")
 
 		except Exception as e:
 			self._handle_critical_error(f"初始化过程中发生严重错误: {str(e)}")
 
-	def _init_logging(self, log_file_path):
-		"""初始化日志系统"""
+	def _init_logging(self, log_file_path, log_level=logging.DEBUG, max_bytes=None, backup_count=3,
+					  when=None, async_logging=True):
+		"""初始化日志系统：处理器每个进程只创建一次，多个实例共享"""
 		self.logger = logging.getLogger("WindowMaker")
-		self.logger.setLevel(logging.DEBUG)
+		self._error_reporter = None
 
-		# 创建文件处理器
 		try:
-			file_handler = logging.FileHandler(log_file_path, encoding='utf-8')
-			file_handler.setLevel(logging.DEBUG)
+			_setup_shared_logging(self.logger, log_file_path, max_bytes, backup_count, when, async_logging,
+								  log_level)
+		except Exception as e:
+			print(f"无法初始化日志系统: {str(e)}")
 
-			# 创建控制台处理器
-			console_handler = logging.StreamHandler()
-			console_handler.setLevel(logging.INFO)
+	def _init_startup_snapshot(self, startup_cache, *key_parts):
+		"""创建启动快照并在命中时显示启动画面；构建脚本不是文件时不启用"""
+		try:
+			key = StartupSnapshot.default_key(*key_parts)
+			if key is None:
+				self.logger.info("构建脚本不是文件，不使用启动快照")
+				return
+			path = StartupSnapshot.default_path(key) if startup_cache is True else startup_cache
+			self.startup_snapshot = StartupSnapshot(path, key, self.run_in_background)
+			if self.startup_snapshot.show_cached():
+				self._debug("启动快照命中，首帧耗时 %.1f ms", self.startup_snapshot.stats["cached_frame_ms"])
+		except Exception as e:
+			self.startup_snapshot = None
+			self._handle_warning(f"读取启动快照时出错: {str(e)}")
 
-			# 创建格式化器
-			formatter = logging.Formatter(
-				'%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-				datefmt='%Y-%m-%d %H:%M:%S'
-			)
+	def get_startup_stats(self):
+		"""
+		获取启动耗时统计，均从导入本模块时开始计时
 
-			file_handler.setFormatter(formatter)
-			console_handler.setFormatter(formatter)
+		:return: cache_hit（是否命中快照）、cached_frame_ms（显示快照截图的时间）、
+			first_frame_ms（真实界面第一次绘制的时间）、saved（本次是否写入了快照）；
+			未启用启动快照时返回None
+		"""
+		return dict(self.startup_snapshot.stats) if self.startup_snapshot is not None else None
 
-			# 添加处理器
-			self.logger.addHandler(file_handler)
-			self.logger.addHandler(console_handler)
-		except Exception as e:
-			print(f"无法初始化日志系统: {str(e)}")
+	def _debug(self, message, *args):
+		"""
+		热路径上的DEBUG日志：DEBUG未启用时直接返回，不拼接也不格式化消息
+
+		:param message: %风格的格式字符串
+		:param args: 格式化参数
+		"""
+		if self.logger.isEnabledFor(logging.DEBUG):
+			self.logger.debug(message, *args)
+
+	def get_error_reporter(self):
+		"""
+		获取错误上报管线，第一次调用时创建
+
+		:return: ErrorReporter 对象
+		"""
+		if self._error_reporter is None:
+			self._error_reporter = ErrorReporter(self.logger, parent=self.main_window)
+			self._error_reporter.panel_created.connect(self._tag_window)
+		return self._error_reporter
+
+	@staticmethod
+	def _call_site():
+		"""找到pyQtAPI之外最近的调用位置，用于错误去重"""
+		frame = sys._getframe(1)
+		while frame is not None and frame.f_code.co_filename == __file__:
+			frame = frame.f_back
+		if frame is None:
+			return ""
+		return f"{os.path.basename(frame.f_code.co_filename)}:{frame.f_lineno}"
+
+	def _report(self, level, message):
+		notify = self.feedback_type in [self.FEEDBACK_POPUP, self.FEEDBACK_BOTH]
+		if not hasattr(self, "main_window"):
+			# QApplication尚未创建，只能写日志
+			self.logger.log(level, message)
+			return
+		self.get_error_reporter().report(level, message, self._call_site(), notify)
 
 	def _handle_warning(self, message):
-		"""处理警告信息"""
-		self.logger.warning(message)
-		if self.feedback_type in [self.FEEDBACK_POPUP, self.FEEDBACK_BOTH]:
-			self._show_error_dialog("警告", message, QMessageBox.Warning)
+		"""处理警告信息：去重、限流后写日志，并汇总到非模态面板"""
+		self._report(logging.WARNING, message)
 
 	def _handle_error(self, message):
-		"""处理错误信息"""
-		self.logger.error(message)
-		if self.feedback_type in [self.FEEDBACK_POPUP, self.FEEDBACK_BOTH]:
-			self._show_error_dialog("错误", message, QMessageBox.Critical)
+		"""处理错误信息：去重、限流后写日志，并汇总到非模态面板"""
+		self._report(logging.ERROR, message)
 		# 不退出，让程序继续运行
 
 	def _handle_critical_error(self, message):
@@ -318,6 +3971,7 @@ class WindowMaker:
 		"""显示错误对话框"""
 		try:
 			dialog = QDialog()
+			self._tag_window(dialog)
 			dialog.setWindowTitle(title)
 			dialog.resize(600, 400)
 
@@ -349,6 +4003,7 @@ class WindowMaker:
 		except Exception as e:
 			# 如果对话框创建失败，使用简单消息框
 			msg_box = QMessageBox()
+			self._tag_window(msg_box)
 			msg_box.setIcon(icon)
 			msg_box.setWindowTitle(title)
 			msg_box.setText(message)
@@ -367,10 +4022,292 @@ class WindowMaker:
 		"""
 		切换到手动定位模式
 
-		:return: 返回WindowMaker实例，支持链式调用
-		"""
-		self.positioning_mode = self.POSITIONING_MANUAL
-		return self
+		:return: 返回WindowMaker实例，支持链式调用
+		"""
+		self.positioning_mode = self.POSITIONING_MANUAL
+		return self
+
+	def get_placement(self):
+		"""
+		获取中央部件上的批量定位对象，第一次调用时创建
+
+		:return: PlacementEngine 对象
+		"""
+		if self.placement is None:
+			self.placement = PlacementEngine(self.central_widget)
+		return self.placement
+
+	def place_widgets(self, widgets, geometry=None, relative=None, anchor="nw"):
+		"""
+		手动定位模式下批量设置控件的位置和尺寸
+
+		所有控件在一次按列进行的计算中放好，只移动区域变化了的控件；使用了比例的控件在窗口缩放时自动重新计算，
+		参数含义与 tkinter 的 place() 相同，见 PlacementEngine.place()。
+
+		:param widgets: 控件列表
+		:param geometry: 像素偏移，每个控件一个 (x, y) 或 (x, y, w, h)，也可以是一维数组
+		:param relative: 中央部件尺寸的比例，每个控件一个 (relx, rely) 或 (relx, rely, relwidth, relheight)
+		:param anchor: 锚点，如 "nw"、"center"、"se"，或每个控件一个的列表
+		:return: 返回WindowMaker实例，支持链式调用
+		"""
+		try:
+			self.get_placement().place(widgets, geometry, relative, anchor)
+		except Exception as e:
+			self._handle_error(f"批量定位控件时出错: {str(e)}")
+		return self
+
+	def use_shared_styles(self, enabled=True):
+		"""
+		切换共享样式模式
+
+		开启后，add_* 方法不再给每个控件单独设置样式表，而是给控件打上样式编号，
+		再在中央部件上生成一份基于属性选择器的样式表，样式相同的控件只解析一次。
+
+		:param enabled: 是否开启
+		:return: 返回WindowMaker实例，支持链式调用
+		"""
+		self.share_styles = enabled
+		return self
+
+	def get_style_stats(self):
+		"""
+		获取样式编译缓存的命中统计
+
+		:return: 包含 hits/misses/size/max_size/hit_rate 的字典
+		"""
+		return self.style_compiler.stats()
+
+	def get_theme_manager(self):
+		"""
+		获取主题文件管理器，第一次调用时创建
+
+		:return: ThemeManager 对象
+		"""
+		if self.theme_manager is None:
+			self.theme_manager = ThemeManager(parent=self.main_window)
+			self.theme_manager.reload_failed.connect(self._handle_warning)
+			self.theme_manager.theme_changed.connect(self._on_theme_changed)
+		return self.theme_manager
+
+	def _tag_window(self, window):
+		"""新建的无父窗口的顶层窗口使用当前主题"""
+		theme_manager = getattr(self, "theme_manager", None)
+		if theme_manager is not None:
+			theme_manager.tag_window(window)
+
+	def _on_theme_changed(self, theme):
+		if theme.missing:
+			self._handle_warning(f"主题 {theme.name} 引用了未定义的变量: {', '.join(theme.missing)}")
+
+	def load_theme(self, path, variables=None, watch=None):
+		"""
+		从QSS/CSS文件加载主题，应用到整个应用程序
+
+		主题文件可用 @import 导入其他文件，用 $name: value; 定义变量、$name 引用变量。
+		各控件 css= 参数设置的样式优先于主题。
+
+		:param path: 主题文件路径
+		:param variables: 覆盖文件中定义的变量，如 {"primary": "#2196F3"}
+		:param watch: 是否在文件修改后自动重新加载；为None时保持之前的设置（初始不监视）
+		:return: 返回WindowMaker实例，支持链式调用
+		"""
+		try:
+			theme = self.get_theme_manager().apply(path, variables, watch)
+			self._debug("已加载主题 %s", theme.name)
+		except Exception as e:
+			self._handle_error(f"加载主题时出错: {str(e)}")
+		return self
+
+	def set_theme_variables(self, **variables):
+		"""
+		修改当前主题的变量并重新应用，如 set_theme_variables(primary="#2196F3")
+
+		:return: 返回WindowMaker实例，支持链式调用
+		"""
+		try:
+			if self.theme_manager is None or self.theme_manager.current is None:
+				self._handle_warning("尚未加载主题，无法设置主题变量")
+			else:
+				self.theme_manager.set_variables(**variables)
+		except Exception as e:
+			self._handle_error(f"设置主题变量时出错: {str(e)}")
+		return self
+
+	def use_widget_pool(self, enabled=True, max_per_key=64):
+		"""
+		切换控件对象池
+
+		开启后，通过 release_widget 回收的按钮、标签、输入框和复选框会被重置并停放，
+		之后 add_button/add_label/add_line_edit/add_checkbox 创建相同样式的控件时直接复用。
+
+		:param enabled: 是否开启；关闭时销毁所有停放的控件
+		:param max_per_key: 每种（类型, 样式）最多停放的控件数
+		:return: 返回WindowMaker实例，支持链式调用
+		"""
+		if enabled:
+			if self.widget_pool is None:
+				self.widget_pool = WidgetPool(max_per_key)
+			self.widget_pool.max_per_key = max_per_key
+		elif self.widget_pool is not None:
+			self.widget_pool.clear()
+			self.widget_pool = None
+		return self
+
+	def release_widget(self, widget, layout=None):
+		"""
+		移除控件：开启控件池时回收停放，否则销毁
+
+		:param widget: 要移除的控件
+		:param layout: 控件所在的布局，已知时传入可省去查找
+		:return: 返回WindowMaker实例，支持链式调用
+		"""
+		try:
+			if widget is None or sip.isdeleted(widget):
+				return self
+			if self.widget_pool is not None:
+				self.widget_pool.release(widget, layout)
+			else:
+				_remove_from_layout(widget, layout)
+				widget.hide()
+				widget.deleteLater()
+			return self
+		except Exception as e:
+			self._handle_error(f"移除控件时出错: {str(e)}")
+			return self
+
+	def get_widget_pool_stats(self):
+		"""
+		获取控件池统计
+
+		:return: 统计字典，见 WidgetPool.stats()；未开启控件池时返回None
+		"""
+		return self.widget_pool.stats() if self.widget_pool is not None else None
+
+	def get_memory_inspector(self, history=20):
+		"""
+		获取控件树内存检查器，第一次调用时创建
+
+		:param history: 保留最近多少次快照
+		:return: MemoryInspector 对象
+		"""
+		if self.memory_inspector is None:
+			self.memory_inspector = MemoryInspector(self, history, parent=self.main_window)
+			self.memory_inspector.growth_detected.connect(self._on_memory_growth)
+		return self.memory_inspector
+
+	def inspect_memory(self):
+		"""
+		生成一次内存快照并加入历史记录
+
+		:return: MemorySnapshot，包含各类型的对象数和估计字节数、图片、样式表及共享缓存的占用
+		"""
+		try:
+			return self.get_memory_inspector().snapshot()
+		except Exception as e:
+			self._handle_error(f"检查内存时出错: {str(e)}")
+			return None
+
+	def start_memory_monitor(self, interval_ms=60000, window=3):
+		"""
+		定期检查内存，某类对象在连续 window 次快照中数量都在增长时发出警告
+
+		:param interval_ms: 快照间隔（毫秒）
+		:param window: 连续增长多少次后警告
+		:return: 返回WindowMaker实例，支持链式调用
+		"""
+		try:
+			self.get_memory_inspector().start(interval_ms, window)
+		except Exception as e:
+			self._handle_error(f"开启内存监控时出错: {str(e)}")
+		return self
+
+	def stop_memory_monitor(self):
+		"""
+		停止定期内存检查，历史快照保留在 self.memory_inspector 中
+
+		:return: 返回WindowMaker实例，支持链式调用
+		"""
+		if self.memory_inspector is not None:
+			self.memory_inspector.stop()
+		return self
+
+	def _on_memory_growth(self, suspects):
+		details = "，".join(f"{name}: {' -> '.join(map(str, series))}" for name, series in suspects.items())
+		self._handle_warning(f"以下对象数量持续增长，可能存在泄漏: {details}")
+
+	def _create_widget(self, cls, parent, style):
+		"""创建控件并应用样式；开启控件池时优先复用同类型、同样式的停放控件"""
+		if self.widget_pool is None:
+			widget = cls(parent)
+			self._apply_style(widget, style)
+			return widget
+		key = (style.key, self.share_styles)
+		widget = self.widget_pool.acquire(cls, key)
+		if widget is not None:
+			self.widget_pool.hint_layout(widget, self.layout_stack[-1])
+			# 自动布局模式下由 addWidget 负责换父部件
+			if self.positioning_mode == self.POSITIONING_MANUAL and widget.parentWidget() is not parent:
+				widget.setParent(parent)
+			# 父部件可见时立即show()会让父布局在每次添加后都重新计算一遍，这里合并到下一轮事件循环；
+			# 清除“显式隐藏”标记，之后调用方自己 hide()/show() 时会重新设置，合并显示时跳过这些控件
+			widget.setAttribute(Qt.WA_WState_ExplicitShowHide, False)
+			if not self._pooled_to_show:
+				QTimer.singleShot(0, self._show_pooled_widgets)
+			self._pooled_to_show.append(widget)
+			return widget
+		widget = cls(parent)
+		self._apply_style(widget, style)
+		self.widget_pool.register(widget, key)
+		self.widget_pool.hint_layout(widget, self.layout_stack[-1])
+		return widget
+
+	def _connect(self, widget, signal, slot):
+		"""连接控件信号；开启控件池时由控件池记录，控件回收时断开"""
+		if self.widget_pool is not None:
+			self.widget_pool.connect(widget, signal, slot)
+		else:
+			signal.connect(slot)
+
+	def _show_pooled_widgets(self):
+		"""显示本轮事件循环中从控件池取出的控件"""
+		widgets, self._pooled_to_show = self._pooled_to_show, []
+		for widget in widgets:
+			if not sip.isdeleted(widget) and not widget.testAttribute(Qt.WA_WState_ExplicitShowHide):
+				widget.show()
+
+	def _apply_style(self, widget, style):
+		"""把编译好的样式应用到控件上"""
+		if not style.sheet:
+			return
+		if not self.share_styles:
+			widget.setStyleSheet(style.sheet)
+			return
+
+		class_id = self.style_compiler.class_id(style)
+		widget.setProperty(self.SHARED_STYLE_PROPERTY, class_id)
+		selector = widget.metaObject().className()
+		rule_key = (selector, class_id)
+		if rule_key not in self._shared_style_rules:
+			attr = f'{selector}[{self.SHARED_STYLE_PROPERTY}="{class_id}"]'
+			self._shared_style_rules[rule_key] = " ".join(
+				f"{attr}{pseudo} {{{decl}}}" for pseudo, decl in style.rules
+			)
+			if not self._shared_styles_dirty:
+				# 同一轮事件循环内的新样式合并为一次刷新
+				self._shared_styles_dirty = True
+				QTimer.singleShot(0, self._flush_shared_styles)
+
+	def _flush_shared_styles(self):
+		"""把共享样式规则一次性写到中央部件上"""
+		if not self._shared_styles_dirty:
+			return
+		self._shared_styles_dirty = False
+		parts = []
+		if self._base_style:
+			# 裸声明在Qt中等价于 * {...}
+			parts.append(f"* {{{self._base_style}}}")
+		parts.extend(self._shared_style_rules.values())
+		self.central_widget.setStyleSheet(" ".join(parts))
 
 	def get_menu_bar(self):
 		"""
@@ -390,14 +4327,7 @@ class WindowMaker:
 		:return: 返回新创建的菜单对象
 		"""
 		menu_bar = self.get_menu_bar()
-		final_style = ""
-		if hover_style is not None:
-			final_style += f":hover {{ {hover_style} }}"
-		if selected_style is not None:
-			final_style += f":selected {{ {selected_style} }}"
-		if CSS and isinstance(CSS, dict):
-			for key, value in CSS.items():
-				final_style += f"{key}: {value};"
+		final_style = self.style_compiler.compile(CSS, hover=hover_style, selected=selected_style).sheet
 		if final_style:
 			menu_bar.setStyleSheet(final_style)
 		return menu_bar.addMenu(title)
@@ -425,7 +4355,7 @@ class WindowMaker:
 				if not callable(slot):
 					self._handle_error(f"菜单项 '{text}' 的slot参数必须是可调用对象")
 				else:
-					action.triggered.connect(slot)
+					action.triggered.connect(self._wrap_slot(slot))
 
 			if shortcut:
 				try:
@@ -433,24 +4363,15 @@ class WindowMaker:
 				except:
 					self._handle_error(f"无效的快捷键: {shortcut}")
 
-			final_style = ""
-			if hover_style is not None:
-				final_style += f":hover {{ {hover_style} }}"
-			if selected_style is not None:
-				final_style += f":selected {{ {selected_style} }}"
-			if CSS and isinstance(CSS, dict):
-				for key, value in CSS.items():
-					final_style += f"{key}: {value};"
+			final_style = self.style_compiler.compile(CSS, hover=hover_style, selected=selected_style).sheet
 			if final_style:
 				menu.setStyleSheet(final_style)
 
 			if icon:
 				try:
-					abs_path = os.path.abspath(icon)
-					if os.path.exists(abs_path):
-						action.setIcon(QIcon(abs_path))
-					else:
-						self._handle_warning(f"图标文件不存在: {abs_path}")
+					cached_icon = self.icon_cache.get(icon)
+					if cached_icon is not None:
+						action.setIcon(cached_icon)
 				except Exception as e:
 					self._handle_error(f"设置菜单图标时出错: {str(e)}")
 
@@ -474,27 +4395,73 @@ class WindowMaker:
 		"""
 		return parent_menu.addMenu(title)
 
-	def row(self, parent=None, margin=None, spacing=None):
+	def get_menu_builder(self):
+		"""
+		获取声明式菜单构建器，第一次调用时创建
+
+		:return: MenuBuilder 对象
+		"""
+		if self.menu_builder is None:
+			self.get_menu_bar()
+			self.menu_builder = MenuBuilder(self.main_window, self.icon_cache, wrap_slot=self._wrap_slot,
+											on_error=self._handle_error, parent=self.main_window)
+		return self.menu_builder
+
+	def build_menus(self, spec):
+		"""
+		按声明式描述添加菜单
+
+		只创建顶级菜单，菜单项和子菜单在菜单第一次打开时才创建，描述格式见 MenuBuilder。
+		示例::
+
+			wm.build_menus([
+				{"title": "文件", "items": [
+					{"text": "打开", "slot": open_file, "shortcut": "Ctrl+O", "icon": "icons/open.png"},
+					{"title": "最近打开", "items": lambda: [{"text": path} for path in recent_files]},
+					"-",
+					{"text": "退出", "slot": wm.main_window.close},
+				]},
+			])
+
+		:param spec: 顶级菜单描述的列表
+		:return: 返回WindowMaker实例，支持链式调用
+		"""
+		try:
+			self.get_menu_builder().build(spec)
+		except Exception as e:
+			self._handle_error(f"构建菜单时出错: {str(e)}")
+		return self
+
+	def get_menu_stats(self):
+		"""
+		获取声明式菜单的统计，见 MenuBuilder.stats()
+
+		:return: 统计字典；没有使用 build_menus() 时返回None
+		"""
+		return self.menu_builder.stats() if self.menu_builder is not None else None
+
+	def row(self, parent=None, margin=None, spacing=None, flatten=False):
 		"""
 		开始一行（水平布局）
 
 		:param parent: 父部件，默认为中央部件
 		:param margin: 布局边距，元组形式(left, top, right, bottom)
 		:param spacing: 控件间距
+		:param flatten: 是否把这一行及其中嵌套的所有行/列编译成一个 QGridLayout，见 _begin_box
 		:return: 返回WindowMaker实例，支持链式调用
 		"""
 		try:
 			if parent is None:
 				parent = self.central_widget
 
-			layout = QHBoxLayout()
+			layout = self._begin_box(True, flatten)
 
 			# 设置布局边距
 			if margin:
 				# 验证margin参数
 				if not isinstance(margin, tuple) or len(margin) != 4:
 					self._handle_error("margin参数必须是包含4个整数的元组(left, top, right, bottom)")
-				else:
+				elif layout is not None:
 					left, top, right, bottom = margin
 					layout.setContentsMargins(left, top, right, bottom)
 
@@ -502,48 +4469,67 @@ class WindowMaker:
 			if spacing is not None:
 				if not isinstance(spacing, int):
 					self._handle_error("spacing参数必须是整数")
-				else:
+				elif layout is not None:
 					layout.setSpacing(spacing)
-
-			current_layout = self.layout_stack[-1]
-			current_layout.addLayout(layout)
-			self.layout_stack.append(layout)
 			return self
 		except Exception as e:
 			self._handle_error(f"创建水平布局时出错: {str(e)}")
 			return self
 
-	def column(self, parent=None, margin=None, spacing=None):
+	def column(self, parent=None, margin=None, spacing=None, flatten=False):
 		"""
 		开始一列（垂直布局）
 
 		:param parent: 父部件，默认为中央部件
 		:param margin: 布局边距，元组形式(left, top, right, bottom)
 		:param spacing: 控件间距
+		:param flatten: 是否把这一列及其中嵌套的所有行/列编译成一个 QGridLayout，见 _begin_box
 		:return: 返回WindowMaker实例，支持链式调用
 		"""
 		try:
 			if parent is None:
 				parent = self.central_widget
 
-			layout = QVBoxLayout()
+			layout = self._begin_box(False, flatten)
 
 			# 设置布局边距
-			if margin:
+			if margin and layout is not None:
 				left, top, right, bottom = margin
 				layout.setContentsMargins(left, top, right, bottom)
 
 			# 设置控件间距
-			if spacing is not None:
+			if spacing is not None and layout is not None:
 				layout.setSpacing(spacing)
-
-			current_layout = self.layout_stack[-1]
-			current_layout.addLayout(layout)
-			self.layout_stack.append(layout)
 			return self
 		except Exception as e:
 			self._handle_error(f"创建垂直布局时出错: {str(e)}")
 
+	def _begin_box(self, horizontal, flatten):
+		"""
+		新建行/列并压入布局栈，返回可设置边距和间距的Qt布局
+
+		flatten=True 时开始扁平化区域：区域内的行/列只记录结构，end() 结束区域时整棵树编译成
+		一个带跨行/跨列的 QGridLayout，缩放时只有这一个布局在C++中计算，而不是每层一个。
+		网格中同一行/列的控件共享行高和列宽，结果与嵌套布局不完全相同，适合规则的仪表盘；
+		区域内嵌套的行/列不单独设置边距和间距，拉伸系数作用于整行/整列。
+		区域内的行/列返回None。
+		"""
+		current_layout = self.layout_stack[-1]
+		if isinstance(current_layout, _GridBox):
+			box = _GridBox(horizontal)
+			current_layout.addLayout(box)
+			self.layout_stack.append(box)
+			return None
+		if flatten:
+			grid = QGridLayout()
+			current_layout.addLayout(grid)
+			self.layout_stack.append(_GridBox(horizontal, grid))
+			return grid
+		layout = QHBoxLayout() if horizontal else QVBoxLayout()
+		current_layout.addLayout(layout)
+		self.layout_stack.append(layout)
+		return layout
+
 	def end(self):
 		"""
 		结束当前行/列，返回上一级布局
@@ -551,9 +4537,123 @@ class WindowMaker:
 		:return: 返回WindowMaker实例，支持链式调用
 		"""
 		if len(self.layout_stack) > 1:
-			self.layout_stack.pop()
+			self._pop_layout()
 		return self
 
+	def _pop_layout(self):
+		"""弹出当前布局；扁平化区域的根节点在这里编译成网格"""
+		box = self.layout_stack.pop()
+		if isinstance(box, _GridBox) and box.grid is not None:
+			rows, columns = _grid_size(box)
+			if rows:
+				_compile_grid(box, box.grid, 0, 0, rows, columns)
+
+	@contextlib.contextmanager
+	def batch(self, stretch=0):
+		"""
+		批量构建上下文：在一个未挂载的容器中构建控件，结束时一次性挂到当前布局
+
+		构建期间暂停界面刷新，避免每次 addWidget 都触发重新布局和样式刷新。
+		耗时记录在 self.last_build_time（秒）中。
+
+		:param stretch: 容器在当前布局中的拉伸系数
+		:return: 上下文中返回容器部件
+		"""
+		start = time.perf_counter()
+		updates_enabled = self.central_widget.updatesEnabled()
+		self.central_widget.setUpdatesEnabled(False)
+
+		container = QWidget()
+		container.setUpdatesEnabled(False)
+		container_layout = QVBoxLayout(container)
+		container_layout.setContentsMargins(0, 0, 0, 0)
+
+		base_depth = len(self.layout_stack)
+		self.layout_stack.append(container_layout)
+		try:
+			yield container
+		finally:
+			# 结束未闭合的行/列，回到进入时的布局
+			while len(self.layout_stack) > base_depth:
+				self._pop_layout()
+			self._flush_shared_styles()
+			self.layout_stack[-1].addWidget(container, stretch)
+			container.setUpdatesEnabled(True)
+			self.central_widget.setUpdatesEnabled(updates_enabled)
+			self.last_build_time = time.perf_counter() - start
+			self.logger.info("批量构建完成，耗时 %.1f ms", self.last_build_time * 1000)
+
+	def build(self, spec, stretch=0):
+		"""
+		根据声明式描述一次性构建整个控件树
+
+		描述可以是字典或列表：
+		  {"type": "row", "spacing": 5, "children": [...]}
+		  {"type": "button", "id": "ok", "text": "确定", "command": on_ok}
+		type 为 row/column 时创建布局，其余类型对应 add_<type> 方法，
+		除 type/id/children 外的键都作为参数传给对应方法。
+
+		:param spec: 声明式描述
+		:param stretch: 构建结果在当前布局中的拉伸系数
+		:return: 以 id 为键的控件字典
+		"""
+		widgets = {}
+		with self.batch(stretch):
+			self._build_node(spec, widgets)
+		return widgets
+
+	def reactive(self, render, state=None, stretch=0):
+		"""
+		创建响应式界面
+
+		render(state) 返回与 build 相同格式的描述，节点可以额外带 key 用于在列表中识别自身。
+		之后调用 view.set_state(...) 修改状态，只有变化的控件会被更新、插入或删除。
+		用法：
+		  view = wm.reactive(lambda s: [{"type": "label", "id": "n", "text": f"计数 {s['n']}"}], {"n": 0})
+		  view.set_state(n=1)
+
+		:param render: 以状态字典为参数、返回界面描述的函数
+		:param state: 初始状态字典
+		:param stretch: 界面在当前布局中的拉伸系数
+		:return: ReactiveView对象，view.widgets 为以 id 为键的控件字典，
+			view.last_patch 为最近一次更新的统计
+		"""
+		try:
+			return ReactiveView(self, render, state).mount(stretch)
+		except Exception as e:
+			self._handle_error(f"创建响应式界面时出错: {str(e)}")
+			return None
+
+	def _build_node(self, node, widgets):
+		"""递归构建单个描述节点"""
+		if isinstance(node, (list, tuple)):
+			for child in node:
+				self._build_node(child, widgets)
+			return
+		if not isinstance(node, dict) or "type" not in node:
+			self._handle_error(f"无效的构建描述: {node}")
+			return
+
+		options = dict(node)
+		kind = options.pop("type")
+		name = options.pop("id", None)
+		options.pop("key", None)
+		children = options.pop("children", [])
+
+		if kind in ("row", "column"):
+			getattr(self, kind)(**options)
+			self._build_node(children, widgets)
+			self.end()
+			return
+
+		method = getattr(self, f"add_{kind}", None)
+		if method is None:
+			self._handle_error(f"未知的控件类型: {kind}")
+			return
+		widget = method(**options)
+		if name is not None:
+			widgets[name] = widget
+
 	def add_button(self, text, parent=None, command=None, shortcut=None,
 				   checkable=False, checked=False, style=None, css=None,
 				   position=None, size=None, min_size=None, max_size=None,
@@ -561,7 +4661,11 @@ class WindowMaker:
 		try:
 			if parent is None:
 				parent = self.central_widget
-			button = QPushButton(text, parent)
+			base_style = self.BUTTON_STYLES.get(style, "") if style else ""
+			button = self._create_widget(
+				QPushButton, parent, self.style_compiler.compile(css, "QPushButton", base_style)
+			)
+			button.setText(text)
 
 			# 设置按钮最小尺寸
 			if min_size:
@@ -582,37 +4686,11 @@ class WindowMaker:
 					button.setChecked(checked)
 
 			if command:
-				button.clicked.connect(command)
-
-			# 应用样式
-			normal_style = ""
-			hover_style = ""
-
-			if style and style in self.BUTTON_STYLES:
-				normal_style += self.BUTTON_STYLES[style]
-
-			if css and isinstance(css, dict):
-				for key, value in css.items():
-					if key.startswith("hover-"):
-						# 处理 :hover 样式
-						hover_key = key.replace("hover-", "")
-						hover_style += f"{hover_key}: {value};"
-					else:
-						normal_style += f"{key}: {value};"
-
-			final_style = f"QPushButton {{{normal_style}}}"
-			if hover_style:
-				final_style += f" QPushButton:hover {{{hover_style}}}"
-
-			if final_style:
-				button.setStyleSheet(final_style)
+				self._connect(button, button.clicked, self._wrap_slot(command))
 
 			# 根据定位模式处理位置和大小
 			if self.positioning_mode == self.POSITIONING_MANUAL:
-				if position:
-					button.move(position[0], position[1])
-				if size:
-					button.resize(size[0], size[1])
+				self._set_geometry(button, position, size)
 			else:
 				# 在自动布局中添加按钮
 				current_layout = self.layout_stack[-1]
@@ -625,13 +4703,28 @@ class WindowMaker:
 		except Exception as e:
 			self._handle_error(f"添加按钮时出错: {str(e)}")
 	
-	def add_collapsible_box(self, title, parent=None, css=None):
-		"""添加可折叠容器"""
+	def add_collapsible_box(self, title, parent=None, css=None, factory=None, unload_after=None,
+							animation_duration=0, on_frame=None):
+		"""
+		添加可折叠容器
+
+		:param title: 标题
+		:param css: css字典
+		:param factory: 内容工厂函数，参数为内容布局；传入时内容在第一次展开时才构建，出错时交给错误处理，下次展开重试
+		:param unload_after: 折叠多少秒后卸载内容以释放内存（需要factory），None表示不卸载
+		:param animation_duration: 展开/折叠动画时长（毫秒），0表示直接切换；
+			动画期间只移动内容截图，结束时才布局真实内容
+		:param on_frame: 动画每帧的回调，参数为帧间隔毫秒数，可用于检查是否维持60fps；
+			动画结束后也可以通过 box.animator.frame_stats() 获取统计
+		:return: 返回CollapsibleVBox对象
+		"""
 		try:
 			if parent is None:
 				parent = self.central_widget
 			
-			box = CollapsibleVBox(title, parent)
+			box = CollapsibleVBox(title, parent=parent, factory=factory, unload_after=unload_after,
+								  animation_duration=animation_duration, on_frame=on_frame,
+								  on_error=self._handle_error)
 			
 			# 应用样式
 			if css and isinstance(css, dict):
@@ -649,7 +4742,18 @@ class WindowMaker:
 			return None
 		
 	def add_img(self, img_path, parent=None, position=None, size=None, min_size=None,
-				max_size=None, stretch=0, alignment=None, auto_scale=True):
+				max_size=None, stretch=0, alignment=None, auto_scale=True,
+				async_load=True, decode_size=None):
+		"""
+		添加图片
+
+		:param img_path: 图片路径
+		:param auto_scale: 是否随控件大小自动缩放
+		:param async_load: 是否在线程池中解码图片，避免阻塞界面
+		:param decode_size: 解码时的最大尺寸(width, height)，大图会在解码时直接缩小；
+			默认取max_size，未指定max_size时取屏幕可用尺寸
+		:return: 返回图片标签对象
+		"""
 		try:
 			if parent is None:
 				parent = self.central_widget
@@ -659,15 +4763,18 @@ class WindowMaker:
 			else:
 				img = QLabel(self.central_widget)
 
-			# 加载图片但不立即设置（等待resizeEvent）
-			pixmap = QPixmap(img_path)
-			if pixmap.isNull():
-				self._handle_error(f"无法加载图片: {img_path}")
+			if async_load:
+				self._load_img_async(img, img_path, auto_scale, decode_size or max_size)
 			else:
-				if auto_scale:
-					img.original_pixmap = pixmap  # 保存但不立即设置
+				# 加载图片但不立即设置（等待resizeEvent）
+				pixmap = QPixmap(img_path)
+				if pixmap.isNull():
+					self._handle_error(f"无法加载图片: {img_path}")
 				else:
-					img.setPixmap(pixmap)
+					if auto_scale:
+						img.original_pixmap = pixmap  # 保存但不立即设置
+					else:
+						img.setPixmap(pixmap)
 
 			# 设置尺寸约束
 			if min_size:
@@ -681,8 +4788,7 @@ class WindowMaker:
 
 			# 布局处理
 			if self.positioning_mode == self.POSITIONING_MANUAL:
-				if position: img.move(*position)
-				if size: img.resize(*size)
+				self._set_geometry(img, position, size)
 			else:
 				current_layout = self.layout_stack[-1]
 				if alignment:
@@ -698,20 +4804,48 @@ class WindowMaker:
 		except Exception as e:
 			self._handle_error(f"加载图片时出错: {str(e)}")
 
+	def _load_img_async(self, img, img_path, auto_scale, decode_size=None):
+		"""在线程池中解码图片，完成后回到GUI线程设置到标签上"""
+		if decode_size is not None:
+			max_size = QSize(*decode_size)
+		else:
+			screen = self.app.primaryScreen()
+			max_size = screen.availableSize() if screen else None
+
+		task = _ImageDecodeTask(img_path, max_size)
+
+		def on_decoded(image):
+			if sip.isdeleted(img):
+				# 解码完成前标签已被销毁
+				return
+			if image.isNull():
+				self._handle_error(f"无法加载图片: {img_path}")
+				return
+			pixmap = QPixmap.fromImage(image)
+			if auto_scale:
+				img.original_pixmap = pixmap
+				img.rescale_pixmap()
+			else:
+				img.setPixmap(pixmap)
+
+		# 跨线程信号自动以排队方式回到GUI线程
+		signals = task.signals
+		signals.finished.connect(on_decoded)
+		img._decode_signals = signals
+
+		def disconnect():
+			with contextlib.suppress(TypeError, RuntimeError):
+				signals.finished.disconnect(on_decoded)
+		img.destroyed.connect(disconnect)
+		_get_image_decode_pool().start(task)
+
 	def add_label(self, text, parent=None, position=None, size=None, min_size=None,
 				  max_size=None, stretch=0, alignment=None, css=None):
 		try:
 			if parent is None:
 				parent = self.central_widget
-			label = QLabel(text, self.central_widget)
-			final_style = ""
-
-			if css and isinstance(css, dict):
-				for key, value in css.items():
-					final_style += f"{key}: {value};"
-
-			if final_style:
-				label.setStyleSheet(final_style)
+			label = self._create_widget(QLabel, self.central_widget, self.style_compiler.compile(css))
+			label.setText(text)
 			if min_size:
 				width, height = min_size
 				label.setMinimumSize(width, height)
@@ -719,10 +4853,7 @@ class WindowMaker:
 				width, height = max_size
 				label.setMaximumSize(width, height)
 			if self.positioning_mode == self.POSITIONING_MANUAL:
-				if position:
-					label.move(position[0], position[1])
-				if size:
-					label.resize(size[0], size[1])
+				self._set_geometry(label, position, size)
 			else:
 				# 在自动布局中添加按钮
 				current_layout = self.layout_stack[-1]
@@ -754,26 +4885,8 @@ class WindowMaker:
 		try:
 			if parent is None:
 				parent = self.central_widget
-			line = QLineEdit(text, self.central_widget)
-
-			normal_style = ""
-			hover_style = ""
-
-			if css and isinstance(css, dict):
-				for key, value in css.items():
-					if key.startswith("hover-"):
-						# 处理 :hover 样式
-						hover_key = key.replace("hover-", "")
-						hover_style += f"{hover_key}: {value};"
-					else:
-						normal_style += f"{key}: {value};"
-
-			final_style = f"QLineEdit {{{normal_style}}}"
-			if hover_style:
-				final_style += f" QLineEdit:hover {{{hover_style}}}"
-
-			if final_style:
-				line.setStyleSheet(final_style)
+			line = self._create_widget(QLineEdit, self.central_widget, self.style_compiler.compile(css, "QLineEdit"))
+			line.setText(text)
 
 			# 设置占位文本
 			if placeholder:
@@ -795,10 +4908,7 @@ class WindowMaker:
 
 			# 根据定位模式处理位置和大小
 			if self.positioning_mode == self.POSITIONING_MANUAL:
-				if position:
-					line.move(position[0], position[1])
-				if size:
-					line.resize(size[0], size[1])
+				self._set_geometry(line, position, size)
 			else:
 				# 在自动布局中添加输入框
 				current_layout = self.layout_stack[-1]
@@ -812,29 +4922,29 @@ class WindowMaker:
 			self._handle_error(f"添加单行输入框时出错: {str(e)}")
 
 	def add_text_edit(self, parent=None, text="", placeholder="", position=None, size=None, min_size=None,
-					  max_size=None, stretch=0, alignment=None, css=None):
+					  max_size=None, stretch=0, alignment=None, css=None, log_mode=False,
+					  max_blocks=10000, plain_text=True, flush_interval=50):
+		"""
+		添加多行输入框
+
+		:param log_mode: 日志模式：只读、按批追加，通过 edit.appender（StreamingTextAppender）写入
+		:param max_blocks: 日志模式下最多保留的行数，超出后丢弃最早的行；None表示不限制
+		:param plain_text: 日志模式下是否只使用纯文本（QPlainTextEdit），否则每行按HTML插入
+		:param flush_interval: 日志模式下两次批量插入之间的间隔（毫秒）
+		:return: 返回文本框对象
+		"""
 		try:
 			if parent is None:
 				parent = self.central_widget
-			edit = QTextEdit(text, self.central_widget)
-			normal_style = ""
-			hover_style = ""
-
-			if css and isinstance(css, dict):
-				for key, value in css.items():
-					if key.startswith("hover-"):
-						# 处理 :hover 样式
-						hover_key = key.replace("hover-", "")
-						hover_style += f"{hover_key}: {value};"
-					else:
-						normal_style += f"{key}: {value};"
-
-			final_style = f"QTextEdit {{{normal_style}}}"
-			if hover_style:
-				final_style += f" QTextEdit:hover {{{hover_style}}}"
-
-			if final_style:
-				edit.setStyleSheet(final_style)
+			if log_mode and plain_text:
+				edit = QPlainTextEdit(text, self.central_widget)
+				self._apply_style(edit, self.style_compiler.compile(css, "QPlainTextEdit"))
+			else:
+				edit = QTextEdit(text, self.central_widget)
+				self._apply_style(edit, self.style_compiler.compile(css, "QTextEdit"))
+			if log_mode:
+				edit.setReadOnly(True)
+				edit.appender = StreamingTextAppender(edit, max_blocks, flush_interval, plain_text)
 			if placeholder:
 				edit.setPlaceholderText(placeholder)
 			if min_size:
@@ -844,10 +4954,7 @@ class WindowMaker:
 				width, height = max_size
 				edit.setMaximumSize(width, height)
 			if self.positioning_mode == self.POSITIONING_MANUAL:
-				if position:
-					edit.move(position[0], position[1])
-				if size:
-					edit.resize(size[0], size[1])
+				self._set_geometry(edit, position, size)
 			else:
 				# 在自动布局中添加按钮
 				current_layout = self.layout_stack[-1]
@@ -859,6 +4966,52 @@ class WindowMaker:
 		except Exception as e:
 			self._handle_error(f"添加多行输入框时出错: {str(e)}")
 
+	def feed_text_edit(self, edit, source, follow=False):
+		"""
+		在后台把行数据送入日志模式的文本框
+
+		:param edit: add_text_edit(log_mode=True) 返回的文本框
+		:param source: 可迭代对象/生成器，或文件路径
+		:param follow: source为文件路径时，是否像 tail -f 一样持续读取新增内容
+		:return: 返回BackgroundTask任务句柄，调用 cancel() 停止读取
+		"""
+		appender = getattr(edit, "appender", None)
+		if appender is None:
+			self._handle_error("feed_text_edit 需要 add_text_edit(log_mode=True) 创建的文本框")
+			return None
+		return self.run_in_background(self._feed_lines, appender, source, follow, pass_task=True)
+
+	@staticmethod
+	def _feed_lines(task, appender, source, follow, batch_size=500):
+		"""后台线程：分批读取行并交给追加器"""
+		if isinstance(source, (str, os.PathLike)):
+			if not follow:
+				# 整块读取、解码后成批交给追加器
+				for batch in iter_line_chunks(source, stop_event=task._cancel_event):
+					appender.extend(batch)
+				return
+			# 持续读取时新行来得慢，逐行交给追加器，由追加器按帧合并
+			batch_size = 1
+			lines = tail_file(source, stop_event=task._cancel_event)
+		else:
+			lines = source
+
+		batch = []
+		try:
+			for line in lines:
+				if task.cancelled:
+					break
+				batch.append(line)
+				if len(batch) >= batch_size:
+					appender.extend(batch)
+					batch = []
+			if batch:
+				appender.extend(batch)
+		finally:
+			close = getattr(lines, "close", None)
+			if close is not None:
+				close()
+
 	def add_list_widget(self, parent=None, position=None, size=None, min_size=None,
 						max_size=None, stretch=0, alignment=None, css=None):
 		"""
@@ -888,21 +5041,11 @@ class WindowMaker:
 				list_widget.setMaximumSize(width, height)
 
 				# 应用样式
-				final_style = ""
-
-				if css and isinstance(css, dict):
-					for key, value in css.items():
-						final_style += f"{key}: {value};"
-
-				if final_style:
-					list_widget.setStyleSheet(final_style)
+				self._apply_style(list_widget, self.style_compiler.compile(css))
 
 			# 根据定位模式处理位置和大小
 			if self.positioning_mode == self.POSITIONING_MANUAL:
-				if position:
-					list_widget.move(position[0], position[1])
-				if size:
-					list_widget.resize(size[0], size[1])
+				self._set_geometry(list_widget, position, size)
 			else:
 				# 在自动布局中添加列表控件
 				current_layout = self.layout_stack[-1]
@@ -915,6 +5058,150 @@ class WindowMaker:
 		except Exception as e:
 			self._handle_error(f"添加列表控件时出错: {str(e)}")
 
+	def add_virtual_list(self, source=(), parent=None, formatter=str, page_size=1000,
+						 row_height=None, position=None, size=None, min_size=None,
+						 max_size=None, stretch=0, alignment=None, css=None):
+		"""
+		添加虚拟列表（QListView + VirtualListModel）
+
+		与 add_list_widget 不同，它不为每一行创建 QListWidgetItem，
+		只在行可见时才从数据源读取，适合几十万行的日志等数据。
+
+		:param source: 数据源，序列、NumPy数组或生成器
+		:param formatter: 把一行数据转换为显示文本的函数
+		:param page_size: 每次滚动到底部时追加读取的行数
+		:param row_height: 统一行高（像素），为None时使用默认行高
+		:return: 返回QListView对象，模型可通过 view.model() 获取
+		"""
+		try:
+			if parent is None:
+				parent = self.central_widget
+			view = QListView(self.central_widget)
+			view.setModel(VirtualListModel(source, formatter, page_size, row_height, view))
+			# 所有行高度一致，视图只需计算第一行的尺寸
+			view.setUniformItemSizes(True)
+
+			self._apply_style(view, self.style_compiler.compile(css))
+			self._place_widget(view, position, size, min_size, max_size, stretch, alignment)
+			return view
+		except Exception as e:
+			self._handle_error(f"添加虚拟列表时出错: {str(e)}")
+
+	def add_file_view(self, path, encoding="utf-8", parent=None, page_size=1000, row_height=None,
+					  position=None, size=None, min_size=None, max_size=None, stretch=0,
+					  alignment=None, css=None):
+		"""
+		添加大文本文件的只读行视图（内存映射 + 虚拟列表）
+
+		文件不读入内存，只有可见的行才被读取和解码；第一块索引完就能显示，
+		其余部分在后台建立行索引，行数随之增长。适合GB级的日志、CSV文件。
+
+		:param path: 文件路径
+		:param encoding: 文件编码
+		:param page_size: 每次滚动到底部时追加显示的行数
+		:param row_height: 统一行高（像素），为None时使用默认行高
+		:return: 返回QListView对象；view.file 为 MappedLineFile，view.index_task 为后台索引任务
+		"""
+		try:
+			view = self.add_virtual_list((), parent, page_size=page_size, row_height=row_height,
+										 position=position, size=size, min_size=min_size, max_size=max_size,
+										 stretch=stretch, alignment=alignment, css=css)
+			self._open_file_view(view, path, encoding, page_size)
+			self._file_views[view] = page_size
+			view.destroyed.connect(lambda: self._release_file_view(view))
+			return view
+		except Exception as e:
+			self._handle_error(f"添加文件视图时出错: {str(e)}")
+
+	def _open_file_view(self, view, path, encoding, page_size, rows=0):
+		"""映射文件并交给视图显示，未索引完的部分在后台继续索引；rows 为立即显示的最少行数"""
+		mapped = MappedLineFile(path, encoding)
+		if rows:
+			mapped.build_index(lines=rows)
+		model = view.model()
+		model.set_source(mapped)
+		while model.rowCount() < rows and model.canFetchMore(QModelIndex()):
+			model.fetchMore(QModelIndex())
+		view.file = mapped
+		view.index_task = None
+		if not mapped.indexed:
+			def fill(_):
+				# 只补足第一页，之后由视图滚动到底部时按页读取
+				if model.rowCount() < page_size:
+					model.refresh()
+
+			view.index_task = self.run_in_background(mapped.build_index, pass_task=True,
+													 on_progress=fill, on_done=fill)
+
+	def _close_file_view(self, view):
+		"""停止索引并关闭视图的文件映射，视图先换成空数据源"""
+		if view.index_task is not None:
+			view.index_task.cancel()
+		if not sip.isdeleted(view):
+			view.model().set_source(())
+		view.file.close()
+
+	def _release_file_view(self, view):
+		"""文件视图销毁时立即关闭映射，不等垃圾回收"""
+		self._file_views.pop(view, None)
+		self._close_file_view(view)
+
+	def add_virtual_table(self, source=(), headers=None, parent=None, formatter=str,
+						  page_size=1000, row_height=None, position=None, size=None,
+						  min_size=None, max_size=None, stretch=0, alignment=None, css=None):
+		"""
+		添加虚拟表格（QTableView + VirtualTableModel）
+
+		:param source: 数据源，每一项是一行（序列、二维NumPy数组或生成器）
+		:param headers: 列标题列表，为None时按第一行的长度决定列数
+		:param formatter: 把单元格数据转换为显示文本的函数
+		:param page_size: 每次滚动到底部时追加读取的行数
+		:param row_height: 统一行高（像素），为None时使用默认行高
+		:return: 返回QTableView对象，模型可通过 view.model() 获取
+		"""
+		try:
+			if parent is None:
+				parent = self.central_widget
+			view = QTableView(self.central_widget)
+			view.setModel(VirtualTableModel(source, headers, formatter, page_size, view))
+			# 固定行高，避免按内容逐行计算高度
+			vertical_header = view.verticalHeader()
+			vertical_header.setSectionResizeMode(QHeaderView.Fixed)
+			if row_height:
+				vertical_header.setDefaultSectionSize(row_height)
+
+			self._apply_style(view, self.style_compiler.compile(css))
+			self._place_widget(view, position, size, min_size, max_size, stretch, alignment)
+			return view
+		except Exception as e:
+			self._handle_error(f"添加虚拟表格时出错: {str(e)}")
+
+	def _place_widget(self, widget, position=None, size=None, min_size=None, max_size=None,
+					  stretch=0, alignment=None):
+		"""设置尺寸约束，并按定位模式放置控件"""
+		if min_size:
+			widget.setMinimumSize(*min_size)
+		if max_size:
+			widget.setMaximumSize(*max_size)
+		if self.positioning_mode == self.POSITIONING_MANUAL:
+			self._set_geometry(widget, position, size)
+		else:
+			current_layout = self.layout_stack[-1]
+			if alignment is not None:
+				current_layout.addWidget(widget, stretch, alignment)
+			else:
+				current_layout.addWidget(widget, stretch)
+
+	@staticmethod
+	def _set_geometry(widget, position, size):
+		"""手动定位模式下放置控件；同时给出位置和尺寸时只调用一次 setGeometry，只产生一组移动和缩放事件"""
+		if position and size:
+			widget.setGeometry(position[0], position[1], size[0], size[1])
+		elif position:
+			widget.move(position[0], position[1])
+		elif size:
+			widget.resize(size[0], size[1])
+
 	def add_box(self, parent=None, text="", size=None, min_size=None,
 				max_size=None, stretch=0, alignment=None, position=None,
 				editable=False):
@@ -935,10 +5222,7 @@ class WindowMaker:
 
 			# 根据定位模式处理位置和大小
 			if self.positioning_mode == self.POSITIONING_MANUAL:
-				if position:
-					box.move(position[0], position[1])
-				if size:
-					box.resize(size[0], size[1])
+				self._set_geometry(box, position, size)
 			else:
 				# 在自动布局中添加列表控件
 				current_layout = self.layout_stack[-1]
@@ -957,16 +5241,86 @@ class WindowMaker:
 				self._handle_error("parent必须是QComboBox实例，下拉选项创建失败")
 				return
 			if slot is None:
-				parent.addItem(text)
+				model = parent.model()
+				if isinstance(model, VirtualListModel):
+					# add_box_items 设置的延迟加载模型不支持 addItem，直接追加到模型；text 同样经过 formatter
+					model.append(text)
+					completer = parent.completer()
+					if isinstance(completer, PrefixCompleter):
+						completer.add_text(model.formatter(text))
+				else:
+					parent.addItem(text)
 				return
 			if slot and callable(slot):
-				parent.currentIndexChanged.connect(slot)
+				parent.currentIndexChanged.connect(self._wrap_slot(slot))
 			else:
 				self._handle_error(f"添加下拉选项 {str(text)} 时发现无效的函数: {str(slot)}")
 			return
 		except Exception as e:
 			self._handle_error(f"添加下拉选项时出错: {str(e)}")
 
+	def add_box_items(self, box, items, slot=None, formatter=str, page_size=1000,
+					  completer=None, max_results=50, case_sensitive=False):
+		"""
+		批量设置下拉框的选项
+
+		选项由延迟加载的模型提供，不逐个调用 addItem；下拉列表滚动到底部时才继续读取。
+		会替换下拉框中已有的选项；之后 add_box_item 添加的选项追加在末尾。
+
+		:param box: add_box 返回的下拉框
+		:param items: 选项，序列或生成器
+		:param slot: 当前项改变时调用的函数，参数为当前项下标
+		:param formatter: 把选项转换为显示文本的函数
+		:param page_size: 每次读取的选项数
+		:param completer: 是否添加前缀补全，默认在可编辑下拉框上添加；
+			补全需要所有选项的文本，生成器会被一次读完
+		:param max_results: 补全时最多显示的候选项数
+		:param case_sensitive: 补全是否区分大小写
+		:return: 返回下拉框，失败时返回None
+		"""
+		try:
+			if not isinstance(box, QComboBox):
+				self._handle_error("box必须是QComboBox实例，批量添加下拉选项失败")
+				return None
+			if completer is None:
+				completer = box.isEditable()
+			if completer and not (hasattr(items, "__len__") and hasattr(items, "__getitem__")):
+				items = list(items)
+
+			# 再次调用时替换上一次的模型和补全器：父对象是下拉框的旧模型由 setModel 删除，
+			# 旧补全器要断开输入信号并手动删除，否则会继续弹出过期的候选项
+			old_completer = box.completer()
+			if isinstance(old_completer, PrefixCompleter):
+				box.lineEdit().textEdited.disconnect(old_completer.update_prefix)
+				box.setCompleter(None)
+				old_completer.deleteLater()
+
+			model = VirtualListModel(items, formatter, page_size, parent=box)
+			box.setModel(model)
+			# 默认的 AdjustToContentsOnFirstShow 会在显示时遍历全部选项计算宽度
+			box.setSizeAdjustPolicy(QComboBox.AdjustToMinimumContentsLengthWithIcon)
+			box.setMinimumContentsLength(max(box.minimumContentsLength(), 10))
+			if isinstance(box.view(), QListView):
+				box.view().setUniformItemSizes(True)
+
+			if completer:
+				if not box.isEditable():
+					box.setEditable(True)
+				prefix_completer = PrefixCompleter([formatter(item) for item in items], box,
+												   max_results, case_sensitive)
+				box.setCompleter(prefix_completer)
+				box.lineEdit().textEdited.connect(prefix_completer.update_prefix)
+
+			if slot is not None:
+				if callable(slot):
+					box.currentIndexChanged.connect(self._wrap_slot(slot))
+				else:
+					self._handle_error(f"批量添加下拉选项时发现无效的函数: {str(slot)}")
+			return box
+		except Exception as e:
+			self._handle_error(f"批量添加下拉选项时出错: {str(e)}")
+			return None
+
 	def add_checkbox(self, parent, text="", checked=False, tristate=False,
 					 command=None, position=None, size=None,
 					 min_size=None, max_size=None, stretch=0, alignment=None):
@@ -988,7 +5342,8 @@ class WindowMaker:
 		try:
 			if parent is None:
 				parent = self.central_widget
-			checkbox = QCheckBox(text, parent)
+			checkbox = self._create_widget(QCheckBox, parent, self.style_compiler.compile(None))
+			checkbox.setText(text)
 
 			# 设置初始状态
 			checkbox.setChecked(checked)
@@ -1002,17 +5357,14 @@ class WindowMaker:
 
 			# 定位处理
 			if self.positioning_mode == self.POSITIONING_MANUAL:
-				if position:
-					checkbox.move(*position)
-				if size:
-					checkbox.resize(*size)
+				self._set_geometry(checkbox, position, size)
 			else:
 				current_layout = self.layout_stack[-1]
 				current_layout.addWidget(checkbox, stretch, alignment or Qt.AlignLeft)
 
 			# 绑定事件
 			if command and callable(command):
-				checkbox.stateChanged.connect(command)
+				self._connect(checkbox, checkbox.stateChanged, self._wrap_slot(command))
 
 			return checkbox
 		except Exception as e:
@@ -1062,10 +5414,7 @@ class WindowMaker:
 
 			# 定位处理
 			if self.positioning_mode == self.POSITIONING_MANUAL:
-				if position:
-					radio.move(*position)
-				if size:
-					radio.resize(*size)
+				self._set_geometry(radio, position, size)
 			else:
 				current_layout = self.layout_stack[-1]
 				current_layout.addWidget(radio, stretch, alignment or Qt.AlignLeft)
@@ -1075,13 +5424,61 @@ class WindowMaker:
 
 			# 绑定事件
 			if command and callable(command):
-				radio.toggled.connect(command)
+				radio.toggled.connect(self._wrap_slot(command))
 
 			return radio
 		except Exception as e:
 			self._handle_error(f"添加单选按钮时出错: {str(e)}")
 			return None
 
+	def add_radio_buttons(self, texts, group=None, checked=None, command=None,
+						  stretch=0, alignment=None):
+		"""
+		批量添加一组单选按钮
+
+		构建期间暂停界面刷新；按钮按顺序编号（0, 1, 2...），
+		command 只在按钮组上连接一次，而不是每个按钮连接一次。
+
+		:param texts: 按钮文本列表
+		:param group: 所属按钮组，为None时新建一个
+		:param checked: 初始选中按钮的序号
+		:param command: 选中项改变时调用的函数，参数为选中按钮的序号
+		:param stretch: 布局拉伸系数
+		:param alignment: 对齐方式
+		:return: 返回单选按钮列表，按钮组可通过 group 参数或 button.group() 获取
+		"""
+		try:
+			if group is None:
+				group = self.create_button_group()
+			updates_enabled = self.central_widget.updatesEnabled()
+			self.central_widget.setUpdatesEnabled(False)
+			try:
+				current_layout = self.layout_stack[-1]
+				alignment = alignment or Qt.AlignLeft
+				start = len(group.buttons())
+				radios = []
+				for offset, text in enumerate(texts):
+					radio = QRadioButton(text, self.central_widget)
+					if self.positioning_mode != self.POSITIONING_MANUAL:
+						current_layout.addWidget(radio, stretch, alignment)
+					group.addButton(radio, start + offset)
+					radios.append(radio)
+			finally:
+				self.central_widget.setUpdatesEnabled(updates_enabled)
+
+			if checked is not None and 0 <= checked < len(radios):
+				radios[checked].setChecked(True)
+
+			if command and callable(command):
+				slot = self._wrap_slot(command)
+				group.buttonToggled.connect(
+					lambda button, on: on and slot(group.id(button))
+				)
+			return radios
+		except Exception as e:
+			self._handle_error(f"批量添加单选按钮时出错: {str(e)}")
+			return None
+
 	def create_button_group(self):
 		"""创建按钮组（用于管理单选按钮的互斥性）"""
 		return QButtonGroup(self.central_widget)
@@ -1102,21 +5499,11 @@ class WindowMaker:
 			if max_size:
 				area.setMaximumSize(*max_size)
 
-			final_style = ""
-
-			if css and isinstance(css, dict):
-				for key, value in css.items():
-					final_style += f"{key}: {value};"
-
-			if final_style:
-				area.setStyleSheet(final_style)
+			self._apply_style(area, self.style_compiler.compile(css))
 
 			# 定位处理
 			if self.positioning_mode == self.POSITIONING_MANUAL:
-				if position:
-					area.move(*position)
-				if size:
-					area.resize(*size)
+				self._set_geometry(area, position, size)
 			else:
 				current_layout = self.layout_stack[-1]
 				current_layout.addWidget(area, stretch, alignment or Qt.AlignLeft)
@@ -1124,6 +5511,182 @@ class WindowMaker:
 		except Exception as e:
 			self._handle_error(f"创建滚动窗口时出错: {str(e)}")
 
+	def run_in_background(self, fn, *args, on_done=None, on_progress=None, on_error=None,
+						  progress_bar=None, use_process=False, pass_task=False, **kwargs):
+		"""
+		在后台执行耗时函数，避免阻塞界面
+
+		:param fn: 要执行的函数，以 fn(*args, **kwargs) 方式调用
+		:param on_done: 成功后在GUI线程调用的函数，参数为fn的返回值
+		:param on_progress: 进度变化时在GUI线程调用的函数，参数为0-100的整数
+		:param on_error: 出错时在GUI线程调用的函数，参数为错误堆栈字符串；默认交给错误处理
+		:param progress_bar: 由任务进度直接驱动的QProgressBar
+		:param use_process: 是否在进程池中执行（适合CPU密集任务，fn和参数必须可pickle）
+		:param pass_task: 是否把任务句柄作为第一个参数传给fn，用于报告进度和检查取消
+		:return: 返回BackgroundTask任务句柄，失败时返回None
+		"""
+		try:
+			if not callable(fn):
+				self._handle_error(f"后台任务必须是可调用对象: {str(fn)}")
+				return None
+			if use_process and pass_task:
+				self._handle_error("进程池任务不支持pass_task，任务句柄无法传入其他进程")
+				return None
+
+			task = BackgroundTask(fn, args, kwargs, pass_task)
+			if on_done:
+				task.finished.connect(on_done)
+			if on_progress:
+				task.progress.connect(on_progress)
+			if on_error:
+				task.failed.connect(on_error)
+			else:
+				task.failed.connect(lambda error: self._handle_error(f"后台任务出错: {error}"))
+			if progress_bar is not None:
+				task.progress.connect(progress_bar.setValue)
+				task.finished.connect(lambda _: progress_bar.setValue(progress_bar.maximum()))
+
+			self._background_tasks.add(task)
+			task.completed.connect(lambda: self._background_tasks.discard(task))
+
+			if use_process:
+				task._future = self._get_process_pool().submit(fn, *args, **kwargs)
+				task._future.add_done_callback(task._on_future_done)
+			else:
+				self._get_thread_pool().start(_TaskRunnable(task))
+			return task
+		except Exception as e:
+			self._handle_error(f"启动后台任务时出错: {str(e)}")
+			return None
+
+	def save_file(self, path, data, encoding="utf-8", on_done=None, on_error=None):
+		"""
+		在后台原子写入文件，写入过程中界面不卡顿，中途失败也不会留下写了一半的文件
+
+		对同一路径连续保存时，还没开始写入的旧内容会被跳过，最终文件总是最后一次保存的内容。
+
+		:param path: 文件路径
+		:param data: str 或 bytes
+		:param encoding: data为str时使用的编码
+		:param on_done: 写入完成后在GUI线程调用的函数，参数为写入的字节数（被跳过时为None）
+		:param on_error: 出错时在GUI线程调用的函数，参数为错误堆栈字符串；默认交给错误处理
+		:return: 返回BackgroundTask任务句柄
+		"""
+		path = os.path.abspath(path)
+		with self._save_lock:
+			generation = self._save_generations.get(path, 0) + 1
+			self._save_generations[path] = generation
+		# 正在显示该文件的视图在保存结束后重新映射新文件，并保持已显示的行数和滚动位置
+		views = {view: (view.model().rowCount(), view.verticalScrollBar().value())
+				 for view in self._file_views if os.path.abspath(view.file.path) == path}
+		if views:
+			if sys.platform == "win32":
+				# Windows 上映射着的文件不能被替换，先关闭映射
+				for view in views:
+					self._close_file_view(view)
+			on_done = self._reopen_after_save(views, on_done)
+			on_error = self._reopen_after_save(views, on_error or (
+				lambda error: self._handle_error(f"后台任务出错: {error}")))
+		return self.run_in_background(self._write_latest, path, data, encoding, generation,
+									  on_done=on_done, on_error=on_error)
+
+	def _reopen_after_save(self, views, callback):
+		"""
+		包装保存完成/出错的回调：先重新打开文件视图，再调用原回调
+
+		:param views: 视图 -> (保存前显示的行数, 滚动条位置)
+		"""
+		def reopen(result):
+			for view, (rows, position) in views.items():
+				if view not in self._file_views:
+					continue
+				mapped = view.file
+				if not mapped.closed:
+					self._close_file_view(view)
+				self._open_file_view(view, mapped.path, mapped.encoding, self._file_views[view], rows)
+				# 模型重置后视图的滚动范围要等布局完成才更新
+				view.doItemsLayout()
+				view.verticalScrollBar().setValue(position)
+			if callback is not None:
+				callback(result)
+		return reopen
+
+	def _write_latest(self, path, data, encoding, generation):
+		"""后台线程：只写入该路径最新一次保存的内容"""
+		with self._write_lock:
+			with self._save_lock:
+				if self._save_generations.get(path) != generation:
+					return None
+			return atomic_write(path, data, encoding)
+
+	def cancel_background_tasks(self):
+		"""
+		请求取消所有未完成的后台任务
+
+		:return: 返回WindowMaker实例，支持链式调用
+		"""
+		tasks = list(self._background_tasks)
+		for task in tasks:
+			task.cancel()
+		if self._thread_pool is not None:
+			self._thread_pool.clear()
+			# 被清出队列的任务不会执行，也就不会发出completed，需要在这里结束
+			for task in tasks:
+				if task._future is None:
+					task._drop()
+		return self
+
+	def set_background_workers(self, max_threads=None, max_processes=None):
+		"""
+		设置后台线程池/进程池的大小，需在第一次使用前调用才对进程池生效
+
+		:param max_threads: 最大线程数
+		:param max_processes: 最大进程数
+		:return: 返回WindowMaker实例，支持链式调用
+		"""
+		if max_threads is not None:
+			self._get_thread_pool().setMaxThreadCount(max(1, int(max_threads)))
+		if max_processes is not None:
+			self._max_processes = max(1, int(max_processes))
+		return self
+
+	def _get_thread_pool(self):
+		"""后台任务专用线程池（不与Qt内部使用的全局线程池混用）"""
+		if self._thread_pool is None:
+			self._thread_pool = QThreadPool()
+			self._thread_pool.setMaxThreadCount(max(2, QThread.idealThreadCount()))
+			self.app.aboutToQuit.connect(self.cancel_background_tasks)
+		return self._thread_pool
+
+	def _get_process_pool(self):
+		if self._process_pool is None:
+			from concurrent.futures import ProcessPoolExecutor
+			self._process_pool = ProcessPoolExecutor(getattr(self, "_max_processes", None))
+			self.app.aboutToQuit.connect(lambda: self._process_pool.shutdown(wait=False, cancel_futures=True))
+		return self._process_pool
+
+	def get_update_channel(self, interval=None):
+		"""
+		获取合并高频更新的通道
+
+		:param interval: 两次刷新之间的最短间隔（毫秒），默认16（约60帧）
+		:return: UpdateCoalescer 对象
+		"""
+		if interval is not None:
+			self._update_channel.set_interval(interval)
+		return self._update_channel
+
+	def post_update(self, widget, prop, value):
+		"""
+		提交一次合并更新，可在任意线程调用；同一控件同一属性在一帧内只写入最新值
+
+		例如 post_update(label, "text", "42")、post_update(status_bar, "showMessage", "就绪")
+
+		:return: 返回WindowMaker实例，支持链式调用
+		"""
+		self._update_channel.post(widget, prop, value)
+		return self
+
 	def get_status_bar(self):
 		"""
 		获取状态栏对象
@@ -1132,19 +5695,191 @@ class WindowMaker:
 		"""
 		return self.main_window.statusBar()
 
-	def run(self):
+	# 有协程在运行时asyncio事件循环的轮询间隔（毫秒），决定网络/文件IO就绪后的最大延迟
+	ASYNCIO_POLL_INTERVAL = 10
+
+	def get_event_loop(self):
+		"""
+		获取由Qt事件循环驱动的asyncio事件循环，第一次调用时创建
+
+		只在有协程运行时轮询，空闲时不占用CPU；直接用 loop.call_soon 等安排的回调
+		要等下一次轮询才执行，没有协程在运行时请改用 create_task / call_soon。
+
+		:return: asyncio事件循环
+		"""
+		if self._asyncio_loop is None:
+			import asyncio
+			self._asyncio_loop = asyncio.new_event_loop()
+			asyncio.set_event_loop(self._asyncio_loop)
+			self._asyncio_timer = QTimer()
+			self._asyncio_timer.setSingleShot(True)
+			self._asyncio_timer.timeout.connect(self._pump_asyncio)
+			self._asyncio_timer.start(0)
+			self.app.aboutToQuit.connect(self._close_event_loop)
+		return self._asyncio_loop
+
+	def create_task(self, coro):
+		"""
+		在asyncio事件循环中运行协程，协程中的异常交给错误处理
+
+		:param coro: 协程对象
+		:return: asyncio.Task 对象
+		"""
+		loop = self.get_event_loop()
+		task = loop.create_task(coro)
+		task.add_done_callback(self._on_async_task_done)
+		# 立即唤醒一次，避免等待轮询间隔；空闲时轮询已停止，也由这里重新开始
+		self._asyncio_timer.start(0)
+		return task
+
+	def call_soon(self, callback, *args):
+		"""
+		在asyncio事件循环中尽快调用函数，只能在GUI线程调用
+
+		:param callback: 要调用的函数
+		:param args: 传给函数的参数
+		:return: asyncio.Handle 对象，可用于取消
+		"""
+		handle = self.get_event_loop().call_soon(callback, *args)
+		self._asyncio_timer.start(0)
+		return handle
+
+	def _on_async_task_done(self, task):
+		if not task.cancelled() and task.exception() is not None:
+			error = task.exception()
+			self._handle_error(f"协程执行出错: {str(error)}")
+
+	def _pump_asyncio(self):
+		"""执行一轮asyncio事件循环，还有协程未完成时按轮询间隔再次唤醒，否则停止轮询"""
+		loop = self._asyncio_loop
+		if loop is None or loop.is_closed():
+			return
+		import asyncio
+		loop.call_soon(loop.stop)
+		loop.run_forever()
+		if not asyncio.all_tasks(loop):
+			# 刚结束的任务的完成回调排在下一轮，再执行一轮后才能停止
+			loop.call_soon(loop.stop)
+			loop.run_forever()
+			if not asyncio.all_tasks(loop):
+				return
+		self._asyncio_timer.start(self.ASYNCIO_POLL_INTERVAL)
+
+	def _close_event_loop(self):
+		loop = self._asyncio_loop
+		if loop is None or loop.is_closed():
+			return
+		import asyncio
+		self._asyncio_timer.stop()
+		pending = asyncio.all_tasks(loop)
+		for task in pending:
+			task.cancel()
+		if pending:
+			loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+		loop.close()
+
+	def _wrap_slot(self, slot, profile=True):
+		"""
+		包装通过 command=/slot= 连接的回调
+
+		async def 协程函数包装为在asyncio事件循环中执行；profile为True时再包一层，
+		开启性能分析器后记录每次调用的耗时，未开启时只多一次函数调用。
+		"""
+		# 与PyQt对普通槽函数的处理一致：信号参数多于槽函数参数时丢弃多余的
+		max_args = _positional_arity(slot)
+		if max_args == _UNKNOWN_ARITY:
+			# 内置方法（如 widget.close）原样连接，由PyQt按C++槽函数的签名匹配参数，不记录耗时
+			return slot
+
+		if inspect.iscoroutinefunction(slot):
+			def target(*args):
+				if max_args is not None:
+					args = args[:max_args]
+				self.create_task(slot(*args))
+		else:
+			target = slot
+		if not profile:
+			return target
+
+		name = _slot_name(slot)
+
+		def profiled(*args):
+			if max_args is not None:
+				args = args[:max_args]
+			profiler = self.profiler
+			if profiler is None or not profiler.running:
+				return target(*args)
+			return profiler.time_slot(name, target, args)
+		return profiled
+
+	def enable_profiler(self, heartbeat_ms=10, stall_threshold_ms=50, max_events=100000):
 		"""
-		:return: 应用程序退出代码
+		开启事件循环性能分析
+
+		记录每个 command=/slot= 回调的耗时分布、事件循环卡顿以及重绘和布局耗时。
+		开启前连接的回调同样会被记录。
+
+		:param heartbeat_ms: 心跳间隔（毫秒）
+		:param stall_threshold_ms: 心跳晚到超过多少毫秒记为卡顿
+		:param max_events: trace中最多保留的事件数，超出时丢弃最早的
+		:return: EventLoopProfiler对象，可调用 stats() 和 dump_trace(path)
+		"""
+		try:
+			if self.profiler is None:
+				self.profiler = EventLoopProfiler(heartbeat_ms, stall_threshold_ms, max_events, self.main_window)
+			self.profiler.start()
+			return self.profiler
+		except Exception as e:
+			self._handle_error(f"开启性能分析时出错: {str(e)}")
+			return None
+
+	def disable_profiler(self):
+		"""
+		停止性能分析，已记录的数据保留在 self.profiler 中
+
+		:return: 返回WindowMaker实例，支持链式调用
+		"""
+		if self.profiler is not None:
+			self.profiler.stop()
+		return self
+
+	def run(self, use_asyncio=False, profile=False, trace_path=None):
+		"""
+		:param use_asyncio: 是否同时运行asyncio事件循环，使 command=/slot= 可以是 async def 协程
+		:param profile: 是否开启事件循环性能分析，见 enable_profiler
+		:param trace_path: 开启性能分析时，退出后把 Chrome trace-event JSON 写到该路径
+		:return: 不返回，事件循环结束后以应用程序的退出代码调用 sys.exit
 		"""
 		try:
 			self.logger.info("启动应用程序")
+			if use_asyncio:
+				self.get_event_loop()
+			if profile:
+				self.enable_profiler()
+			if self.startup_snapshot is not None:
+				self.startup_snapshot.attach(self.main_window)
 			self.main_window.show()
 			return_code = self.app.exec_()
+			if profile:
+				self._finish_profiling(trace_path)
 			self.logger.info(f"应用程序退出，返回代码: {return_code}")
 			sys.exit(return_code)
 		except Exception as e:
 			self._handle_critical_error(f"运行应用程序时出错: {str(e)}")
 
+	def _finish_profiling(self, trace_path=None):
+		"""停止性能分析，记录最慢的槽函数，按需导出trace"""
+		self.disable_profiler()
+		stats = self.profiler.stats()
+		slowest = sorted(stats["slots"].items(), key=lambda item: item[1]["max_ms"], reverse=True)[:5]
+		for name, summary in slowest:
+			self.logger.info("槽函数 %s: %d 次，平均 %.2f ms，最长 %.2f ms",
+							 name, summary["count"], summary["mean_ms"], summary["max_ms"])
+		self.logger.info("事件循环卡顿 %d 次，最长 %.1f ms", stats["stalls"]["count"], stats["stalls"]["max_ms"])
+		if trace_path:
+			self.profiler.dump_trace(trace_path)
+			self.logger.info("性能分析trace已写入 %s", trace_path)
+
 	def __show_fake_bsod(self, path=0, more=0):
 		"""
 
@@ -1163,6 +5898,11 @@ class WindowMaker:
 		else:
 			self.logger.info("警告：怀疑线程过多，线程不应多余max(1000,CPU核数*2)")
 		"""显示蓝屏窗口"""
-		bsod = BSODWindow()
+		bsod_module = _load_subsystem("bsod")
+		if bsod_module is None:
+			self._handle_warning(f"蓝屏窗口仅支持Windows平台，当前平台: {sys.platform}")
+			return None
+		bsod = bsod_module.BSODWindow()
 		bsod.show()
+		return bsod
 
@@ -0,0 +1,19 @@
+import os
+import sys
+import logging
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pyQtAPI import WindowMaker
+
+
+@pytest.fixture
+def wm():
+	maker = WindowMaker(feedback_type=WindowMaker.FEEDBACK_LOG, log_file_path=os.devnull)
+	maker.logger.setLevel(logging.WARNING)
+	yield maker
+	maker.main_window.close()
+	maker.main_window.deleteLater()
@@ -0,0 +1,64 @@
+import time
+import asyncio
+
+
+def _wait(wm, condition, timeout=5):
+	deadline = time.monotonic() + timeout
+	while not condition() and time.monotonic() < deadline:
+		wm.app.processEvents()
+		time.sleep(0.005)
+	return condition()
+
+
+def test_async_command_runs_as_task(wm):
+	calls = []
+
+	async def on_click(checked):
+		await asyncio.sleep(0.01)
+		calls.append(checked)
+
+	button = wm.add_button("加载", command=on_click)
+	button.click()
+	assert calls == []
+	assert _wait(wm, lambda: calls)
+	assert calls == [False]
+
+
+def test_create_task_returns_result(wm):
+	async def compute():
+		await asyncio.sleep(0)
+		return 42
+
+	task = wm.create_task(compute())
+	assert _wait(wm, task.done)
+	assert task.result() == 42
+
+
+def test_coroutine_error_is_reported(wm):
+	errors = []
+	wm._handle_error = errors.append
+
+	async def fail():
+		raise ValueError("boom")
+
+	task = wm.create_task(fail())
+	assert _wait(wm, lambda: errors)
+	assert task.done() and "boom" in errors[0]
+
+
+def test_polling_stops_when_idle(wm):
+	async def compute():
+		await asyncio.sleep(0.01)
+
+	task = wm.create_task(compute())
+	assert wm._asyncio_timer.isActive()
+	assert _wait(wm, task.done)
+	assert _wait(wm, lambda: not wm._asyncio_timer.isActive())
+
+
+def test_call_soon_wakes_idle_loop(wm):
+	calls = []
+	wm.get_event_loop()
+	assert _wait(wm, lambda: not wm._asyncio_timer.isActive())
+	wm.call_soon(calls.append, 1)
+	assert _wait(wm, lambda: calls == [1])
@@ -0,0 +1,63 @@
+import time
+
+
+def _wait(wm, condition, timeout=5):
+	deadline = time.monotonic() + timeout
+	while not condition() and time.monotonic() < deadline:
+		wm.app.processEvents()
+		time.sleep(0.005)
+	return condition()
+
+
+def test_progress_and_result(wm):
+	progress, results = [], []
+
+	def work(task, count):
+		for index in range(count):
+			task.report_progress((index + 1) * 100 // count)
+		return count * 2
+
+	task = wm.run_in_background(work, 4, pass_task=True, on_progress=progress.append, on_done=results.append)
+	assert _wait(wm, lambda: results)
+	assert results == [8]
+	assert progress == [25, 50, 75, 100]
+	assert task.done
+
+
+def test_cancel_suppresses_result(wm):
+	results = []
+
+	def work(task):
+		while not task.cancelled:
+			time.sleep(0.001)
+		return "late"
+
+	task = wm.run_in_background(work, pass_task=True, on_done=results.append)
+	task.cancel()
+	assert _wait(wm, lambda: task.done)
+	wm.app.processEvents()
+	assert results == []
+	assert task not in wm._background_tasks
+
+
+def test_process_pool_result(wm):
+	results = []
+	wm.run_in_background(pow, 2, 10, use_process=True, on_done=results.append)
+	assert _wait(wm, lambda: results, timeout=30)
+	assert results == [1024]
+
+
+def test_cancel_completes_queued_tasks(wm):
+	import threading
+	wm.set_background_workers(max_threads=1)
+	release = threading.Event()
+	running = wm.run_in_background(release.wait, 5)
+	queued = wm.run_in_background(lambda: None)
+	completed = []
+	queued.completed.connect(lambda: completed.append(True))
+	wm.cancel_background_tasks()
+	assert queued.done and queued.cancelled
+	release.set()
+	assert _wait(wm, lambda: running.done and completed)
+	assert completed == [True]
+	assert _wait(wm, lambda: not wm._background_tasks)
@@ -0,0 +1,25 @@
+def test_batch_attaches_once(wm):
+	before = wm.main_layout.count()
+	with wm.batch() as container:
+		label = wm.add_label("a")
+		wm.row()
+		button = wm.add_button("b")
+		wm.end()
+		assert wm.main_layout.count() == before
+		assert not container.isVisibleTo(wm.main_window)
+	assert wm.main_layout.count() == before + 1
+	assert wm.main_layout.itemAt(before).widget() is container
+	assert label.parentWidget() is container and button.parentWidget() is container
+	assert wm.last_build_time > 0
+
+
+def test_build_returns_widgets_by_id(wm):
+	widgets = wm.build({"type": "column", "children": [
+		{"type": "label", "id": "title", "text": "标题"},
+		{"type": "row", "children": [{"type": "button", "id": "ok", "text": "确定"}]},
+	]})
+	assert set(widgets) == {"title", "ok"}
+	assert widgets["title"].text() == "标题"
+	container = wm.main_layout.itemAt(wm.main_layout.count() - 1).widget()
+	assert widgets["ok"].parentWidget() is container
+	assert wm.last_build_time > 0
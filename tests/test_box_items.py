@@ -0,0 +1,45 @@
+from PyQt5.QtCore import QModelIndex, QEvent
+
+
+def test_add_box_item_after_bulk_items(wm):
+	box = wm.add_box()
+	items = ["a", "b"]
+	wm.add_box_items(box, items)
+	wm.add_box_item(box, text="c")
+	assert [box.itemText(index) for index in range(box.count())] == ["a", "b", "c"]
+	assert items == ["a", "b"]
+
+
+def test_add_box_item_after_paged_generator(wm):
+	box = wm.add_box()
+	wm.add_box_items(box, (f"item {index}" for index in range(30)), page_size=10)
+	wm.add_box_item(box, text="last")
+	model = box.model()
+	while model.canFetchMore(QModelIndex()):
+		model.fetchMore(QModelIndex())
+	assert box.count() == 31
+	assert box.itemText(30) == "last"
+
+
+def test_appended_item_is_completed(wm):
+	box = wm.add_box(editable=True)
+	wm.add_box_items(box, ["apple", "banana"])
+	wm.add_box_item(box, text="cherry")
+	completer = box.completer()
+	completer.update_prefix("ch")
+	assert completer.index.search("ch") == [2]
+
+
+def test_add_box_items_twice_replaces_model_and_completer(wm):
+	from PyQt5 import sip
+	box = wm.add_box(editable=True)
+	wm.add_box_items(box, ["apple", "avocado"])
+	old_model, old_completer = box.model(), box.completer()
+	wm.add_box_items(box, ["banana", "blueberry"])
+	wm.app.sendPostedEvents(None, QEvent.DeferredDelete)
+
+	assert sip.isdeleted(old_model)
+	assert sip.isdeleted(old_completer)
+	assert [box.itemText(index) for index in range(box.count())] == ["banana", "blueberry"]
+	box.lineEdit().textEdited.emit("b")
+	assert box.completer()._rows == [0, 1]
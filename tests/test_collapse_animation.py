@@ -0,0 +1,34 @@
+import time
+
+from PyQt5.QtWidgets import QLabel
+
+
+def _wait_idle(wm, animator, timeout=5):
+	deadline = time.monotonic() + timeout
+	while animator.is_running() and time.monotonic() < deadline:
+		wm.app.processEvents()
+		time.sleep(0.005)
+	wm.app.processEvents()
+	return not animator.is_running()
+
+
+def test_toggle_animation_end_state(wm):
+	box = wm.add_collapsible_box("区域", animation_duration=60)
+	box.content_layout.addWidget(QLabel("内容"))
+	wm.main_window.show()
+	wm.app.processEvents()
+	animator = box.animator
+	assert not animator.is_expanded()
+
+	box.toggle()
+	assert animator.is_running() and animator.is_expanded()
+	assert _wait_idle(wm, animator)
+	assert box.content_area.isVisible()
+	assert animator._placeholder.isHidden()
+	assert animator.frame_times
+
+	box.toggle()
+	assert not animator.is_expanded()
+	assert _wait_idle(wm, animator)
+	assert box.content_area.isHidden()
+	assert animator._placeholder.isHidden()
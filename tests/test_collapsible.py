@@ -0,0 +1,26 @@
+from PyQt5.QtWidgets import QLabel
+
+
+def test_failed_factory_is_reported_and_retried(wm):
+	calls = []
+	errors = []
+	wm._handle_error = errors.append
+
+	def factory(layout):
+		calls.append(1)
+		layout.addWidget(QLabel("partial"))
+		if len(calls) == 1:
+			raise RuntimeError("boom")
+		return QLabel("ok")
+
+	box = wm.add_collapsible_box("section", factory=factory)
+	box.toggle()
+	assert errors and "boom" in errors[0]
+	assert not box.lazy_content.materialized
+
+	box.toggle()
+	box.toggle()
+	assert len(calls) == 2
+	assert box.lazy_content.materialized
+	labels = [box.content_layout.itemAt(index).widget().text() for index in range(box.content_layout.count())]
+	assert labels == ["partial", "ok"]
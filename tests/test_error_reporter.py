@@ -0,0 +1,22 @@
+import time
+import logging
+
+from PyQt5.QtCore import QTimer, QEventLoop
+
+from pyQtAPI import ErrorReporter
+
+
+def test_panel_refreshes_while_errors_keep_arriving(wm):
+	reporter = ErrorReporter(wm.logger, refresh_interval=200)
+	timer = QTimer()
+	timer.setInterval(50)
+	timer.timeout.connect(lambda: reporter.report(logging.ERROR, "持续出错", "app.py:1"))
+	timer.start()
+	loop = QEventLoop()
+	QTimer.singleShot(1000, loop.quit)
+	start = time.monotonic()
+	loop.exec_()
+	timer.stop()
+	assert time.monotonic() - start >= 1.0
+	assert reporter._panel is not None and reporter._panel.isVisible()
+	reporter._panel.close()
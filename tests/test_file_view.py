@@ -0,0 +1,71 @@
+import sys
+import time
+
+from PyQt5.QtCore import QEvent, QModelIndex
+
+from pyQtAPI import MappedLineFile
+
+
+def _wait(wm, condition, timeout=5):
+	deadline = time.monotonic() + timeout
+	while not condition() and time.monotonic() < deadline:
+		wm.app.processEvents()
+		time.sleep(0.01)
+	return condition()
+
+
+def test_context_manager_closes_mapping(tmp_path):
+	path = tmp_path / "lines.txt"
+	path.write_text("".join(f"line {index}\n" for index in range(100)))
+	with MappedLineFile(str(path)) as mapped:
+		mapped.build_index()
+		assert mapped[99] == "line 99"
+	assert mapped.closed
+	assert len(mapped) == 0
+	mapped.close()
+
+
+def test_view_reopens_file_after_save(wm, tmp_path):
+	path = tmp_path / "lines.txt"
+	path.write_text("".join(f"old {index}\n" for index in range(10)))
+	view = wm.add_file_view(str(path))
+	old = view.file
+	saved = []
+	wm.save_file(str(path), "".join(f"new {index}\n" for index in range(20)), on_done=saved.append)
+	assert old.closed == (sys.platform == "win32")
+	assert _wait(wm, lambda: saved)
+	assert old.closed
+	assert view.file is not old and not view.file.closed
+	assert _wait(wm, lambda: view.model().rowCount() == 20)
+	assert view.model().index(0).data() == "new 0"
+
+
+def test_save_keeps_scroll_position(wm, tmp_path):
+	path = tmp_path / "lines.txt"
+	path.write_text("".join(f"old {index}\n" for index in range(5000)))
+	view = wm.add_file_view(str(path), page_size=100)
+	view.resize(200, 200)
+	view.show()
+	while view.model().rowCount() < 2000:
+		view.model().fetchMore(QModelIndex())
+	view.doItemsLayout()
+	scrollbar = view.verticalScrollBar()
+	scrollbar.setValue(scrollbar.maximum() // 2)
+	position = scrollbar.value()
+	assert position > 0
+	saved = []
+	wm.save_file(str(path), "".join(f"new {index}\n" for index in range(5000)), on_done=saved.append)
+	assert _wait(wm, lambda: saved)
+	assert view.model().rowCount() >= 2000
+	assert scrollbar.value() == position
+	assert view.model().index(0).data() == "new 0"
+
+
+def test_destroyed_view_closes_file(wm, tmp_path):
+	path = tmp_path / "lines.txt"
+	path.write_text("line\n" * 10)
+	view = wm.add_file_view(str(path))
+	mapped = view.file
+	view.deleteLater()
+	wm.app.sendPostedEvents(None, QEvent.DeferredDelete)
+	assert mapped.closed
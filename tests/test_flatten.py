@@ -0,0 +1,73 @@
+import os
+
+from PyQt5.QtWidgets import QGridLayout, QBoxLayout
+
+from pyQtAPI import WindowMaker
+
+
+def _fill(wm, depth, horizontal, widgets):
+	if depth == 0:
+		widgets.append(wm.add_label("指标"))
+		widgets.append(wm.add_line_edit(text="0"))
+		return
+	for _ in range(2):
+		wm.row() if horizontal else wm.column()
+		_fill(wm, depth - 1, not horizontal, widgets)
+		wm.end()
+
+
+def _geometries(wm, flatten, depth=3):
+	widgets = []
+	wm.column(flatten=flatten)
+	_fill(wm, depth, True, widgets)
+	wm.end()
+	wm.main_window.resize(900, 700)
+	wm.main_window.show()
+	wm.app.processEvents()
+	return [widget.geometry().getRect() for widget in widgets]
+
+
+def test_flatten_matches_nested_geometry(wm):
+	nested = WindowMaker(feedback_type=WindowMaker.FEEDBACK_LOG, log_file_path=os.devnull)
+	try:
+		assert _geometries(wm, True) == _geometries(nested, False)
+	finally:
+		nested.main_window.deleteLater()
+	grids = wm.central_widget.findChildren(QGridLayout)
+	assert len(grids) == 1
+	assert not [layout for layout in wm.central_widget.findChildren(QBoxLayout) if layout is not wm.main_layout]
+
+
+def test_spans_follow_uneven_children(wm):
+	wm.row(flatten=True)
+	wm.column()
+	first = wm.add_label("a")
+	second = wm.add_label("b")
+	third = wm.add_label("c")
+	wm.end()
+	tall = wm.add_label("tall")
+	wm.end()
+	grid = wm.central_widget.findChildren(QGridLayout)[0]
+	assert grid.getItemPosition(grid.indexOf(first)) == (0, 0, 1, 1)
+	assert grid.getItemPosition(grid.indexOf(third)) == (2, 0, 1, 1)
+	assert grid.getItemPosition(grid.indexOf(tall)) == (0, 1, 3, 1)
+	assert second.parentWidget() is wm.central_widget
+
+
+def test_batch_compiles_unclosed_region(wm):
+	with wm.batch():
+		wm.row(flatten=True)
+		label = wm.add_label("x")
+	grid = label.parentWidget().findChildren(QGridLayout)[0]
+	assert grid.indexOf(label) == 0
+
+
+def test_build_spec_with_flatten(wm):
+	widgets = wm.build({"type": "row", "flatten": True, "children": [
+		{"type": "label", "id": "a", "text": "a"},
+		{"type": "column", "children": [{"type": "label", "id": "b", "text": "b"},
+										{"type": "label", "id": "c", "text": "c"}]},
+	]})
+	grid = widgets["a"].parentWidget().findChildren(QGridLayout)[0]
+	assert grid.getItemPosition(grid.indexOf(widgets["a"])) == (0, 0, 2, 1)
+	assert grid.getItemPosition(grid.indexOf(widgets["c"])) == (1, 1, 1, 1)
@@ -0,0 +1,23 @@
+from PyQt5.QtCore import QEvent
+from PyQt5.QtGui import QImage, QColor
+
+from pyQtAPI import _get_image_decode_pool
+
+
+def test_label_destroyed_before_decode_finishes(wm, tmp_path):
+	path = str(tmp_path / "big.png")
+	image = QImage(2000, 2000, QImage.Format_RGB32)
+	image.fill(QColor("teal"))
+	image.save(path)
+
+	labels = [wm.add_img(path) for _ in range(4)]
+	for label in labels:
+		label.deleteLater()
+	wm.app.sendPostedEvents(None, QEvent.DeferredDelete)
+	_get_image_decode_pool().waitForDone()
+	wm.app.processEvents()
+
+	kept = wm.add_img(path)
+	_get_image_decode_pool().waitForDone()
+	wm.app.processEvents()
+	assert kept.original_pixmap is not None and not kept.original_pixmap.isNull()
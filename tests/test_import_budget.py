@@ -0,0 +1,27 @@
+import os
+import sys
+import subprocess
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+from bench_windowmaker import IMPORT_FORBIDDEN, ROOT
+
+
+def _imported_modules():
+	output = subprocess.run(
+		[sys.executable, "-X", "importtime", "-c", "import pyQtAPI"],
+		cwd=ROOT, capture_output=True, text=True, env=dict(os.environ), check=True,
+	).stderr
+	modules = set()
+	for line in output.splitlines():
+		if line.startswith("import time:") and line.count("|") == 2:
+			modules.add(line.rsplit("|", 1)[1].strip())
+	return modules
+
+
+def test_import_loads_no_forbidden_module():
+	modules = _imported_modules()
+	assert "pyQtAPI" in modules
+	loaded = sorted(name for name in modules
+					if name in IMPORT_FORBIDDEN or name.split(".")[0] in IMPORT_FORBIDDEN)
+	assert loaded == []
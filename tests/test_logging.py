@@ -0,0 +1,13 @@
+import os
+import logging
+
+from pyQtAPI import WindowMaker
+
+
+def test_second_instance_keeps_logger_level(wm):
+	wm.logger.setLevel(logging.ERROR)
+	other = WindowMaker(feedback_type=WindowMaker.FEEDBACK_LOG, log_file_path=os.devnull, log_level=logging.DEBUG)
+	try:
+		assert wm.logger.getEffectiveLevel() == logging.ERROR
+	finally:
+		other.main_window.deleteLater()
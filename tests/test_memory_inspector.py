@@ -0,0 +1,27 @@
+from PyQt5.QtWidgets import QDialog
+
+
+def test_diff_counts_new_widgets(wm):
+	inspector = wm.get_memory_inspector()
+	inspector.snapshot()
+	for index in range(5):
+		wm.add_label(str(index))
+	inspector.snapshot()
+	count, size = inspector.diff()["QLabel"]
+	assert count == 5 and size > 0
+
+
+def test_growing_objects_are_reported_once(wm):
+	inspector = wm.get_memory_inspector()
+	inspector._window = 3
+	reports = []
+	inspector.growth_detected.connect(reports.append)
+	leaked = []
+	for _ in range(6):
+		leaked.append(QDialog())
+		inspector._tick()
+	assert len(reports) == 1
+	assert reports[0]["QDialog"] == [1, 2, 3, 4]
+	assert "QDialog" in inspector.growing(3)
+	for dialog in leaked:
+		dialog.deleteLater()
@@ -0,0 +1,48 @@
+from PyQt5.QtCore import QEvent
+from PyQt5.QtWidgets import QMenu
+
+
+def _open(menu):
+	menu.aboutToShow.emit()
+
+
+def test_dynamic_menu_does_not_leak_submenus(wm):
+	wm.build_menus([{"title": "文件", "items": [
+		{"title": "最近打开", "items": lambda: ["a.txt", {"title": "更多", "items": ["b.txt"]}]},
+	]}])
+	file_menu = wm.get_menu_builder().menus[0]
+	_open(file_menu)
+	recent = file_menu.actions()[0].menu()
+	for _ in range(50):
+		_open(recent)
+		wm.app.sendPostedEvents(None, QEvent.DeferredDelete)
+	assert len(recent.findChildren(QMenu)) == 1
+	assert [action.text() for action in recent.actions()] == ["a.txt", "更多"]
+
+
+def test_string_items_and_invalid_items(wm):
+	errors = []
+	wm._handle_error = errors.append
+	wm.build_menus([{"title": "帮助", "items": ["关于", 42, "-", {"text": "检查更新"}]}])
+	menu = wm.get_menu_builder().menus[0]
+	_open(menu)
+	assert [action.text() for action in menu.actions()] == ["关于", "", "检查更新"]
+	assert len(errors) == 1 and "42" in errors[0]
+
+
+def test_shortcut_actions_are_not_counted_as_shared(wm):
+	save = {"text": "保存", "shortcut": "Ctrl+S", "id": "save"}
+	wm.build_menus([
+		{"title": "文件", "items": [save]},
+		{"title": "工具", "items": [{"text": "选项"}]},
+	])
+	builder = wm.get_menu_builder()
+	for menu in builder.menus:
+		_open(menu)
+	assert builder.stats()["shared"] == 0
+	assert builder.stats()["actions"] == 2
+
+	wm.build_menus([{"title": "编辑", "items": [save]}])
+	_open(builder.menus[-1])
+	assert builder.stats()["shared"] == 1
+	assert builder.action("save") is builder.menus[-1].actions()[0]
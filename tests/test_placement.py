@@ -0,0 +1,42 @@
+from PyQt5.QtCore import QRect
+
+
+def _parent(wm):
+	wm.use_manual_positioning()
+	wm.main_window.show()
+	wm.central_widget.resize(400, 300)
+	wm.app.processEvents()
+
+
+def test_relative_size_without_pixel_size(wm):
+	_parent(wm)
+	label = wm.add_label("文字")
+	wm.place_widgets([label], relative=[(0.5, 0.5, 0.5, 0.5)])
+	width, height = wm.central_widget.width(), wm.central_widget.height()
+	assert label.geometry() == QRect(width // 2, height // 2, width // 2, height // 2)
+
+
+def test_position_only_uses_size_hint(wm):
+	_parent(wm)
+	label = wm.add_label("文字")
+	hint = label.sizeHint()
+	wm.place_widgets([label], [(10, 20)])
+	assert label.geometry() == QRect(10, 20, hint.width(), hint.height())
+
+
+def test_relative_width_only_keeps_hint_height(wm):
+	_parent(wm)
+	label = wm.add_label("文字")
+	hint = label.sizeHint()
+	wm.place_widgets([label], [(0, 0)], relative=[(0, 0, 1.0, 0)])
+	assert (label.width(), label.height()) == (wm.central_widget.width(), hint.height())
+
+
+def test_anchor_and_resize(wm):
+	_parent(wm)
+	label = wm.add_label("文字")
+	wm.place_widgets([label], [(-10, -10, 80, 30)], relative=[(1, 1)], anchor="se")
+	wm.central_widget.resize(600, 500)
+	wm.app.processEvents()
+	right, bottom = wm.central_widget.width() - 10, wm.central_widget.height() - 10
+	assert label.geometry() == QRect(right - 80, bottom - 30, 80, 30)
@@ -0,0 +1,18 @@
+def test_handlers_follow_latest_render(wm):
+	calls = []
+
+	def render(state):
+		return [{"type": "button", "id": "b", "text": "b", "command": lambda: calls.append(state["n"])}]
+
+	view = wm.reactive(render, {"n": 0})
+	view.widgets["b"].click()
+	view.set_state(n=1)
+	view.widgets["b"].click()
+	assert calls == [0, 1]
+
+
+def test_builtin_qt_slot_in_reactive_view(wm):
+	wm.main_window.show()
+	view = wm.reactive(lambda state: [{"type": "button", "id": "b", "text": "关闭", "command": wm.main_window.close}])
+	view.widgets["b"].click()
+	assert not wm.main_window.isVisible()
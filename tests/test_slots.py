@@ -0,0 +1,24 @@
+def test_builtin_qt_slot_as_command(wm):
+	# clicked(bool) 连接到不接受参数的内置槽函数，不能把 checked 传给它
+	wm.main_window.show()
+	button = wm.add_button("关闭", command=wm.main_window.close)
+	button.click()
+	assert not wm.main_window.isVisible()
+
+
+def test_python_slot_receives_trimmed_arguments(wm):
+	calls = []
+	button = wm.add_button("a", command=lambda: calls.append("none"))
+	button.click()
+	checkbox = wm.add_checkbox(None, "b", command=lambda state: calls.append(state))
+	checkbox.setChecked(True)
+	assert calls == ["none", 2]
+
+
+def test_builtin_slot_with_profiler(wm):
+	wm.enable_profiler()
+	wm.main_window.show()
+	button = wm.add_button("关闭", command=wm.main_window.close)
+	button.click()
+	wm.disable_profiler()
+	assert not wm.main_window.isVisible()
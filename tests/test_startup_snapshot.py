@@ -0,0 +1,59 @@
+import os
+import time
+import logging
+import threading
+
+import pytest
+
+from pyQtAPI import WindowMaker, StartupSnapshot
+
+
+@pytest.mark.parametrize("data", [
+	b"PQLS\x00\x00\x00\x05{bad",
+	b"PQLS\x00\x00",
+	b'PQLS\x00\x00\x00\x02[]',
+	b'PQLS\x00\x00\x00\x0b{"key": 1}',
+])
+def test_corrupt_snapshot_is_discarded(tmp_path, data):
+	path = tmp_path / "app.snap"
+	path.write_bytes(data)
+	snapshot = StartupSnapshot(str(path), "key")
+	assert snapshot.show_cached() is False
+	assert not path.exists()
+
+
+def test_window_maker_starts_with_corrupt_snapshot(tmp_path, monkeypatch):
+	path = tmp_path / "app.snap"
+	path.write_bytes(b"PQLS\x00\x00\x00\x05{bad")
+	monkeypatch.setattr(StartupSnapshot, "default_key", staticmethod(lambda *parts: "key"))
+	maker = WindowMaker(feedback_type=WindowMaker.FEEDBACK_LOG, log_file_path=os.devnull, startup_cache=str(path))
+	maker.logger.setLevel(logging.WARNING)
+	assert maker.get_startup_stats()["cache_hit"] is False
+	assert not path.exists()
+	maker.main_window.deleteLater()
+
+
+def test_snapshot_is_encoded_and_written_in_background(wm, tmp_path):
+	threads = []
+
+	def runner(fn, *args, **kwargs):
+		def work(*work_args):
+			threads.append(threading.current_thread())
+			return fn(*work_args)
+		return wm.run_in_background(work, *args, **kwargs)
+
+	path = tmp_path / "app.snap"
+	snapshot = StartupSnapshot(str(path), "key", runner)
+	wm.main_window.resize(200, 100)
+	wm.main_window.show()
+	snapshot.attach(wm.main_window)
+	assert snapshot.save()
+	deadline = time.monotonic() + 5
+	while not snapshot.stats["saved"] and time.monotonic() < deadline:
+		wm.app.processEvents()
+		time.sleep(0.005)
+	assert snapshot.stats["saved"]
+	assert threads and threads[0] is not threading.main_thread()
+	cached = StartupSnapshot(str(path), "key")
+	assert cached.show_cached()
+	cached.splash.close()
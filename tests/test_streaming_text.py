@@ -0,0 +1,21 @@
+def _lines(edit):
+	return edit.toPlainText().split("\n")
+
+
+def test_max_blocks_keeps_latest_lines(wm):
+	edit = wm.add_text_edit(log_mode=True, max_blocks=5)
+	edit.appender.extend(f"行 {index}" for index in range(20))
+	edit.appender.flush()
+	assert edit.document().blockCount() == 5
+	assert _lines(edit) == [f"行 {index}" for index in range(15, 20)]
+
+	edit.appender.append("最新")
+	edit.appender.flush()
+	assert _lines(edit) == [f"行 {index}" for index in range(16, 20)] + ["最新"]
+
+
+def test_unlimited_log_keeps_everything(wm):
+	edit = wm.add_text_edit(log_mode=True, max_blocks=None)
+	edit.appender.extend(str(index) for index in range(100))
+	edit.appender.flush()
+	assert edit.document().blockCount() == 100
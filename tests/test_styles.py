@@ -0,0 +1,16 @@
+def test_declarations_keep_caller_order(wm):
+	# 后写的 padding 覆盖先写的 padding-left
+	label = wm.add_label("文字", css={"padding-left": "30px", "padding": "0px"})
+	wm.main_window.show()
+	wm.app.processEvents()
+	assert label.contentsRect().x() == 0
+
+	other = wm.add_label("文字", css={"padding": "0px", "padding-left": "30px"})
+	wm.app.processEvents()
+	assert other.contentsRect().x() == 30
+
+
+def test_identical_styles_share_compiled_result(wm):
+	first = wm.style_compiler.compile({"color": "red", "padding": "2px"})
+	second = wm.style_compiler.compile({"color": "red", "padding": "2px"})
+	assert first is second
@@ -0,0 +1,45 @@
+from PyQt5.QtGui import QColor, QPalette
+from PyQt5.QtWidgets import QWidget, QLabel, QVBoxLayout
+
+RED = QColor("#ff0000")
+
+
+def _themes(tmp_path):
+	a = tmp_path / "a.qss"
+	a.write_text("QLabel { color: #ff0000; }", encoding="utf-8")
+	b = tmp_path / "b.qss"
+	b.write_text("QPushButton { color: #0000ff; }", encoding="utf-8")
+	return str(a), str(b)
+
+
+def _label_color(label):
+	label.ensurePolished()
+	return label.palette().color(QPalette.WindowText)
+
+
+def test_switching_back_drops_previous_theme_rules(wm, tmp_path):
+	a, b = _themes(tmp_path)
+	label = wm.add_label("文字")
+	wm.main_window.show()
+	wm.load_theme(b)
+	default = _label_color(label)
+	wm.load_theme(a)
+	assert _label_color(label) == RED
+	wm.load_theme(b)
+	assert wm.get_theme_manager().stats()["switches"] >= 1
+	assert _label_color(label) == default != RED
+	wm.get_theme_manager().clear()
+
+
+def test_window_created_after_apply_uses_current_theme(wm, tmp_path):
+	a, b = _themes(tmp_path)
+	wm.get_theme_manager().preload(b, a)
+	wm.load_theme(a)
+	window = QWidget()
+	wm.get_theme_manager().tag_window(window)
+	label = QLabel("文字", window)
+	QVBoxLayout(window).addWidget(label)
+	window.show()
+	assert _label_color(label) == RED
+	window.close()
+	wm.get_theme_manager().clear()
@@ -0,0 +1,35 @@
+from PyQt5.QtCore import QEvent
+from PyQt5.QtWidgets import QLabel
+
+from pyQtAPI import UpdateCoalescer
+
+
+def test_merged_and_dropped_counters(wm):
+	channel = UpdateCoalescer()
+	kept = QLabel()
+	gone = QLabel()
+	for value in ("1", "2", "3"):
+		channel.post(kept, "text", value)
+	channel.post(gone, "text", "x")
+	gone.deleteLater()
+	wm.app.sendPostedEvents(None, QEvent.DeferredDelete)
+	channel.flush()
+
+	assert kept.text() == "3"
+	stats = channel.stats()
+	assert stats["posted"] == 4
+	assert stats["merged"] == 2
+	assert stats["dropped"] == 1
+	assert stats["applied"] == 1
+	assert stats["flushes"] == 1 and stats["pending"] == 0
+	kept.deleteLater()
+
+
+def test_post_update_flushes_on_timer(wm):
+	label = wm.add_label("0")
+	for value in range(100):
+		wm.post_update(label, "text", str(value))
+	assert label.text() == "0"
+	channel = wm.get_update_channel()
+	channel._timer.timeout.emit()
+	assert label.text() == "99"
@@ -0,0 +1,36 @@
+from PyQt5.QtCore import QModelIndex
+
+from pyQtAPI import VirtualListModel
+
+
+def _load_all(model):
+	pages = []
+	while model.canFetchMore(QModelIndex()):
+		model.fetchMore(QModelIndex())
+		pages.append(model.rowCount())
+	return pages
+
+
+def test_sequence_source_is_paged():
+	model = VirtualListModel(list(range(25)), page_size=10)
+	assert model.rowCount() == 10
+	assert _load_all(model) == [20, 25]
+	assert model.index(24).data() == "24"
+
+
+def test_generator_source_is_read_lazily():
+	consumed = []
+
+	def rows():
+		for index in range(25):
+			consumed.append(index)
+			yield index
+
+	model = VirtualListModel(rows(), formatter=lambda value: f"行 {value}", page_size=10)
+	assert model.rowCount() == 10
+	assert len(consumed) == 10
+	model.fetchMore(QModelIndex())
+	assert model.rowCount() == 20 and len(consumed) == 20
+	assert _load_all(model) == [25]
+	assert not model.canFetchMore(QModelIndex())
+	assert model.index(0).data() == "行 0"
@@ -0,0 +1,117 @@
+def test_released_widget_is_reset(wm):
+	wm.use_widget_pool()
+	calls = []
+	checkbox = wm.add_checkbox(None, "启用", command=lambda state: calls.append(state))
+	checkbox.setProperty("role", "danger")
+	checkbox.setStyleSheet("color: red")
+	wm.release_widget(checkbox)
+
+	reused = wm.add_checkbox(None, "其他")
+	assert reused is checkbox
+	reused.setChecked(True)
+	assert calls == []
+	assert reused.property("role") is None
+	assert reused.styleSheet() == ""
+
+
+def test_tracked_connections_are_disconnected(wm):
+	wm.use_widget_pool()
+	calls = []
+	line = wm.add_line_edit(text="a")
+	wm.widget_pool.connect(line, line.textChanged, calls.append)
+	wm.release_widget(line)
+
+	reused = wm.add_line_edit(text="b")
+	assert reused is line
+	reused.setText("c")
+	assert calls == []
+
+
+def test_reused_widget_keeps_caller_hide(wm):
+	wm.use_widget_pool()
+	wm.main_window.show()
+	button = wm.add_button("a")
+	wm.app.processEvents()
+	wm.release_widget(button)
+
+	reused = wm.add_button("b")
+	assert reused is button
+	reused.hide()
+	wm.app.processEvents()
+	assert not reused.isVisible()
+
+	other = wm.add_button("c")
+	wm.app.processEvents()
+	assert other.isVisible()
+
+
+def test_reused_widget_is_shown(wm):
+	wm.use_widget_pool()
+	wm.main_window.show()
+	button = wm.add_button("a")
+	wm.app.processEvents()
+	wm.release_widget(button)
+
+	reused = wm.add_button("b")
+	wm.app.processEvents()
+	assert reused is button and reused.isVisible()
+
+
+def test_release_removes_widget_from_nested_layout(wm):
+	wm.use_widget_pool()
+	wm.row()
+	wm.column()
+	label = wm.add_label("a")
+	inner = wm.layout_stack[-1]
+	wm.end()
+	wm.end()
+	wm.release_widget(label)
+	assert inner.indexOf(label) == -1
+
+
+def test_user_state_is_reset(wm):
+	from PyQt5.QtCore import Qt
+	from PyQt5.QtGui import QIntValidator
+	wm.use_widget_pool()
+	label = wm.add_label("a")
+	label.setWordWrap(True)
+	label.setAlignment(Qt.AlignCenter)
+	line = wm.add_line_edit(text="1")
+	line.setReadOnly(True)
+	line.setMaxLength(3)
+	line.setValidator(QIntValidator(line))
+	wm.release_widget(label)
+	wm.release_widget(line)
+
+	assert wm.add_label("b") is label
+	assert not label.wordWrap()
+	assert label.alignment() == Qt.AlignLeft | Qt.AlignVCenter
+	assert wm.add_line_edit(text="x") is line
+	assert not line.isReadOnly()
+	assert line.maxLength() == 32767
+	assert line.validator() is None
+
+
+def test_remove_from_layout_sends_no_child_event():
+	from PyQt5.QtCore import QEvent
+	from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel
+	from pyQtAPI import _remove_from_layout
+
+	class Parent(QWidget):
+		removed = 0
+
+		def childEvent(self, event):
+			if event.type() == QEvent.ChildRemoved:
+				Parent.removed += 1
+			super().childEvent(event)
+
+	parent = Parent()
+	inner = QHBoxLayout()
+	QVBoxLayout(parent).addLayout(inner)
+	label = QLabel("a")
+	inner.addWidget(label)
+	_remove_from_layout(label)
+	assert inner.indexOf(label) == -1
+	assert label.parentWidget() is parent
+	assert Parent.removed == 0
+	parent.deleteLater()